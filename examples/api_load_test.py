@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Load test for the projection API server
+=======================================
+
+Starts the StatMuse fixture backend (with artificial upstream latency) and
+the API server in-process, then fires concurrent requests over a mix of
+players, statistics and lines. Reports throughput, latency percentiles and
+how many upstream fetches the caching/coalescing layers actually made.
+
+Usage:
+    python examples/api_load_test.py --requests 500 --concurrency 32 --delay 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, EXAMPLES_DIR)
+sys.path.insert(0, os.path.join(EXAMPLES_DIR, '..', 'src', 'dashboards'))
+
+from statmuse_fixture_server import FixtureServer
+
+PLAYERS = ['LeBron James', 'Stephen Curry', 'Nikola Jokic', 'Jayson Tatum', 'Luka Doncic',
+           'Anthony Edwards', 'Tyrese Haliburton', 'Devin Booker']
+STATS = ['PTS', 'REB', 'AST', 'PRA', 'PR']
+
+
+def build_queries(count, seed=7):
+    """Mix of projection, player log and defense queries with plenty of repeats"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        kind = rng.random()
+        player = rng.choice(PLAYERS)
+        if kind < 0.6:
+            params = {'sport': 'NBA', 'player': player, 'stat': rng.choice(STATS),
+                      'line': rng.choice([4.5, 9.5, 24.5, 35.5]), 'opponent': 'UTA'}
+            queries.append('/projection?' + urlencode(params))
+        elif kind < 0.8:
+            queries.append('/player-log?' + urlencode({'sport': 'NBA', 'player': player}))
+        else:
+            queries.append('/defense-rankings?' + urlencode({'sport': 'NBA', 'stat': rng.choice(['PTS', 'REB', 'AST'])}))
+    return queries
+
+
+def run_server(server, ready):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(server.start())
+    ready.set()
+    loop.run_until_complete(server.serve_forever())
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the projection API against a local fixture backend")
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--delay', type=float, default=0.2, help="artificial upstream latency in seconds")
+    args = parser.parse_args()
+
+    backend = FixtureServer(delay=args.delay).start_in_background()
+    # The scrapers read the base URL at import time
+    os.environ['STATMUSE_BASE_URL'] = backend.base_url
+    from api_server import ApiServer, ProjectionService
+
+    server = ApiServer(ProjectionService(cache_ttl=300, max_workers=32), port=0)
+    ready = threading.Event()
+    threading.Thread(target=run_server, args=(server, ready), daemon=True).start()
+    ready.wait()
+    base_url = f'http://127.0.0.1:{server.port}'
+
+    queries = build_queries(args.requests)
+    latencies = []
+    statuses = {}
+
+    def fire(query):
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(base_url + query, timeout=60) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+
+    print(f"Firing {len(queries)} requests with concurrency {args.concurrency} "
+          f"(upstream delay {args.delay * 1000:.0f} ms)...")
+    start = time.perf_counter()
+    # The scrapers print debugging output for every page; keep the report readable
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(fire, queries))
+    elapsed = time.perf_counter() - start
+
+    with urllib.request.urlopen(base_url + '/health') as response:
+        health = json.loads(response.read())
+
+    latencies.sort()
+    print(f"\nCompleted in {elapsed:.2f}s -> {len(queries) / elapsed:.1f} req/s")
+    print(f"Status codes: {statuses}")
+    print(f"Latency p50 {percentile(latencies, 50) * 1000:.1f} ms | "
+          f"p95 {percentile(latencies, 95) * 1000:.1f} ms | p99 {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"Service: computed {health['computed']}, cache hits {health['cache_hits']}, "
+          f"coalesced {health['coalesced']}")
+    print(f"Upstream fetches: {sum(backend.hits.values())} for {len(backend.hits)} distinct pages")
+
+
+if __name__ == "__main__":
+    main()
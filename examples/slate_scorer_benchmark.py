@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Slate scorer scaling benchmark
+==============================
+
+Builds a synthetic NBA slate (5,000 props by default: every stat for each
+player, with an opponent and a generated team allowed matrix), then scores
+it with SlateScorer on 1, 2, 4 and 8 worker processes. No network access is
+needed: the cleaned logs are generated up front, so only the scoring on the
+shared-memory process pool is timed.
+
+Reports props/s, the speedup over one worker and the parallel efficiency.
+
+Usage:
+    python examples/slate_scorer_benchmark.py --props 5000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+for subdir in ('analyzers', 'core', 'scrapers'):
+    sys.path.insert(0, os.path.join(EXAMPLES_DIR, '..', 'src', subdir))
+
+from opponent_adjustment import TeamAllowedMatrix
+from slate_scorer import SlateScorer
+from team_defense_scraper import NBA_TEAM_ABBREVS
+
+STATS = ['PTS', 'REB', 'AST', 'PRA', '3PM']
+HEADER = ['NAME', 'DATE', 'TM', 'OPP', 'PTS', 'REB', 'AST', '3PM']
+
+
+def build_slate(props, games=20, seed=7):
+    """(props, cleaned logs per prop, {'NBA': TeamAllowedMatrix}) for a synthetic slate"""
+    rng = random.Random(seed)
+    teams = list(dict.fromkeys(NBA_TEAM_ABBREVS.values()))
+    abbrevs = list(NBA_TEAM_ABBREVS)
+    allowed = TeamAllowedMatrix(teams, ['PTS', 'REB', 'AST', '3PM'],
+                                [[rng.uniform(105, 125), rng.uniform(40, 48), rng.uniform(23, 30), rng.uniform(11, 15)]
+                                 for _ in teams])
+
+    slate, logs = [], []
+    players = (props + len(STATS) - 1) // len(STATS)
+    for p in range(players):
+        base = [rng.uniform(8, 30), rng.uniform(2, 11), rng.uniform(1, 9), rng.uniform(0, 4)]
+        start = date(2024, 10, 22)
+        log = [HEADER] + [
+            [f'Player {p}', f'{day.month}/{day.day}/{day.year}', 'GSW', rng.choice(abbrevs)]
+            + [max(0, round(rng.gauss(mean, mean * 0.35))) for mean in base]
+            for day in (start + timedelta(days=2 * g) for g in range(games))]
+        opponent = rng.choice(abbrevs)
+        for stat in STATS:
+            if len(slate) == props:
+                break
+            slate.append({'sport': 'NBA', 'player': f'Player {p}', 'stat': stat, 'opponent': opponent,
+                          'line': rng.choice([0.5, 2.5, 5.5, 15.5, 25.5, 35.5])})
+            logs.append(log)
+    return slate, logs, {'NBA': allowed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how the slate scorer scales with worker processes")
+    parser.add_argument('--props', type=int, default=5000)
+    parser.add_argument('--games', type=int, default=20, help="games in every player's log")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    props, logs, allowed = build_slate(args.props, args.games)
+    print(f"{len(props)} props, {args.games} games per log, {os.cpu_count()} CPU cores\n")
+    print(f"{'WORKERS':>7s} {'SECONDS':>8s} {'PROPS/S':>8s} {'SPEEDUP':>8s} {'EFFICIENCY':>10s} {'ERRORS':>7s}")
+    print("-" * 54)
+
+    baseline = None
+    for workers in args.workers:
+        scorer = SlateScorer(max_workers=workers, adjust_for_opponent=True)
+        # Start the worker processes before timing
+        scorer.score(props[:workers], logs[:workers], allowed)
+
+        start = time.perf_counter()
+        results, errors = scorer.score(props, logs, allowed)
+        elapsed = time.perf_counter() - start
+        scorer.close()
+
+        baseline = baseline or elapsed * workers
+        speedup = baseline / elapsed
+        print(f"{workers:7d} {elapsed:8.2f} {len(props) / elapsed:8.1f} {speedup:7.2f}x {speedup / workers * 100:9.0f}% "
+              f"{len(errors):7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Local StatMuse fixture backend
+==============================
+
+Serves synthetic StatMuse-style HTML tables so the scrapers, the API server
+and the load tests can run without hitting statmuse.com. Point the scrapers
+at it with the STATMUSE_BASE_URL environment variable:
+
+    python examples/statmuse_fixture_server.py --port 8765 --delay 0.2
+    STATMUSE_BASE_URL=http://127.0.0.1:8765 python src/dashboards/api_server.py
+
+Pages are generated deterministically from the request path, so the same
+URL always returns the same table. Responses carry an ETag and a
+Last-Modified date and conditional requests are answered with 304.
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'core'))
+from sports_config import SPORTS_CONFIG
+
+NBA_TEAMS = {
+    'UTA': 'Jazz', 'LAL': 'Lakers', 'GSW': 'Warriors', 'BOS': 'Celtics', 'CHI': 'Bulls',
+    'DAL': 'Mavericks', 'DEN': 'Nuggets', 'HOU': 'Rockets', 'LAC': 'Clippers', 'MEM': 'Grizzlies',
+    'MIA': 'Heat', 'MIL': 'Bucks', 'MIN': 'Timberwolves', 'NOP': 'Pelicans', 'NYK': 'Knicks',
+    'OKC': 'Thunder', 'ORL': 'Magic', 'PHI': '76ers', 'PHX': 'Suns', 'POR': 'Trail Blazers',
+    'SAC': 'Kings', 'SAS': 'Spurs', 'TOR': 'Raptors', 'WAS': 'Wizards', 'ATL': 'Hawks',
+    'BKN': 'Nets', 'CHA': 'Hornets', 'CLE': 'Cavaliers', 'DET': 'Pistons', 'IND': 'Pacers'
+}
+
+# Team page slug -> column abbreviation, as used in the defense scrapers
+TEAM_STAT_SLUGS = {
+    'points': 'PTS', 'rebounds': 'REB', 'assists': 'AST', 'steals': 'STL', 'blocks': 'BLK',
+    '3-pointers': '3PM', 'free-throws': 'FTM', 'turnovers': 'TOV', 'field-goals': 'FGM',
+    'field-goal-attempts': 'FGA', '3-point-attempts': '3PA', 'free-throw-attempts': 'FTA'
+}
+
+# Fixture pages never change
+LAST_MODIFIED = 'Sat, 01 Mar 2025 00:00:00 GMT'
+
+NBA_LOG_HEADER = ['', '', 'NAME', 'DATE', 'TM', '', 'OPP', 'MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK',
+                  'FGM', 'FGA', 'FG%', '3PM', '3PA', '3P%', 'FTM', 'FTA', 'FT%', 'TS%', 'OREB', 'DREB',
+                  'TOV', 'PF', '+/-']
+
+
+def _rng(path):
+    """Random generator seeded from the request path"""
+    return random.Random(int(hashlib.md5(path.encode('utf-8')).hexdigest()[:8], 16))
+
+
+def _render_table(header, rows):
+    head = ''.join(f'<th>{cell}</th>' for cell in header)
+    body = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in row) + '</tr>' for row in rows)
+    return f'<html><body><table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table></body></html>'
+
+
+def league_teams(path):
+    """Team nicknames for the league in the request path"""
+    league = path.strip('/').split('/', 1)[0].upper()
+    abbrevs = SPORTS_CONFIG.get(league, {}).get('team_abbrevs')
+    if not abbrevs:
+        return list(NBA_TEAMS.values())
+    return list(dict.fromkeys(abbrevs.values()))
+
+
+def team_table(path):
+    """League table of per-game stats allowed by each team"""
+    rng = _rng(path)
+    match = re.search(r'give-up-the-most-(.+?)-per-game', path)
+    slug = match.group(1) if match else 'points'
+    abbr = TEAM_STAT_SLUGS.get(slug, slug.upper())
+    base = {'PTS': 114.0, 'REB': 44.0, 'AST': 26.0, 'STL': 8.0, 'BLK': 5.0, '3PM': 13.0}.get(abbr, 10.0)
+
+    rows = []
+    for i, team in enumerate(league_teams(path), 1):
+        per_game = round(base * rng.uniform(0.9, 1.1), 2)
+        rows.append([str(i), '', team, f'{per_game:.2f}', f'{per_game * 82:,.0f}', '82'])
+    return _render_table(['', '', 'TEAM', f'OPP {abbr}/GP', f'OPP {abbr}', 'GP'], rows)
+
+
+# NHL and MLB logs carry the columns of both positions, so one page feeds either cleaner
+NHL_LOG_HEADER = ['', '', 'NAME', 'DATE', 'TM', '', 'OPP', 'G', 'A', 'P', '+/-', 'PIM', 'S', 'TOI', 'FOW',
+                  'HIT', 'BKS', 'SV', 'MIN']
+MLB_LOG_HEADER = ['', '', 'NAME', 'DATE', 'TM', '', 'OPP', 'AB', 'R', 'H', '2B', '3B', 'HR', 'RBI', 'BB',
+                  'SO', 'HBP', 'SB', 'CS', 'TB', 'IP', 'ER', 'DEC']
+
+
+def _nba_game(rng):
+    pts, reb, ast = rng.randint(8, 40), rng.randint(1, 14), rng.randint(0, 12)
+    fgm = max(1, pts // 2 - rng.randint(0, 4))
+    tpm = rng.randint(0, 6)
+    ftm = rng.randint(0, 8)
+    return [str(rng.randint(24, 40)), str(pts), str(reb), str(ast), str(rng.randint(0, 3)), str(rng.randint(0, 3)),
+            str(fgm), str(fgm + rng.randint(4, 12)), '50.0', str(tpm), str(tpm + rng.randint(0, 6)), '40.0',
+            str(ftm), str(ftm + rng.randint(0, 2)), '80.0', '60.0', str(rng.randint(0, 4)),
+            str(rng.randint(0, 10)), str(rng.randint(0, 5)), str(rng.randint(0, 5)), '+1']
+
+
+def _nhl_game(rng):
+    goals, assists = rng.randint(0, 2), rng.randint(0, 3)
+    return [str(goals), str(assists), str(goals + assists), '+1', str(rng.choice([0, 0, 2])),
+            str(rng.randint(0, 7)), f'{rng.randint(12, 24)}:{rng.randint(10, 59)}', str(rng.randint(0, 12)),
+            str(rng.randint(0, 5)), str(rng.randint(0, 3)), str(rng.randint(18, 40)), '60:00']
+
+
+def _mlb_game(rng):
+    doubles, triples, home_runs = rng.randint(0, 1), rng.choice([0, 0, 0, 1]), rng.randint(0, 1)
+    hits = doubles + triples + home_runs + rng.randint(0, 2)
+    outs = rng.randint(9, 21)
+    return [str(rng.randint(3, 5)), str(rng.randint(0, 2)), str(hits), str(doubles), str(triples),
+            str(home_runs), str(rng.randint(0, 3)), str(rng.randint(0, 2)), str(rng.randint(0, 3)),
+            str(rng.choice([0, 0, 1])), str(rng.randint(0, 1)), str(rng.choice([0, 0, 1])),
+            str(hits + doubles + 2 * triples + 3 * home_runs), f'{outs // 3}.{outs % 3}', str(rng.randint(0, 5)),
+            rng.choice(['W', 'L', 'ND'])]
+
+
+# League -> (header, abbreviations, game row generator)
+PLAYER_LOGS = {
+    'NBA': (NBA_LOG_HEADER, NBA_TEAMS, _nba_game),
+    'WNBA': (NBA_LOG_HEADER, SPORTS_CONFIG['WNBA']['team_abbrevs'], _nba_game),
+    'NHL': (NHL_LOG_HEADER, SPORTS_CONFIG['NHL']['team_abbrevs'], _nhl_game),
+    'MLB': (MLB_LOG_HEADER, SPORTS_CONFIG['MLB']['team_abbrevs'], _mlb_game),
+}
+
+
+def player_log_table(path, games=None):
+    """Player game log for the league in the path, most recent game first"""
+    rng = _rng(path)
+    match = re.search(r'last-(\d+)', path)
+    games = games or (int(match.group(1)) if match else 10)
+    name = path.rsplit('/', 1)[-1].split('-vs-')[0].replace('%20', ' ').title()
+    league = path.strip('/').split('/', 1)[0].upper()
+    header, teams, game_row = PLAYER_LOGS.get(league, PLAYER_LOGS['NBA'])
+    team = rng.choice(list(teams))
+    opponents = [abbr for abbr in teams if abbr != team]
+    game_day = date(2025, 3, 1)
+
+    rows = []
+    for i in range(games):
+        game_day -= timedelta(days=rng.randint(1, 3))
+        rows.append([str(i + 1), '', name, f'{game_day.month}/{game_day.day}/{game_day.year}', team,
+                     rng.choice(['@', 'vs']), rng.choice(opponents)] + game_row(rng))
+    # StatMuse appends an average row to game logs
+    rows.append(['', '', 'Average'] + [''] * (len(header) - 3))
+    return _render_table(header, rows)
+
+
+def player_list_table(path, players=60):
+    """League players with the most games played, with StatMuse's doubled-up names"""
+    rng = _rng(path)
+    league = path.strip('/').split('/', 1)[0].upper()
+    teams = list(PLAYER_LOGS.get(league, PLAYER_LOGS['NBA'])[1])
+    rows = []
+    for i in range(players):
+        first, last = f'Player{i}', f'{league.title()}son'
+        rows.append([str(i + 1), '', f'{first} {last}{first[0]}. {last}', rng.choice(teams), str(rng.randint(40, 82))])
+    return _render_table(['', '', 'NAME', 'TM', 'GP'], rows)
+
+
+def render_page(path):
+    if 'teams-that-give-up' in path or 'teams-who-give-up' in path:
+        return team_table(path)
+    if 'players-with-the-most-games-played' in path:
+        return player_list_table(path)
+    return player_log_table(path)
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server_version = 'StatMuseFixture/1.0'
+
+    def do_GET(self):
+        self.server.record_hit(self.path)
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        body = render_page(self.path).encode('utf-8')
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+
+        if self.headers.get('If-None-Match') == etag:
+            self.server.record_not_modified()
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Threaded fixture backend that counts the upstream hits per path"""
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, delay=0.0):
+        super().__init__((host, port), FixtureHandler)
+        self.delay = delay
+        self.hits = {}
+        self.not_modified = 0
+        self._hits_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def record_hit(self, path):
+        with self._hits_lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+
+    def record_not_modified(self):
+        with self._hits_lock:
+            self.not_modified += 1
+
+    def start_in_background(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic StatMuse pages for local testing")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help="seconds of artificial upstream latency")
+    args = parser.parse_args()
+
+    server = FixtureServer(args.host, args.port, args.delay)
+    print(f"StatMuse fixture backend on {server.base_url} (delay {args.delay}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
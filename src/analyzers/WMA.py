@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from functools import lru_cache
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 def weighted_moving_average(data, category):
@@ -17,15 +20,62 @@ def weighted_moving_average(data, category):
     # Get the numeric data for the category
     df[category] = pd.to_numeric(df[category])
 
-    # Generate weights dynamically decreasing by 0.5
-    weights = [num_games - 0.5 * i for i in range(num_games)]
+    # Weights decreasing by 0.5 per game, from the kernel cache
+    weights = wma_kernel(num_games)
 
     # Ensure there are enough games in the dataset
     if len(df) < num_games:
         raise ValueError(f"Not enough games in the dataset. Required: {num_games}, Provided: {len(df)}")
 
     # Calculate the weighted sum
-    wma = (df[category][:num_games].values * weights).sum() / sum(weights)
+    wma = (df[category][:num_games].values * weights).sum() / weights.sum()
 
     return wma
 
+
+@lru_cache(maxsize=256)
+def wma_kernel(num_games, scheme='linear', param=0.5):
+    """
+    Weights for a window of num_games, most recent game first. Cached per
+    (num_games, scheme, param), so the arrays are read-only.
+    - 'linear': num_games, num_games - param, num_games - 2*param, ... (param=0.5 is weighted_moving_average)
+    - 'exponential': halves every `param` games back
+    - 'mean': equal weights
+    """
+    recency = np.arange(num_games)
+    if scheme == 'linear':
+        weights = np.maximum(num_games - param * recency, 0.0)
+    elif scheme == 'exponential':
+        weights = 0.5 ** (recency / param)
+    elif scheme == 'mean':
+        weights = np.ones(num_games)
+    else:
+        raise ValueError(f"Unknown weighting scheme: {scheme}")
+    weights.setflags(write=False)
+    return weights
+
+
+def rolling_weighted_moving_average(values, window, scheme='linear', param=0.5):
+    """
+    WMA as of every game of a column in date order (oldest first), or of every
+    row of a players x games matrix: result[..., t] is the WMA of games
+    t-window+1 .. t. The first window-1 games use the shorter logs behind them,
+    like weighted_moving_average on a log with fewer games.
+    """
+    values = np.asarray(values, dtype=float)
+    length = values.shape[-1]
+    result = np.full(values.shape, np.nan)
+
+    # np.convolve applies the kernel's first weight to the newest game of each window
+    kernel = wma_kernel(window, scheme, param)
+    if length >= window:
+        if values.ndim == 1:
+            result[window - 1:] = np.convolve(values, kernel, mode='valid') / kernel.sum()
+        else:
+            result[..., window - 1:] = sliding_window_view(values, window, axis=-1) @ kernel[::-1] / kernel.sum()
+
+    for games in range(1, min(window, length + 1)):
+        kernel = wma_kernel(games, scheme, param)
+        newest_first = values[..., games - 1::-1]
+        result[..., games - 1] = newest_first @ kernel / kernel.sum()
+    return result
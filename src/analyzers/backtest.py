@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Projection Backtester
+=====================
+
+Replays historical prop lines against the game logs to score the Mean and
+WMA projections. For every line, the projection and the normal hit
+probability are computed from the player's previous `window` games only,
+exactly like simple_mean / weighted_moving_average on a last-N log, and
+compared with what the player actually did that day.
+
+Every (player, stat) series is laid out as one row of a NaN-padded matrix,
+so the prior-game windows for all players and dates are computed in one
+pass of array operations instead of rebuilding a table per date.
+
+Reported per method: hit rate of the side the projection picks, ROI at the
+line's odds (-110 when not given), mean absolute error, Brier score of the
+over probability and a calibration table.
+
+Usage:
+    python src/analyzers/backtest.py lines.csv --store data/backfill --window 5
+"""
+
+import argparse
+import csv
+import json
+import os
+from datetime import date
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from ..core.game_log import date_ordinal
+    from ..scrapers.season_backfill import BackfillStore
+    from .batch_evaluator import build_stat_table
+    from .probability import normal_cdf
+    from .WMA import rolling_weighted_moving_average
+except ImportError:
+    import sys
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for subdir in ('scrapers', 'core', 'analyzers'):
+        path = os.path.join(src_dir, subdir)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    from game_log import date_ordinal
+    from season_backfill import BackfillStore
+    from batch_evaluator import build_stat_table
+    from probability import normal_cdf
+    from WMA import rolling_weighted_moving_average
+
+# Same number of games as the default last-5-regular-season-games window
+DEFAULT_WINDOW = 5
+DEFAULT_ODDS = -110
+METHODS = ('Mean', 'WMA')
+CALIBRATION_BINS = 10
+
+
+def parse_date(value):
+    """Ordinal of a 'M/D/YYYY' or 'YYYY-MM-DD' date"""
+    value = str(value).strip()
+    if '-' in value:
+        return date.fromisoformat(value).toordinal()
+    ordinal = date_ordinal(value)
+    if not ordinal:
+        raise ValueError(f"Unrecognised date: {value}")
+    return ordinal
+
+
+def load_lines(path):
+    """Historical lines from a CSV or JSON file: sport, player, stat, date, line[, over_odds, under_odds]"""
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as fh:
+            lines = json.load(fh)
+    else:
+        with open(path, 'r', encoding='utf-8', newline='') as fh:
+            lines = list(csv.DictReader(fh))
+
+    cleaned = []
+    for i, line in enumerate(lines, 1):
+        line = {key.strip().lower(): value for key, value in line.items() if key}
+        missing = [key for key in ('sport', 'player', 'stat', 'date', 'line') if not line.get(key)]
+        if missing:
+            raise ValueError(f"Line {i} is missing required field(s): {', '.join(missing)}")
+        cleaned.append({
+            'sport': str(line['sport']).strip().upper(),
+            'player': str(line['player']).strip(),
+            'stat': str(line['stat']).strip(),
+            'date': parse_date(line['date']),
+            'line': float(line['line']),
+            'over_odds': float(line.get('over_odds') or DEFAULT_ODDS),
+            'under_odds': float(line.get('under_odds') or DEFAULT_ODDS),
+        })
+    return cleaned
+
+
+def american_payout(odds):
+    """Profit per unit staked at American odds"""
+    odds = np.asarray(odds, dtype=float)
+    return np.where(odds < 0, 100.0 / np.abs(odds), odds / 100.0)
+
+
+def series_matrix(logs, keys):
+    """
+    (ordinals, values) matrices, one row per (sport, player, stat) key with its
+    games in date order, padded with NaN on the right
+    """
+    series = []
+    for sport, player, stat in keys:
+        player_data = logs.get((sport, player))
+        table = build_stat_table(player_data, sport, stat) if player_data and len(player_data) > 1 else [[]]
+        games = sorted((date_ordinal(day), value) for day, value in table[1:] if date_ordinal(day))
+        series.append(games)
+
+    length = max((len(games) for games in series), default=0)
+    ordinals = np.zeros((len(keys), length), dtype=np.int64)
+    values = np.full((len(keys), length), np.nan)
+    for row, games in enumerate(series):
+        if games:
+            ordinals[row, :len(games)] = [day for day, value in games]
+            values[row, :len(games)] = [value for day, value in games]
+    return ordinals, values
+
+
+def prior_window_stats(values, window):
+    """
+    Mean, WMA, sample standard deviation and game count of the `window` games
+    before every game, for every row at once. WMA weights the most recent
+    prior game k, the next k - 0.5 and so on, as weighted_moving_average does.
+    """
+    rows, length = values.shape
+    padded = np.concatenate([np.full((rows, window), np.nan), values], axis=1)
+    # windows[r, t] holds games t-window .. t-1 of row r, oldest first
+    windows = sliding_window_view(padded, window, axis=1)[:, :length]
+    valid = ~np.isnan(windows)
+    counts = valid.sum(axis=2)
+    filled = np.where(valid, windows, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = filled.sum(axis=2) / counts
+        squares = np.where(valid, (windows - means[..., None]) ** 2, 0.0).sum(axis=2)
+        std_devs = np.sqrt(squares / (counts - 1))
+
+    # The WMA as of the previous game is the prior-window WMA of this one
+    wmas = np.full(values.shape, np.nan)
+    wmas[:, 1:] = rolling_weighted_moving_average(values, window)[:, :-1]
+    return means, wmas, std_devs, counts
+
+
+def calibration_table(probabilities, outcomes, bins=CALIBRATION_BINS):
+    """[(bin_low, bin_high, count, mean_predicted, observed_rate), ...] for non-empty bins"""
+    edges = np.linspace(0, 1, bins + 1)
+    index = np.clip(np.digitize(probabilities, edges) - 1, 0, bins - 1)
+    table = []
+    for b in range(bins):
+        mask = index == b
+        if mask.any():
+            table.append((float(edges[b]), float(edges[b + 1]), int(mask.sum()),
+                          float(probabilities[mask].mean()), float(outcomes[mask].mean())))
+    return table
+
+
+def score(projections, std_devs, lines, actuals, over_odds, under_odds):
+    """Hit rate, ROI, MAE, Brier score and calibration for one method's projections"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Zero spreads are priced deterministically below; clip so the erf approximation never overflows
+        z = np.clip(np.nan_to_num((lines - projections) / std_devs), -40, 40)
+    over_probability = np.where(std_devs > 0, 1 - normal_cdf(z), (projections > lines).astype(float))
+
+    went_over = actuals > lines
+    pushes = actuals == lines
+    bet_over = projections > lines
+    bets = (projections != lines) & ~pushes
+    won = bets & (bet_over == went_over)
+    payout = np.where(bet_over, american_payout(over_odds), american_payout(under_odds))
+    profit = np.where(won, payout, -1.0)[bets]
+
+    decided = ~pushes
+    outcomes = went_over[decided].astype(float)
+    return {
+        'lines': int(len(lines)),
+        'bets': int(bets.sum()),
+        'hit_rate': round(float(won.sum() / bets.sum()) * 100, 1) if bets.any() else None,
+        'roi': round(float(profit.sum() / bets.sum()) * 100, 1) if bets.any() else None,
+        'mae': round(float(np.abs(projections - actuals).mean()), 3) if len(lines) else None,
+        'brier': round(float(((over_probability[decided] - outcomes) ** 2).mean()), 4) if decided.any() else None,
+        'calibration': calibration_table(over_probability[decided], outcomes),
+    }
+
+
+def backtest(logs, lines, window=DEFAULT_WINDOW, methods=METHODS):
+    """
+    Score each method over the historical lines.
+    logs: {(sport, player): [header, rows...] or GameLog}
+    lines: dicts as returned by load_lines
+    Lines without a game that day, or without a prior game, are skipped.
+    """
+    keys = list(dict.fromkeys((line['sport'], line['player'], line['stat']) for line in lines))
+    ordinals, values = series_matrix(logs, keys)
+    means, wmas, std_devs, counts = prior_window_stats(values, window)
+
+    # Row and game index of every line
+    key_rows = {key: row for row, key in enumerate(keys)}
+    game_index = [{int(day): t for t, day in enumerate(ordinals[row]) if day} for row in range(len(keys))]
+    rows, cols, kept = [], [], []
+    for i, line in enumerate(lines):
+        row = key_rows[(line['sport'], line['player'], line['stat'])]
+        t = game_index[row].get(line['date'])
+        if t is not None and counts[row, t] > 0:
+            rows.append(row)
+            cols.append(t)
+            kept.append(i)
+
+    rows, cols = np.array(rows, dtype=int), np.array(cols, dtype=int)
+    line_values = np.array([lines[i]['line'] for i in kept], dtype=float)
+    over_odds = np.array([lines[i].get('over_odds', DEFAULT_ODDS) for i in kept], dtype=float)
+    under_odds = np.array([lines[i].get('under_odds', DEFAULT_ODDS) for i in kept], dtype=float)
+    actuals = values[rows, cols]
+    projections = {'Mean': means[rows, cols], 'WMA': wmas[rows, cols]}
+    spread = np.nan_to_num(std_devs[rows, cols])
+
+    report = {method: score(projections[method], spread, line_values, actuals, over_odds, under_odds)
+              for method in methods}
+    report['skipped'] = len(lines) - len(kept)
+    return report
+
+
+def load_logs_from_store(store, lines):
+    """{(sport, player): GameLog} for every player in the lines that the backfill store holds"""
+    logs = {}
+    for sport, player in dict.fromkeys((line['sport'], line['player']) for line in lines):
+        log = store.load_log(sport, player)
+        if log is not None:
+            logs[(sport, player)] = log
+    return logs
+
+
+def _format(value, spec):
+    return format(value, spec) if value is not None else '-'.rjust(len(format(0, spec)))
+
+
+def print_report(report):
+    print(f"{'METHOD':6s} {'LINES':>6s} {'BETS':>6s} {'HIT %':>6s} {'ROI %':>6s} {'MAE':>7s} {'BRIER':>7s}")
+    print("-" * 50)
+    for method in METHODS:
+        if method not in report:
+            continue
+        r = report[method]
+        print(f"{method:6s} {r['lines']:6d} {r['bets']:6d} {_format(r['hit_rate'], '6.1f')} "
+              f"{_format(r['roi'], '6.1f')} {_format(r['mae'], '7.3f')} {_format(r['brier'], '7.4f')}")
+    print(f"\nSkipped {report['skipped']} lines without a game or prior games")
+
+    for method in METHODS:
+        if method in report and report[method]['calibration']:
+            print(f"\n{method} calibration (predicted over probability vs observed over rate)")
+            for low, high, count, predicted, observed in report[method]['calibration']:
+                print(f"  {low:.1f}-{high:.1f}  n={count:5d}  predicted {predicted * 100:5.1f}%  observed {observed * 100:5.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest Mean and WMA projections over historical prop lines")
+    parser.add_argument('lines', help="CSV or JSON file with sport, player, stat, date and line columns")
+    parser.add_argument('--store', default=os.path.join('data', 'backfill'),
+                        help="season backfill store holding the game logs")
+    parser.add_argument('-n', '--window', type=int, default=DEFAULT_WINDOW,
+                        help=f"prior games per projection (default: {DEFAULT_WINDOW})")
+    parser.add_argument('-o', '--output', help="write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    lines = load_lines(args.lines)
+    logs = load_logs_from_store(BackfillStore(args.store), lines)
+    print(f"Backtesting {len(lines)} lines for {len(logs)} players over {args.window}-game windows...\n")
+
+    report = backtest(logs, lines, args.window)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nReport written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Headless Batch Evaluator
+========================
+
+Evaluates a whole slate of player props without the GUI. Props are read
+from a CSV or JSON file with the columns sport, player, stat, line and
+opponent (team, time_duration and position are optional; NHL and MLB
+positions default to the one whose log carries the stat). Every prop goes through
+the same fetch -> clean -> Mean/WMA -> defense -> hit probability pipeline
+as the dashboard, the props are evaluated in parallel, and the results are
+written as a table ranked by hit probability.
+
+Usage:
+    python src/analyzers/batch_evaluator.py props.csv -o results.csv
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    # Try relative imports first (when run as package)
+    from ..scrapers.datascrapper import scrape_statmuse
+    from ..scrapers.window_planner import WindowPlanner
+    from ..scrapers.team_defense_scraper import get_defense_analysis, get_team_defense_rankings
+    from ..core.player_logs import PLAYER_CLEANERS, clean_player_log, resolve_position
+    from ..core.sports_config import SPORTS_CONFIG, is_combined_statistic, get_combined_stat_components
+    from .simplemean import simple_mean
+    from .WMA import weighted_moving_average
+    from .combined_stats_analyzer import get_combined_stats_rankings
+    from .probability import normal_hit_probability
+    from .monte_carlo import PROBABILITY_ENGINES, batch_hit_probabilities
+    from .combined_distribution import CombinedStatModel
+    from .opponent_adjustment import TeamAllowedMatrix, adjust_projections
+    from .probability import normal_cdf
+except ImportError:
+    # Fallback to flat imports with the src subdirectories on the path
+    import sys
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for subdir in ('scrapers', 'core', 'analyzers'):
+        path = os.path.join(src_dir, subdir)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    from datascrapper import scrape_statmuse
+    from window_planner import WindowPlanner
+    from team_defense_scraper import get_defense_analysis, get_team_defense_rankings
+    from player_logs import PLAYER_CLEANERS, clean_player_log, resolve_position
+    from sports_config import SPORTS_CONFIG, is_combined_statistic, get_combined_stat_components
+    from simplemean import simple_mean
+    from WMA import weighted_moving_average
+    from combined_stats_analyzer import get_combined_stats_rankings
+    from probability import normal_hit_probability
+    from monte_carlo import PROBABILITY_ENGINES, batch_hit_probabilities
+    from combined_distribution import CombinedStatModel
+    from opponent_adjustment import TeamAllowedMatrix, adjust_projections
+    from probability import normal_cdf
+
+
+DEFAULT_TIME_DURATION = 'last-5-regular-season-games'
+
+# Sports with team defense rankings available from the scrapers
+DEFENSE_SPORTS = ['NBA']
+
+RESULT_COLUMNS = [
+    'rank', 'sport', 'player', 'stat', 'line', 'opponent', 'games', 'mean', 'wma',
+    'projection', 'opponent_factor', 'adjusted_projection', 'std_dev', 'hit_probability', 'hit_rate', 'defense_rank',
+    'defense_difficulty', 'recommendation', 'error'
+]
+
+
+class NoDataError(ValueError):
+    """The player's log has no games to evaluate the prop from"""
+
+
+def load_props(path):
+    """Load a slate of props from a CSV or JSON file as a list of dicts"""
+    if path.lower().endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as fh:
+            props = json.load(fh)
+    else:
+        with open(path, 'r', encoding='utf-8', newline='') as fh:
+            props = list(csv.DictReader(fh))
+
+    cleaned = []
+    for i, prop in enumerate(props, 1):
+        prop = {key.strip().lower(): value for key, value in prop.items() if key}
+        # A line of 0 is a line; only absent or blank fields are missing
+        missing = [key for key in ('sport', 'player', 'stat', 'line')
+                   if prop.get(key) is None or str(prop[key]).strip() == '']
+        if missing:
+            raise ValueError(f"Prop {i} is missing required field(s): {', '.join(missing)}")
+
+        cleaned.append({
+            'sport': str(prop['sport']).strip().upper(),
+            'player': str(prop['player']).strip(),
+            'stat': str(prop['stat']).strip(),
+            'line': float(prop['line']),
+            'opponent': str(prop.get('opponent') or '').strip() or None,
+            'team': str(prop.get('team') or '').strip() or 'Any',
+            'time_duration': str(prop.get('time_duration') or '').strip() or DEFAULT_TIME_DURATION,
+            'position': str(prop.get('position') or '').strip().lower() or None,
+        })
+    return cleaned
+
+
+def get_recommendation(hit_probability):
+    """Betting recommendation used by the dashboards for a hit probability (0-100)"""
+    if hit_probability > 60:
+        return "STRONG BET"
+    elif hit_probability > 40:
+        return "MODERATE BET"
+    return "AVOID BET"
+
+
+def build_stat_table(player_data, sport, statistic):
+    """
+    Build a [['DATE', statistic], ...] table for the statistic so the existing
+    simple_mean/weighted_moving_average functions can be reused for combined stats
+    """
+    header = player_data[0]
+    date_index = header.index('DATE')
+
+    if is_combined_statistic(statistic):
+        components = get_combined_stat_components(sport, statistic)
+    else:
+        components = [statistic]
+
+    # Cleaned NBA logs already carry combined columns such as 'PTS + REB + AST'
+    combined_column = ' + '.join(components)
+    if combined_column in header:
+        components = [combined_column]
+
+    missing = [comp for comp in components if comp not in header]
+    if missing:
+        raise ValueError(f"Statistic {statistic} not found in header (missing {', '.join(missing)})")
+    indices = [header.index(comp) for comp in components]
+
+    table = [['DATE', statistic]]
+    for game in player_data[1:]:
+        if not game[date_index]:
+            continue
+        try:
+            table.append([game[date_index], sum(float(game[i]) for i in indices)])
+        except (ValueError, TypeError):
+            continue
+    return table
+
+
+class SlateEvaluator:
+    """
+    Evaluates props in parallel. Player logs and team rankings are cached per
+    run so a slate with many props for the same player or statistic only
+    scrapes each page once. Every sport's logs are fetched and cleaned on the
+    same bounded worker pool, which callers such as the dashboard share.
+    """
+
+    def __init__(self, max_workers=8, method='WMA', cache_ttl=None, engine='Normal', adjust_for_opponent=False):
+        self.max_workers = max_workers
+        self.method = method
+        self.engine = engine
+        self.adjust_for_opponent = adjust_for_opponent
+        self.cache_ttl = cache_ttl  # seconds before a cached page is re-scraped (None = never)
+        self._player_logs = {}
+        self._rankings = {}
+        self._combined_models = {}
+        self._allowed_matrices = {}
+        # Looked up at call time so tests can swap out scrape_statmuse
+        self.window_planner = WindowPlanner(fetch=lambda url: scrape_statmuse(url))
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def close(self):
+        """Shut down the shared worker pool"""
+        self.executor.shutdown(wait=False)
+
+    def _cached(self, cache, key, loader, keep=None):
+        """
+        Load a value once per key, even when several threads ask at the same
+        time. A loader that raises stores nothing, and neither does a value
+        keep(value) rejects, so a failed fetch is retried by the next caller.
+        """
+        with self._locks_guard:
+            lock = self._locks.setdefault((id(cache), key), threading.Lock())
+        with lock:
+            entry = cache.get(key)
+            if entry is None or (self.cache_ttl is not None and time.time() - entry[0] > self.cache_ttl):
+                entry = (time.time(), loader())
+                if keep is not None and not keep(entry[1]):
+                    return entry[1]
+                cache[key] = entry
+            return entry[1]
+
+    def fetch_player_log(self, sport, player, team, time_duration, position=None):
+        """Scrape and clean a player's game log (NHL and MLB logs are cleaned for a position)"""
+        if sport not in PLAYER_CLEANERS:
+            raise ValueError(f"No player data pipeline for {sport}")
+        position = resolve_position(sport, position)
+
+        def load():
+            # Every window for the player is sliced from one fetch of the largest window
+            data = self.window_planner.get(sport.lower(), player, time_duration, team)
+            if not data:
+                return []
+            return clean_player_log(sport, data, position)
+
+        return self._cached(self._player_logs, (sport, player.lower(), team, time_duration, position), load)
+
+    def refresh_player_log(self, sport, player, team='Any', time_duration=DEFAULT_TIME_DURATION, position=None):
+        """
+        Refetch a player's log upstream and reload it into the cache. Every
+        cleaned window and combined-stat model of the player is dropped only
+        when the log changed.
+        Returns True when it changed or was not cached before.
+        """
+        changed = self.window_planner.refresh(sport.lower(), player) is not False
+        if changed:
+            with self._locks_guard:
+                stale = [key for key in self._player_logs if key[:2] == (sport, player.lower())]
+                for key in stale:
+                    self._player_logs.pop(key, None)
+                # Combo prices come from a model estimated on the old log
+                stale = [key for key in self._combined_models if key[:2] == (sport, player.lower())]
+                for key in stale:
+                    self._combined_models.pop(key, None)
+        self.fetch_player_log(sport, player, team, time_duration, position)
+        return changed
+
+    def get_combined_model(self, sport, player, team='Any', time_duration=DEFAULT_TIME_DURATION, method=None,
+                           position=None):
+        """Joint model of the player's combined-stat components, built once per log and method"""
+        method = method or self.method
+        position = resolve_position(sport, position)
+        player_data = self.fetch_player_log(sport, player, team, time_duration, position)
+        if not player_data or len(player_data) < 2:
+            raise NoDataError("No data found for this player")
+        # Keyed like the player log cache, so every spelling of the name shares one model
+        key = (sport, player.lower(), team, time_duration, position, method)
+        return self._cached(self._combined_models, key,
+                            lambda: CombinedStatModel.for_sport(player_data, sport, method))
+
+    def price_combos(self, sport, player, lines, team='Any', time_duration=DEFAULT_TIME_DURATION, method=None,
+                     position=None):
+        """Hit probabilities for every {combo: line} of a player from one covariance estimate"""
+        model = self.get_combined_model(sport, player, team, time_duration, method, position)
+        return model.hit_probabilities(lines)
+
+    def get_rankings(self, sport, statistic):
+        """Team defense rankings for a statistic, or None when unavailable for the sport"""
+        if sport not in DEFENSE_SPORTS:
+            return None
+
+        def load():
+            if is_combined_statistic(statistic):
+                components = get_combined_stat_components(sport, statistic)
+                combined_rankings, detailed_data = get_combined_stats_rankings(components)
+                return combined_rankings
+            return get_team_defense_rankings(statistic)
+
+        # The legacy scrapers return [] when a fetch failed; every league has teams, so that is never kept
+        return self._cached(self._rankings, (sport, statistic), load, keep=bool)
+
+    def get_allowed_matrix(self, sport, stats):
+        """Teams x stats matrix of per-game values allowed, built from the cached rankings"""
+        def load():
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(stats)))) as executor:
+                rankings = list(executor.map(lambda stat: self.get_rankings(sport, stat), stats))
+            available = {stat: ranks for stat, ranks in zip(stats, rankings) if ranks}
+            return TeamAllowedMatrix.from_rankings(available) if available else None
+
+        return self._cached(self._allowed_matrices, (sport, tuple(stats)), load)
+
+    def apply_opponent_adjustment(self, results, game_values):
+        """
+        Scale every projection by its opponent's allowed-per-game factor and
+        re-price the normal hit probability, one vectorized pass per sport.
+        game_values holds each result's per-game values, in the same order.
+        """
+        by_sport = {}
+        for result, values in zip(results, game_values):
+            if not result['error'] and result.get('opponent') and result['sport'] in DEFENSE_SPORTS:
+                by_sport.setdefault(result['sport'], []).append((result, values))
+
+        for sport, pairs in by_sport.items():
+            group = [result for result, values in pairs]
+            stats = sorted({comp for r in group for comp in get_combined_stat_components(sport, r['stat'])})
+            matrix = self.get_allowed_matrix(sport, stats)
+            if matrix is None:
+                continue
+
+            adjusted, factors = adjust_projections(matrix, sport, [r['projection'] for r in group],
+                                                   [r['opponent'] for r in group], [r['stat'] for r in group])
+            for result, projection, factor in zip(group, adjusted, factors):
+                result['opponent_factor'] = round(float(factor), 3)
+                result['adjusted_projection'] = round(float(projection), 2)
+
+            if self.engine != 'Normal':
+                continue  # The simulation engines do not centre on the projection
+            lines = np.array([r['line'] for r in group], dtype=float)
+            std_devs = np.array([np.std(values, ddof=1) if len(values) > 1 else 0.0 for result, values in pairs])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                z = np.nan_to_num((lines - adjusted) / std_devs)
+            probabilities = np.where(std_devs > 0, 1 - normal_cdf(z), (adjusted > lines).astype(float))
+            for result, probability in zip(group, probabilities):
+                result['hit_probability'] = round(float(probability) * 100, 1)
+                result['recommendation'] = get_recommendation(result['hit_probability'])
+
+    def evaluate_prop(self, prop):
+        """
+        Run the full analysis pipeline for a single prop. Failures raise instead
+        of being reported in result['error']: ScrapeError for a failed fetch,
+        NoDataError when the player has no games for the prop and ValueError
+        for a prop that cannot be evaluated (unknown sport or statistic).
+        """
+        return self._score_prop(prop, raise_errors=True)[0]
+
+    def _score_prop(self, prop, raise_errors=False):
+        """
+        (result, per-game values) of a prop; the values stay out of the result,
+        which is written and served. A failure is reported in result['error'],
+        or raised with raise_errors.
+        """
+        result = {
+            'sport': prop['sport'],
+            'player': prop['player'],
+            'stat': prop['stat'],
+            'line': prop['line'],
+            'opponent': prop.get('opponent'),
+            'error': None,
+        }
+
+        try:
+            position = resolve_position(prop['sport'], prop.get('position'), prop['stat'])
+            player_data = self.fetch_player_log(prop['sport'], prop['player'],
+                                                prop.get('team', 'Any'),
+                                                prop.get('time_duration', DEFAULT_TIME_DURATION), position)
+            if not player_data or len(player_data) < 2:
+                raise NoDataError("No data found for this player")
+
+            table = build_stat_table(player_data, prop['sport'], prop['stat'])
+            if len(table) < 2:
+                raise NoDataError(f"No valid {prop['stat']} values found")
+
+            values = [row[1] for row in table[1:]]
+            mean = simple_mean(table, prop['stat'])
+            wma = weighted_moving_average(table, prop['stat'])
+            method = prop.get('method') or self.method
+            projection = wma if method == 'WMA' else mean
+
+            if prop['stat'] in SPORTS_CONFIG.get(prop['sport'], {}).get('combined_stats', {}):
+                # Every combo for this player shares one mean/covariance estimate
+                priced = self.price_combos(prop['sport'], prop['player'], {prop['stat']: prop['line']},
+                                           prop.get('team', 'Any'),
+                                           prop.get('time_duration', DEFAULT_TIME_DURATION), method, position)
+                hit_probability, std_dev = priced[prop['stat']]['hit_probability'], priced[prop['stat']]['std_dev']
+            else:
+                hit_probability, std_dev = normal_hit_probability(values, prop['line'], projection)
+            hit_probability *= 100
+
+            result.update({
+                'games': len(values),
+                'mean': round(float(mean), 2),
+                'wma': round(float(wma), 2),
+                'projection': round(float(projection), 2),
+                'std_dev': round(float(std_dev), 2),
+                'hit_probability': round(float(hit_probability), 1),
+                'hit_rate': round(sum(1 for v in values if v >= prop['line']) / len(values) * 100, 1),
+                'recommendation': get_recommendation(hit_probability),
+            })
+
+        except Exception as e:
+            if raise_errors:
+                raise
+            result['error'] = str(e)
+            return result, []
+
+        # A missing defense table should not discard the projection itself
+        try:
+            rankings = self.get_rankings(prop['sport'], prop['stat'])
+            if rankings:
+                defense = get_defense_analysis(player_data, prop['stat'], opponent=prop.get('opponent'),
+                                               rankings=rankings)
+                if defense:
+                    result['opponent'] = defense['opponent']
+                    result['defense_rank'] = defense['rank']
+                    result['defense_difficulty'] = defense['difficulty']
+        except Exception as e:
+            result['defense_difficulty'] = f"Unavailable ({e})"
+
+        return result, values
+
+    def evaluate(self, props):
+        """Evaluate every prop in parallel and return the results ranked by hit probability"""
+        # Announce every window up front so each player's log is fetched once at the largest size
+        for prop in props:
+            if prop['sport'] in PLAYER_CLEANERS:
+                self.window_planner.reserve(prop['sport'].lower(), prop['player'],
+                                            prop.get('time_duration', DEFAULT_TIME_DURATION))
+        scored = list(self.executor.map(self._score_prop, props))
+        results = [result for result, values in scored]
+        game_values = [values for result, values in scored]
+
+        if self.engine != 'Normal':
+            # Simulate every successful prop in one vectorized batch
+            ok = [(result, values) for result, values in scored if not result['error']]
+            probabilities = batch_hit_probabilities([values for result, values in ok],
+                                                    [result['line'] for result, values in ok], self.engine)
+            for (result, values), probability in zip(ok, probabilities):
+                result['hit_probability'] = round(float(probability) * 100, 1)
+                result['recommendation'] = get_recommendation(result['hit_probability'])
+
+        if self.adjust_for_opponent:
+            self.apply_opponent_adjustment(results, game_values)
+
+        # Highest hit probability first, failed props last
+        results.sort(key=lambda r: (r['error'] is not None, -(r.get('hit_probability') or 0)))
+        for i, result in enumerate(results, 1):
+            result['rank'] = i
+        return results
+
+
+def write_results(results, path):
+    """Write the ranked results to a CSV or JSON file"""
+    if path.lower().endswith('.json'):
+        with open(path, 'w', encoding='utf-8') as fh:
+            json.dump(results, fh, indent=2)
+        return
+
+    with open(path, 'w', encoding='utf-8', newline='') as fh:
+        writer = csv.DictWriter(fh, fieldnames=RESULT_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def print_results(results):
+    """Print the ranked results as a table"""
+    print(f"{'#':>3s}  {'PLAYER':24s} {'STAT':6s} {'LINE':>6s} {'PROJ':>7s} {'HIT %':>6s}  {'OPP':12s} RECOMMENDATION")
+    print("-" * 90)
+    for r in results:
+        if r['error']:
+            print(f"{r['rank']:3d}  {r['player'][:24]:24s} {r['stat'][:6]:6s} {r['line']:6.1f}  ERROR: {r['error']}")
+            continue
+        opponent = r.get('opponent') or ''
+        if r.get('defense_rank'):
+            opponent = f"{opponent} (#{r['defense_rank']})"
+        projection = r.get('adjusted_projection') or r['projection']
+        print(f"{r['rank']:3d}  {r['player'][:24]:24s} {r['stat'][:6]:6s} {r['line']:6.1f} {projection:7.2f} "
+              f"{r['hit_probability']:6.1f}  {opponent[:12]:12s} {r['recommendation']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate a slate of player props without the dashboard")
+    parser.add_argument('props', help="CSV or JSON file with sport, player, stat, line and opponent columns")
+    parser.add_argument('-o', '--output', help="write the ranked results to this CSV or JSON file")
+    parser.add_argument('-m', '--method', choices=('Mean', 'WMA'), default='WMA',
+                        help="projection method (default: WMA)")
+    parser.add_argument('-e', '--engine', choices=PROBABILITY_ENGINES, default='Normal',
+                        help="hit probability engine (default: Normal)")
+    parser.add_argument('-a', '--adjust-opponent', action='store_true',
+                        help="scale projections by what the opponent allows relative to league average")
+    parser.add_argument('-w', '--workers', type=int, default=8, help="number of parallel workers (default: 8)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="show scraper output while evaluating")
+    args = parser.parse_args(argv)
+
+    props = load_props(args.props)
+    print(f"Evaluating {len(props)} props with {args.workers} workers...")
+
+    evaluator = SlateEvaluator(max_workers=args.workers, method=args.method, engine=args.engine,
+                               adjust_for_opponent=args.adjust_opponent)
+    if args.verbose:
+        results = evaluator.evaluate(props)
+    else:
+        # The scrapers print a lot of debugging output; keep the table readable
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            results = evaluator.evaluate(props)
+
+    print_results(results)
+    if args.output:
+        write_results(results, args.output)
+        print(f"\nResults written to {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
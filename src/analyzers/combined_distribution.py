@@ -0,0 +1,121 @@
+"""
+Correlated model for combined-stat props (PRA, PR, PA, RA, ...).
+
+Instead of summing the components per game and fitting a univariate normal
+for every combination, the component stats are modelled jointly: the mean
+vector and covariance matrix are estimated once from the player's log, and
+P(sum > line) for any set of combinations is a single vectorized pass
+(w . mu and w' Sigma w for each combination's weight vector w).
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from .probability import normal_cdf
+except ImportError:
+    from probability import normal_cdf
+
+try:
+    from ..core.sports_config import SPORTS_CONFIG, get_combined_stat_components
+except ImportError:
+    from sports_config import SPORTS_CONFIG, get_combined_stat_components
+
+
+def component_matrix(player_data, components, most_recent_first=False):
+    """
+    Games x components matrix of float values for the given columns.
+    Games with a missing or non-numeric component are skipped.
+    """
+    header = player_data[0]
+    missing = [comp for comp in components if comp not in header]
+    if missing:
+        raise ValueError(f"Component(s) not found in header: {', '.join(missing)}")
+    indices = [header.index(comp) for comp in components]
+
+    games = player_data[1:]
+    if most_recent_first and 'DATE' in header:
+        date_index = header.index('DATE')
+        games = sorted(games, key=lambda game: datetime.strptime(game[date_index], '%m/%d/%Y'), reverse=True)
+
+    rows = []
+    for game in games:
+        try:
+            rows.append([float(game[i]) for i in indices])
+        except (ValueError, TypeError, IndexError):
+            continue
+    return np.array(rows, dtype=float).reshape(len(rows), len(components))
+
+
+class CombinedStatModel:
+    """
+    Joint normal model of a player's component stats. Build it once per player
+    log and price any number of combination lines from the same covariance.
+    """
+
+    def __init__(self, player_data, components, method='Mean', sport=None):
+        self.sport = sport
+        self.components = list(components)
+        matrix = component_matrix(player_data, self.components, most_recent_first=True)
+        self.games = len(matrix)
+        if self.games == 0:
+            raise ValueError("No games with values for every component")
+
+        if method == 'WMA':
+            # Same linearly decreasing weights as weighted_moving_average, most recent first
+            weights = np.array([self.games - 0.5 * i for i in range(self.games)])
+            self.means = weights @ matrix / weights.sum()
+        else:
+            self.means = matrix.mean(axis=0)
+
+        if self.games > 1:
+            self.cov = np.atleast_2d(np.cov(matrix, rowvar=False, ddof=1))
+        else:
+            self.cov = np.zeros((len(self.components), len(self.components)))
+
+    @classmethod
+    def for_sport(cls, player_data, sport, method='Mean'):
+        """Model every component used by the sport's combined stats"""
+        components = []
+        for combo in SPORTS_CONFIG[sport]['combined_stats'].values():
+            components.extend(comp for comp in combo if comp not in components)
+        return cls(player_data, components, method, sport)
+
+    def combo_weights(self, combos):
+        """0/1 weight matrix (combos x components) for combo names or component lists"""
+        weights = np.zeros((len(combos), len(self.components)))
+        for row, combo in enumerate(combos):
+            parts = combo if isinstance(combo, (list, tuple)) else get_combined_stat_components(self.sport, combo)
+            for comp in parts:
+                if comp not in self.components:
+                    raise ValueError(f"Component {comp} is not part of this model")
+                weights[row, self.components.index(comp)] = 1
+        return weights
+
+    def distribution(self, combos):
+        """Mean and standard deviation of each combination's per-game total"""
+        weights = self.combo_weights(combos)
+        means = weights @ self.means
+        variances = np.einsum('ij,jk,ik->i', weights, self.cov, weights)
+        return means, np.sqrt(np.maximum(variances, 0))
+
+    def hit_probabilities(self, lines):
+        """
+        P(combination total > line) for every entry of {combo: line}, computed
+        in one vectorized pass. Returns {combo: {'mean', 'std_dev', 'hit_probability'}}.
+        """
+        combos = list(lines)
+        line_values = np.array([lines[combo] for combo in combos], dtype=float)
+        means, std_devs = self.distribution(combos)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = (line_values - means) / std_devs
+        probabilities = np.where(std_devs > 0, 1 - normal_cdf(np.nan_to_num(z)),
+                                 (means > line_values).astype(float))
+
+        return {
+            combo: {'mean': float(means[i]), 'std_dev': float(std_devs[i]),
+                    'hit_probability': float(probabilities[i])}
+            for i, combo in enumerate(combos)
+        }
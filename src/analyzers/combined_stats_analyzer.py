@@ -1,21 +1,19 @@
-import requests
-from bs4 import BeautifulSoup
 import time
 import re
 from team_defense_scraper import get_team_defense_rankings
+from datascrapper import STATMUSE_BASE_URL, fetch_table
 
 def get_stat_from_statmuse(url, stat_name):
     """Scrape a stat from a StatMuse table and return {team: value}"""
     print(f"Scraping {stat_name} from {url}")
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
-    table = soup.find('table')
+    # Shared with any concurrent request for the same team page
+    table = fetch_table(url)
     if not table:
         print(f"No table found for {stat_name}")
         return {}
     
     # Extract headers to find the correct column
-    headers = [header.get_text(strip=True) for header in table.find_all('th')]
+    headers, rows = table
     print(f"Headers for {stat_name}: {headers}")
     
     # Map player stats to defensive stat column names
@@ -44,17 +42,15 @@ def get_stat_from_statmuse(url, stat_name):
         stat_col = 3
         print(f"Using fallback column {stat_col} for {stat_name}")
     
-    rows = table.find_all('tr')[1:]  # skip header
     stat_dict = {}
     
-    for row in rows:
-        cells = row.find_all('td')
+    for cells in rows:
         if len(cells) <= stat_col or len(cells) < 3:
             continue
-        team = cells[2].get_text(strip=True)
+        team = cells[2]
         try:
             # Clean value by removing commas and converting to float
-            value_text = cells[stat_col].get_text(strip=True)
+            value_text = cells[stat_col]
             clean_value = value_text.replace(',', '').strip()
             value = float(clean_value)
             print(f"Extracted: {team} -> {value}")
@@ -162,7 +158,7 @@ def get_combined_stats_rankings(stat_combination):
     }
     
     # Create URLs for individual components
-    stat_url_template = 'https://www.statmuse.com/nba/ask/nba-teams-that-give-up-the-most-{}-per-game-this-season'
+    stat_url_template = STATMUSE_BASE_URL + '/nba/ask/nba-teams-that-give-up-the-most-{}-per-game-this-season'
     url_map = {comp: stat_url_template.format(component_url_map.get(comp, comp.lower())) for comp in stat_combination}
     
     # Use the corrected function that uses individual URLs
@@ -1,7 +1,6 @@
-import requests
-from bs4 import BeautifulSoup
 import time
 import re
+from team_defense_scraper import team_defense_rankings_result
 
 def get_comprehensive_defense_rankings():
     """
@@ -56,131 +55,22 @@ def get_comprehensive_defense_rankings():
 
 def get_team_defense_rankings_single_stat(statistic):
     """
-    Get team defense rankings for a single statistic
+    Get team defense rankings for a single statistic as (rank, team, value),
+    [] when they could not be fetched
     """
-    # Map player stats to team defensive stats (using the same mapping as the working scraper)
-    stat_mapping = {
-        'PTS': 'points',
-        'REB': 'rebounds', 
-        'AST': 'assists',
-        'STL': 'steals',
-        'BLK': 'blocks',
-        '3PM': '3-pointers',
-        'FTM': 'free-throws',
-        'TOV': 'turnovers',
-        'FGM': 'field-goals',
-        'FGA': 'field-goal-attempts',
-        '3PA': '3-point-attempts',
-        'FTA': 'free-throw-attempts'
-    }
-    
-    # Convert player stat to team defensive stat
-    team_stat = stat_mapping.get(statistic, statistic.lower())
+    # Same page and parsing as the working scraper
+    result = team_defense_rankings_result(statistic)
+    if not result.ok:
+        print(f"Error fetching {statistic} rankings: {result.error}")
+        return []
     
-    # Use the same URL pattern as the working scraper
-    url = f"https://www.statmuse.com/nba/ask/nba-teams-that-give-up-the-most-{team_stat}-per-game-this-season"
+    rankings = [(rank, team_name, value) for team_name, value, rank in result.data]  # (rank, team, value)
     
-    if not url:
-        print(f"No URL found for statistic: {statistic}")
-        return []
+    print(f"  Found {len(rankings)} teams for {statistic}")
+    if rankings:
+        print(f"  Sample: {rankings[0]}")  # Show first ranking
     
-    try:
-        response = requests.get(url)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find the table
-        table = soup.find('table')
-        if not table:
-            print(f"No table found for {statistic}")
-            return []
-        
-        # Extract headers
-        headers = [header.get_text(strip=True) for header in table.find_all('th')]
-        
-        # Based on the headers, team names are in column 2, defensive stats in column 3 (per-game) or 4 (total)
-        team_name_col = 2  # TEAM column
-        
-        # Based on our debug, we know the structure for all stats:
-        # Column 3: OPP [STAT]/GP (per-game stats like 121.23, 29.62, 48.88)
-        # Column 4: OPP [STAT] (total stats like 9,941, 2,429, 4,008)
-        # We want per-game stats, so use column 3
-        
-        # Map player stats to defensive stat column names
-        stat_column_map = {
-            'PTS': 'OPP PTS/GP',
-            'AST': 'OPP AST/GP', 
-            'REB': 'OPP REB/GP',
-            'STL': 'OPP STL/GP',
-            'BLK': 'OPP BLK/GP',
-            '3PM': 'OPP 3PM/GP',
-            'FTM': 'OPP FTM/GP',
-            'TOV': 'OPP TOV/GP',
-            'FGM': 'OPP FGM/GP',
-            'FGA': 'OPP FGA/GP',
-            '3PA': 'OPP 3PA/GP',
-            'FTA': 'OPP FTA/GP'
-        }
-        
-        # Find the correct per-game column
-        expected_per_game_col = stat_column_map.get(statistic, f'OPP {statistic}/GP')
-        if expected_per_game_col in headers:
-            def_stat_col = headers.index(expected_per_game_col)
-            print(f"Using per-game stats from column {def_stat_col} ({expected_per_game_col})")
-        else:
-            # Fallback to column 3 (which should always be the per-game column)
-            def_stat_col = 3
-            print(f"Using fallback column {def_stat_col} for {statistic}")
-        
-        # Extract rows
-        rows = table.find_all('tr')[1:]  # Skip header row
-        raw_rankings = []
-        
-        for i, row in enumerate(rows):
-            cells = row.find_all('td')
-            if len(cells) > max(team_name_col, def_stat_col):
-                try:
-                    # Get team name from the team column (index 2)
-                    team_cell = cells[team_name_col]
-                    value = cells[def_stat_col].get_text(strip=True)
-                    
-                    # Get team name from the team cell
-                    team_name = team_cell.get_text(strip=True)
-                    
-                    # Clean up team name
-                    team_name = re.sub(r'\s*\([^)]*\)', '', team_name)  # Remove parentheses
-                    team_name = re.sub(r'\s*Logo.*', '', team_name)  # Remove Logo text
-                    team_name = re.sub(r'\s*2024-25.*', '', team_name)  # Remove season
-                    team_name = team_name.strip()
-                    
-                    # Clean value by removing commas and converting to float
-                    try:
-                        # Remove commas and any extra whitespace
-                        clean_value = value.replace(',', '').strip()
-                        float_value = float(clean_value)
-                        if team_name and len(team_name) > 2:  # Only add if we have a meaningful team name
-                            raw_rankings.append((team_name, float_value))
-                    except ValueError:
-                        print(f"  Skipping non-numeric value: '{value}' for team '{team_name}'")
-                        continue  # Skip non-numeric values
-                except Exception as e:
-                    print(f"  Error processing row {i}: {e}")
-                    continue
-        
-        # Sort by value (worst defense first) and assign proper ranks
-        raw_rankings.sort(key=lambda x: x[1], reverse=True)
-        rankings = []
-        for i, (team_name, value) in enumerate(raw_rankings):
-            rankings.append((i + 1, team_name, value))  # Fix order: (rank, team, value)
-        
-        print(f"  Found {len(rankings)} teams for {statistic}")
-        if rankings:
-            print(f"  Sample: {rankings[0]}")  # Show first ranking
-        
-        return rankings
-        
-    except Exception as e:
-        print(f"Error fetching {statistic} rankings: {e}")
-        return []
+    return rankings
 
 def clean_team_name(team_name):
     """
@@ -0,0 +1,247 @@
+"""
+Generic team defense engine for every sport in SPORTS_CONFIG.
+
+For a sport, every statistic in its `stat_mapping` is fetched concurrently
+from the sport's `url_template` page and collected into one teams x stats
+matrix of per-game values allowed. The matrix is cached, so opponent
+lookups and ranking tables for any statistic (including combined ones) are
+answered from memory; warm() builds the matrices in the background so the
+dashboard never waits on them, and refresh() revalidates a sport's team pages
+and only rebuilds its matrix when one of them changed.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    from ..scrapers.datascrapper import STATMUSE_BASE_URL, fetch_table, revalidate_table
+    from ..scrapers.request_budget import PREFETCH, bind_priority, request_priority
+    from ..scrapers.singleflight import SingleFlight
+    from ..scrapers.team_defense_scraper import NBA_TEAM_ABBREVS
+    from ..core.sports_config import SPORTS_CONFIG, get_combined_stat_components
+    from .opponent_adjustment import TeamAllowedMatrix
+except ImportError:
+    import sys
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for subdir in ('scrapers', 'core', 'analyzers'):
+        path = os.path.join(src_dir, subdir)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    from datascrapper import STATMUSE_BASE_URL, fetch_table, revalidate_table
+    from request_budget import PREFETCH, bind_priority, request_priority
+    from singleflight import SingleFlight
+    from team_defense_scraper import NBA_TEAM_ABBREVS
+    from sports_config import SPORTS_CONFIG, get_combined_stat_components
+    from opponent_adjustment import TeamAllowedMatrix
+
+# Seconds before a sport's matrix is rebuilt; the team tables themselves are revalidated by fetch_table
+DEFAULT_MATRIX_TTL = 15 * 60
+
+STATMUSE_SITE = 'https://www.statmuse.com'
+
+
+def defense_url(sport, statistic):
+    """Team defense page for a statistic, on the configured StatMuse base URL"""
+    config = SPORTS_CONFIG[sport]
+    template = config['url_template']
+    if template.startswith(STATMUSE_SITE):
+        template = STATMUSE_BASE_URL + template[len(STATMUSE_SITE):]
+    return template.format(config['stat_mapping'][statistic])
+
+
+def clean_team_name(team_name):
+    """Strip the logo, season and parenthesised text StatMuse puts around team names"""
+    team_name = re.sub(r'\s*\([^)]*\)', '', team_name)
+    team_name = re.sub(r'\s*Logo.*', '', team_name)
+    team_name = re.sub(r'\s*\d{4}-\d{2}.*', '', team_name)
+    return team_name.strip()
+
+
+def parse_team_values(headers, rows, statistic):
+    """[(team, per_game_value), ...] from a team defense table"""
+    # Per-game values live in the 'OPP {STAT}/GP' column, otherwise the first '/GP' column or column 3
+    expected = f'OPP {statistic}/GP'
+    if expected in headers:
+        value_col = headers.index(expected)
+    else:
+        value_col = next((i for i, name in enumerate(headers) if name.endswith('/GP')), 3)
+    team_col = 2
+
+    values = []
+    for cells in rows:
+        if len(cells) <= max(team_col, value_col):
+            continue
+        team_name = clean_team_name(cells[team_col])
+        try:
+            value = float(cells[value_col].replace(',', '').strip())
+        except ValueError:
+            continue
+        if team_name and len(team_name) > 2:
+            values.append((team_name, value))
+    return values
+
+
+def table_rankings(table, statistic):
+    """[(team, value, rank), ...] worst defense first from a team defense table, as get_team_defense_rankings"""
+    if not table:
+        return []
+    headers, rows = table
+    values = sorted(parse_team_values(headers, rows, statistic), key=lambda item: item[1], reverse=True)
+    return [(team, value, rank) for rank, (team, value) in enumerate(values, 1)]
+
+
+def difficulty_for_rank(rank, total_teams):
+    """Same Easy/Medium/Hard thresholds as get_defense_analysis"""
+    rank_percentage = (rank / total_teams) * 100
+    if rank_percentage <= 33:
+        return "Easy", "green", rank_percentage
+    elif rank_percentage <= 66:
+        return "Medium", "orange", rank_percentage
+    return "Hard", "red", rank_percentage
+
+
+def table_fingerprint(tables):
+    """Hash of the content of {stat: table}"""
+    return hashlib.sha256(repr(sorted(tables.items())).encode()).hexdigest()
+
+
+class DefenseEngine:
+    """Cached teams x stats defense matrices for every configured sport"""
+
+    def __init__(self, max_workers=8, matrix_ttl=DEFAULT_MATRIX_TTL):
+        self.max_workers = max_workers
+        self.matrix_ttl = matrix_ttl
+        self._matrices = {}
+        # Hash of the team tables each matrix was built from
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+
+    def _fetch_tables(self, sport, fetch):
+        """{stat: table} for every mapped stat of the sport, fetched concurrently"""
+        stats = list(SPORTS_CONFIG[sport]['stat_mapping'])
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(stats)))) as executor:
+            # The pages are fetched at the priority of whoever asked for the matrix
+            fetch_stat = bind_priority(lambda stat: fetch(defense_url(sport, stat)))
+            return dict(zip(stats, executor.map(fetch_stat, stats)))
+
+    def _build_matrix(self, sport, tables=None):
+        config = SPORTS_CONFIG[sport]
+        if tables is None:
+            tables = self._fetch_tables(sport, fetch_table)
+
+        rankings = {stat: table_rankings(table, stat) for stat, table in tables.items()}
+        rankings = {stat: ranks for stat, ranks in rankings.items() if ranks}
+        if not rankings:
+            raise ValueError(f"No team defense data found for {sport}")
+        abbreviations = NBA_TEAM_ABBREVS if sport == 'NBA' else config.get('team_abbrevs', {})
+        matrix = TeamAllowedMatrix.from_rankings(rankings, abbreviations)
+        with self._lock:
+            self._matrices[sport] = (time.time(), matrix)
+            self._fingerprints[sport] = table_fingerprint(tables)
+        return matrix
+
+    def cached_matrix(self, sport):
+        """The sport's matrix if it has been built, without fetching"""
+        with self._lock:
+            entry = self._matrices.get(sport)
+        return entry[1] if entry else None
+
+    def get_matrix(self, sport):
+        """Teams x stats matrix for the sport, built once and shared by concurrent callers"""
+        with self._lock:
+            entry = self._matrices.get(sport)
+        if entry and time.time() - entry[0] <= self.matrix_ttl:
+            return entry[1]
+        return self._flight.do(sport, self._build_matrix, sport)
+
+    def refresh(self, sport):
+        """
+        Revalidate the sport's team pages now and rebuild the matrix only if
+        one of them changed; an unchanged matrix is kept and counts as fresh
+        again. Returns True when the matrix was rebuilt.
+        """
+        tables = self._fetch_tables(sport, revalidate_table)
+        with self._lock:
+            entry = self._matrices.get(sport)
+            if entry is not None and self._fingerprints.get(sport) == table_fingerprint(tables):
+                self._matrices[sport] = (time.time(), entry[1])
+                return False
+        self._flight.do(sport, self._build_matrix, sport, tables)
+        return True
+
+    def last_built(self, sport):
+        """Time the sport's matrix was last built or found unchanged, or None"""
+        with self._lock:
+            entry = self._matrices.get(sport)
+        return entry[0] if entry else None
+
+    def warm(self, sports=None):
+        """Build the matrices in a background thread; returns the thread"""
+        sports = list(sports or SPORTS_CONFIG)
+
+        def run():
+            for sport in sports:
+                try:
+                    with request_priority(PREFETCH):
+                        self.get_matrix(sport)
+                except Exception as e:
+                    print(f"Could not warm {sport} defense rankings: {e}")
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def rankings(self, sport, statistic, wait=True):
+        """
+        [(team, value, rank), ...] worst defense first for a single or combined
+        statistic. With wait=False returns None instead of fetching when the
+        matrix is not built yet.
+        """
+        matrix = self.get_matrix(sport) if wait else self.cached_matrix(sport)
+        if matrix is None:
+            return None
+
+        weights = matrix.stat_weights(sport, [statistic])[0]
+        components = get_combined_stat_components(sport, statistic)
+        if not weights.any() or weights.sum() < len(components):
+            return []
+
+        # Teams missing a component are left out rather than ranked on a partial total
+        columns = matrix.values[:, weights > 0]
+        complete = ~np.isnan(columns).any(axis=1)
+        totals = np.nansum(columns, axis=1)
+        ranked = sorted(((matrix.teams[i], float(totals[i])) for i in range(len(matrix.teams)) if complete[i]),
+                        key=lambda item: item[1], reverse=True)
+        return [(team, value, rank) for rank, (team, value) in enumerate(ranked, 1)]
+
+    def analyze(self, sport, opponent, statistic, wait=True):
+        """Opponent analysis in the same form as get_defense_analysis, or None"""
+        rankings = self.rankings(sport, statistic, wait)
+        if not rankings:
+            return None
+
+        matrix = self.cached_matrix(sport)
+        index = matrix.team_index(opponent)
+        if index is None:
+            return None
+        team = matrix.teams[index]
+        for name, value, rank in rankings:
+            if name == team:
+                difficulty, color, rank_percentage = difficulty_for_rank(rank, len(rankings))
+                return {
+                    'opponent': team,
+                    'rank': rank,
+                    'total_teams': len(rankings),
+                    'value_allowed': value,
+                    'difficulty': difficulty,
+                    'color': color,
+                    'rank_percentage': rank_percentage
+                }
+        return None
@@ -0,0 +1,224 @@
+"""
+Lazily evaluated, memoized values derived from a player's game log.
+
+The dashboard derives a chain of values from one (player log, statistic,
+projection): the per-game values sorted by date, the Mean/WMA, the standard
+deviation and confidence interval, the CDF/PDF at the projection, the hit
+probability and the bar colours. LazyGraph holds each of them as a node that
+is computed the first time it is read and memoized. Setting an input only
+drops the nodes that depend on it, so moving the projection recomputes the
+CDF, PDF, hit probability and colours, not the values or their spread.
+
+    values = DashboardValues(player_data, 'NBA', 'PTS', projection=25.5, method='WMA')
+    values['hit_probability']
+    values.set('projection', 27.5)   # only the projection-dependent nodes are recomputed
+"""
+
+import threading
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from ..core.sports_config import get_combined_stat_components, is_combined_statistic
+    from .batch_evaluator import get_recommendation
+    from .monte_carlo import SIMULATION_ENGINES, simulate_outcomes
+    from .probability import normal_cdf
+    from .WMA import wma_kernel
+except ImportError:
+    from sports_config import get_combined_stat_components, is_combined_statistic
+    from batch_evaluator import get_recommendation
+    from monte_carlo import SIMULATION_ENGINES, simulate_outcomes
+    from probability import normal_cdf
+    from WMA import wma_kernel
+
+# Two-sided 95% t critical value the dashboard has always used for the confidence interval
+T_CRITICAL = 2.571
+
+RECOMMENDATION_COLORS = {'STRONG BET': 'green', 'MODERATE BET': 'orange', 'AVOID BET': 'red'}
+
+
+class LazyGraph:
+    """
+    Named inputs and nodes computed from them on demand. A node's value is
+    memoized until one of the inputs or nodes it depends on changes.
+    """
+
+    def __init__(self):
+        self._inputs = {}
+        self._nodes = {}
+        self._cache = {}
+        self._dependents = {}
+        self._lock = threading.RLock()
+        # How many times each node has been computed
+        self.evaluations = Counter()
+
+    def add_input(self, name, value):
+        self._inputs[name] = value
+        self._dependents.setdefault(name, set())
+
+    def add_node(self, name, dependencies, function):
+        """function(*dependency values) computes the node"""
+        missing = [dep for dep in dependencies if dep not in self._inputs and dep not in self._nodes]
+        if missing:
+            raise ValueError(f"Node {name} depends on undefined {', '.join(missing)}")
+        self._nodes[name] = (tuple(dependencies), function)
+        self._dependents.setdefault(name, set())
+        for dep in dependencies:
+            self._dependents[dep].add(name)
+
+    def set(self, name, value):
+        """Change an input; returns True when it changed and its dependents were dropped"""
+        with self._lock:
+            if name not in self._inputs:
+                raise KeyError(f"{name} is not an input")
+            old = self._inputs[name]
+            if old is value or (type(old) is type(value) and not isinstance(value, np.ndarray) and old == value):
+                return False
+            self._inputs[name] = value
+            self.invalidate(name)
+            return True
+
+    def update(self, **values):
+        return [name for name, value in values.items() if self.set(name, value)]
+
+    def invalidate(self, name):
+        """Drop the memoized value of everything downstream of name"""
+        with self._lock:
+            pending, seen = list(self._dependents[name]), set()
+            while pending:
+                node = pending.pop()
+                if node not in seen:
+                    seen.add(node)
+                    self._cache.pop(node, None)
+                    pending.extend(self._dependents[node])
+
+    def is_cached(self, name):
+        return name in self._cache
+
+    def __contains__(self, name):
+        return name in self._inputs or name in self._nodes
+
+    def __getitem__(self, name):
+        with self._lock:
+            if name in self._inputs:
+                return self._inputs[name]
+            if name in self._cache:
+                return self._cache[name]
+            if name not in self._nodes:
+                raise KeyError(name)
+            dependencies, function = self._nodes[name]
+            value = function(*(self[dep] for dep in dependencies))
+            self._cache[name] = value
+            self.evaluations[name] += 1
+            return value
+
+
+def sorted_games(player_data, statistic, components):
+    """[(date, value, team, opponent), ...] in date order for every dated game of the log"""
+    header = player_data[0]
+    combined = is_combined_statistic(statistic)
+    if not combined and statistic not in header:
+        raise ValueError(f"Parameter {statistic} not found in header.")
+    date_index = header.index('DATE')
+    team_index = header.index('TM') if 'TM' in header else None
+    opp_index = header.index('OPP') if 'OPP' in header else None
+    indices = [header.index(comp) for comp in components if comp in header]
+
+    games = []
+    for game in player_data[1:]:
+        if not game[date_index]:
+            continue
+        if combined:
+            # Components missing from a game count as 0, as the dashboard has always summed them
+            value = 0.0
+            for i in indices:
+                try:
+                    value += float(game[i])
+                except (ValueError, TypeError, IndexError):
+                    continue
+        else:
+            if game[indices[0]] in ('', None):
+                continue
+            value = float(game[indices[0]])
+        games.append((datetime.strptime(str(game[date_index]), '%m/%d/%Y'), value,
+                      game[team_index] if team_index is not None else '',
+                      game[opp_index] if opp_index is not None else ''))
+    games.sort(key=lambda g: g[0])
+    return games
+
+
+def quantitative_value(method, values):
+    """The dashboard's analysis method over the game values in date order"""
+    if not len(values):
+        return 0
+    method = method.lower()
+    if method == 'wma':
+        # weighted_moving_average: the most recent game weighs n, the one before n - 0.5, ...
+        kernel = wma_kernel(len(values))
+        return float(values[::-1] @ kernel / kernel.sum())
+    if method == 'median':
+        return float(np.median(values))
+    if method == 'mode':
+        values = list(values)
+        return max(set(values), key=values.count)
+    return float(np.mean(values))
+
+
+def _pdf_curve(quantitative, std_dev):
+    """(x, density) of the normal curve, or None when the games have no spread to draw"""
+    if not std_dev:
+        return None
+    x = np.linspace(quantitative - 4 * std_dev, quantitative + 4 * std_dev, 1000)
+    return x, (1 / (std_dev * np.sqrt(2 * np.pi))) * np.exp(-0.5 * ((x - quantitative) / std_dev) ** 2)
+
+
+def _cdf(z, simulated, projection, quantitative, std_dev):
+    if simulated is not None:
+        return 1 - float((simulated > projection).mean())
+    if not std_dev:
+        # Every game had the same value, so the outcome is deterministic (as in normal_hit_probability)
+        return 0.0 if quantitative > projection else 1.0
+    return float(normal_cdf(z))
+
+
+class DashboardValues(LazyGraph):
+    """
+    The dashboard's derived values for one (player log, statistic, projection).
+    Inputs: player_data, sport, statistic, projection, method, engine.
+    """
+
+    def __init__(self, player_data, sport, statistic, projection, method='Mean', engine='Normal'):
+        super().__init__()
+        for name, value in (('player_data', player_data), ('sport', sport), ('statistic', statistic),
+                            ('projection', float(projection)), ('method', method), ('engine', engine)):
+            self.add_input(name, value)
+
+        self.add_node('components', ('sport', 'statistic'), get_combined_stat_components)
+        self.add_node('games', ('player_data', 'statistic', 'components'), sorted_games)
+        self.add_node('dates', ('games',), lambda games: [g[0] for g in games])
+        self.add_node('values', ('games',), lambda games: np.array([g[1] for g in games], dtype=float))
+        self.add_node('team_abbrs', ('games',), lambda games: [g[2] for g in games])
+        self.add_node('opponents', ('games',), lambda games: [g[3] for g in games])
+        self.add_node('quantitative', ('method', 'values'), quantitative_value)
+        self.add_node('std_dev', ('values',), lambda values: float(np.std(values, ddof=1)) if len(values) > 1 else 0.0)
+        self.add_node('conf_interval', ('quantitative', 'std_dev', 'values'),
+                      lambda q, s, values: (q - T_CRITICAL * s / np.sqrt(len(values)),
+                                            q + T_CRITICAL * s / np.sqrt(len(values))))
+        self.add_node('pdf_curve', ('quantitative', 'std_dev'), _pdf_curve)
+        self.add_node('simulated', ('values', 'engine'),
+                      lambda values, engine: simulate_outcomes(values, engine) if engine in SIMULATION_ENGINES else None)
+
+        # Everything below depends on the projection
+        self.add_node('z', ('projection', 'quantitative', 'std_dev'), lambda p, q, s: (p - q) / s if s else 0.0)
+        self.add_node('cdf', ('z', 'simulated', 'projection', 'quantitative', 'std_dev'), _cdf)
+        self.add_node('pdf', ('z', 'std_dev'),
+                      lambda z, s: (1 / (s * np.sqrt(2 * np.pi))) * np.exp(-0.5 * z ** 2) if s else 0.0)
+        self.add_node('hit_probability', ('cdf',), lambda cdf: (1 - cdf) * 100)
+        self.add_node('hit_rate', ('values', 'projection'),
+                      lambda values, p: float((values >= p).sum() / len(values) * 100) if len(values) else 0.0)
+        self.add_node('bar_colors', ('values', 'projection'),
+                      lambda values, p: ['green' if value >= p else 'red' for value in values])
+        self.add_node('recommendation', ('hit_probability',),
+                      lambda hit: (get_recommendation(hit), RECOMMENDATION_COLORS[get_recommendation(hit)]))
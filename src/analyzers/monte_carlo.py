@@ -0,0 +1,134 @@
+"""
+Monte Carlo hit probability engines.
+
+The normal approximation used by the dashboards is a poor fit for low count
+stats like BLK or 3PM, so these engines simulate the next game instead:
+
+- Bootstrap:   resample the player's own game values
+- Poisson:     Poisson fit to the game values
+- NegBinomial: negative binomial (gamma-Poisson) fit by method of moments,
+               which falls back to Poisson when the log is not over-dispersed
+
+All sampling is vectorized with NumPy, and batch_hit_probabilities evaluates
+many props at once without a Python loop per draw.
+"""
+
+import numpy as np
+
+try:
+    from .probability import normal_hit_probability
+except ImportError:
+    from probability import normal_hit_probability
+
+PROBABILITY_ENGINES = ('Normal', 'Bootstrap', 'Poisson', 'NegBinomial')
+SIMULATION_ENGINES = ('Bootstrap', 'Poisson', 'NegBinomial')
+
+DEFAULT_DRAWS = 100_000
+
+# Upper bound on simulated values held in memory at once by the batch evaluator
+BATCH_CHUNK_SIZE = 4_000_000
+
+
+def _fit_negative_binomial(mean, var):
+    """Method of moments fit; returns the gamma shape r, or None when Poisson fits better"""
+    if var <= mean or mean <= 0:
+        return None
+    return mean * mean / (var - mean)
+
+
+def simulate_outcomes(values, engine='Bootstrap', draws=DEFAULT_DRAWS, rng=None):
+    """Simulate `draws` next-game values for the player's game values"""
+    rng = rng if rng is not None else np.random.default_rng()
+    data = np.asarray(values, dtype=float)
+    if len(data) == 0:
+        raise ValueError("No game values to simulate from")
+
+    if engine == 'Bootstrap':
+        return data[rng.integers(0, len(data), size=draws)]
+
+    mean = data.mean()
+    if engine == 'Poisson':
+        return rng.poisson(mean, size=draws).astype(float)
+
+    if engine == 'NegBinomial':
+        shape = _fit_negative_binomial(mean, data.var(ddof=1) if len(data) > 1 else 0.0)
+        if shape is None:
+            return rng.poisson(mean, size=draws).astype(float)
+        rates = rng.gamma(shape, mean / shape, size=draws)
+        return rng.poisson(rates).astype(float)
+
+    raise ValueError(f"Unknown simulation engine: {engine}")
+
+
+def hit_probability(values, line, engine='Normal', quantitative=None, draws=DEFAULT_DRAWS, rng=None):
+    """
+    Probability in [0, 1] that the next game goes over the line.
+    The Normal engine centres on `quantitative` (the Mean/WMA projection).
+    """
+    if engine == 'Normal':
+        if quantitative is None:
+            quantitative = float(np.mean(values))
+        return normal_hit_probability(values, line, quantitative)[0]
+    return float((simulate_outcomes(values, engine, draws, rng) > line).mean())
+
+
+def batch_hit_probabilities(value_lists, lines, engine='Bootstrap', draws=DEFAULT_DRAWS, rng=None):
+    """
+    Hit probabilities for many props at once.
+    value_lists: one sequence of game values per prop (lengths may differ)
+    lines: the prop line for each entry
+    Returns an array of probabilities in [0, 1].
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    lines = np.asarray(lines, dtype=float)
+    count = len(value_lists)
+    probabilities = np.zeros(count)
+    if count == 0:
+        return probabilities
+
+    lengths = np.array([len(v) for v in value_lists])
+    if (lengths == 0).any():
+        raise ValueError("Every prop needs at least one game value")
+
+    # Ragged logs padded into one matrix, one row per prop
+    padded = np.zeros((count, lengths.max()))
+    for i, values in enumerate(value_lists):
+        padded[i, :lengths[i]] = values
+
+    if engine == 'Normal':
+        for i in range(count):
+            probabilities[i] = hit_probability(padded[i, :lengths[i]], lines[i], 'Normal')
+        return probabilities
+
+    means = padded.sum(axis=1) / lengths
+    if engine == 'NegBinomial':
+        # Sample variance of each row, ignoring the padding
+        mask = np.arange(padded.shape[1]) < lengths[:, None]
+        sq_dev = np.where(mask, (padded - means[:, None]) ** 2, 0.0).sum(axis=1)
+        variances = np.divide(sq_dev, lengths - 1, out=np.zeros(count), where=lengths > 1)
+        over_dispersed = (variances > means) & (means > 0)
+        shapes = np.where(over_dispersed, means ** 2 / np.where(over_dispersed, variances - means, 1.0), np.inf)
+    elif engine not in ('Bootstrap', 'Poisson'):
+        raise ValueError(f"Unknown simulation engine: {engine}")
+
+    chunk = max(1, BATCH_CHUNK_SIZE // draws)
+    for start in range(0, count, chunk):
+        rows = slice(start, min(start + chunk, count))
+        size = (rows.stop - rows.start, draws)
+
+        if engine == 'Bootstrap':
+            idx = (rng.random(size) * lengths[rows, None]).astype(np.int64)
+            outcomes = np.take_along_axis(padded[rows], idx, axis=1)
+        elif engine == 'Poisson':
+            outcomes = rng.poisson(np.broadcast_to(means[rows, None], size))
+        else:
+            chunk_shapes = shapes[rows, None]
+            finite = np.isfinite(chunk_shapes)
+            safe_shapes = np.where(finite, chunk_shapes, 1.0)
+            gamma_rates = rng.gamma(np.broadcast_to(safe_shapes, size)) * (means[rows, None] / safe_shapes)
+            rates = np.where(finite, gamma_rates, means[rows, None])
+            outcomes = rng.poisson(rates)
+
+        probabilities[rows] = (outcomes > lines[rows, None]).mean(axis=1)
+
+    return probabilities
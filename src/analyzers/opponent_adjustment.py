@@ -0,0 +1,111 @@
+"""
+Opponent-adjusted projections.
+
+A player's projection is scaled by how much the upcoming opponent allows
+relative to the league average:
+
+    adjusted = projection * (opponent allowed per game / league average allowed)
+
+Combined stats use the sum of their components on both sides. The per-game
+values allowed by every team are held in a TeamAllowedMatrix (teams x stats)
+built from the cached defense rankings, so a whole slate is adjusted with one
+vectorized lookup instead of a scrape per prop.
+"""
+
+import os
+
+import numpy as np
+
+try:
+    from ..scrapers.team_defense_scraper import NBA_TEAM_ABBREVS
+    from ..core.sports_config import get_combined_stat_components, same_team
+except ImportError:
+    import sys
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for subdir in ('scrapers', 'core'):
+        path = os.path.join(src_dir, subdir)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    from team_defense_scraper import NBA_TEAM_ABBREVS
+    from sports_config import get_combined_stat_components, same_team
+
+
+class TeamAllowedMatrix:
+    """Per-game values allowed by each team (rows) for each statistic (columns)"""
+
+    def __init__(self, teams, stats, values, abbreviations=None):
+        self.teams = list(teams)
+        self.stats = list(stats)
+        self.values = np.asarray(values, dtype=float)
+        # Teams missing from a ranking table are NaN and left out of the league average
+        self.league_average = np.nanmean(self.values, axis=0)
+        self.abbreviations = abbreviations if abbreviations is not None else NBA_TEAM_ABBREVS
+        self._team_lookup = {}
+
+    @classmethod
+    def from_rankings(cls, rankings_by_stat, abbreviations=None):
+        """
+        Build the matrix from {stat: [(team, value, rank), ...]} as returned by
+        get_team_defense_rankings
+        """
+        stats = list(rankings_by_stat)
+        teams = []
+        for rankings in rankings_by_stat.values():
+            teams.extend(team for team, value, rank in rankings if team not in teams)
+
+        values = np.full((len(teams), len(stats)), np.nan)
+        for col, stat in enumerate(stats):
+            for team, value, rank in rankings_by_stat[stat]:
+                values[teams.index(team), col] = value
+        return cls(teams, stats, values, abbreviations)
+
+    def team_index(self, opponent):
+        """Row for an opponent given as an abbreviation, nickname or full name; None if unknown"""
+        if not opponent:
+            return None
+        key = opponent.strip().lower()
+        if key in self._team_lookup:
+            return self._team_lookup[key]
+
+        # Whole names only: a substring match would take the Hornets for the Nets
+        nickname = self.abbreviations.get(opponent.strip().upper(), opponent.strip())
+        index = next((i for i, team in enumerate(self.teams) if same_team(team, nickname)), None)
+        self._team_lookup[key] = index
+        return index
+
+    def stat_weights(self, sport, statistics):
+        """0/1 weight matrix (props x stats) selecting each statistic's components"""
+        weights = np.zeros((len(statistics), len(self.stats)))
+        for row, statistic in enumerate(statistics):
+            for comp in get_combined_stat_components(sport, statistic):
+                if comp in self.stats:
+                    weights[row, self.stats.index(comp)] = 1
+        return weights
+
+    def adjustment_factors(self, sport, opponents, statistics):
+        """
+        Allowed-vs-league-average factor for every (opponent, statistic) pair.
+        Unknown opponents or statistics get a neutral factor of 1.
+        """
+        weights = self.stat_weights(sport, statistics)
+        rows = np.array([self.team_index(opp) for opp in opponents], dtype=object)
+        known = np.array([row is not None for row in rows], dtype=bool)
+
+        allowed = np.zeros((len(opponents), len(self.stats)))
+        if known.any():
+            allowed[known] = self.values[rows[known].astype(int)]
+        # A component the opponent has no value for falls back to the league average
+        allowed = np.where(np.isnan(allowed), self.league_average, allowed)
+
+        allowed_totals = (allowed * weights).sum(axis=1)
+        league_totals = weights @ self.league_average
+        factors = np.ones(len(opponents))
+        valid = known & (league_totals > 0)
+        factors[valid] = allowed_totals[valid] / league_totals[valid]
+        return factors
+
+
+def adjust_projections(matrix, sport, projections, opponents, statistics):
+    """Scale projections by the opponent factors; returns (adjusted, factors)"""
+    factors = matrix.adjustment_factors(sport, opponents, statistics)
+    return np.asarray(projections, dtype=float) * factors, factors
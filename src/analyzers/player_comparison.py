@@ -0,0 +1,191 @@
+"""
+Multi-player comparison from one batched computation.
+
+Comparing several players' PRA against their lines used to take one full
+dashboard generate cycle per player. compare_players takes every player's
+cleaned log (fetch_player_logs fetches them concurrently through the
+SlateEvaluator's cache and worker pool), lays the game values out as one
+NaN-padded (players x games) matrix and computes the Mean, WMA, spread, hit
+probability and hit rate of every player in a single pass of array
+operations:
+
+    players, lines = zip(*parse_player_lines('Stephen Curry 38.5, LeBron James 40.5'))
+    logs = fetch_player_logs(evaluator, 'NBA', players, 'PRA')
+    rows = compare_players(logs, 'NBA', 'PRA', lines, players, method='WMA')
+"""
+
+import numpy as np
+
+try:
+    from ..core.player_logs import PLAYER_CLEANERS, resolve_position
+    from ..core.sports_config import get_combined_stat_components
+    from .batch_evaluator import DEFAULT_TIME_DURATION, get_recommendation
+    from .derived_values import sorted_games
+    from .monte_carlo import SIMULATION_ENGINES, batch_hit_probabilities
+    from .probability import normal_cdf
+except ImportError:
+    import os
+    import sys
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for subdir in ('scrapers', 'core', 'analyzers'):
+        path = os.path.join(src_dir, subdir)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    from player_logs import PLAYER_CLEANERS, resolve_position
+    from sports_config import get_combined_stat_components
+    from batch_evaluator import DEFAULT_TIME_DURATION, get_recommendation
+    from derived_values import sorted_games
+    from monte_carlo import SIMULATION_ENGINES, batch_hit_probabilities
+    from probability import normal_cdf
+
+# Players shown in one comparison grid
+MAX_COMPARISON_PLAYERS = 9
+
+
+def parse_player_lines(text, default_line=None):
+    """
+    [(player, line), ...] from 'Stephen Curry 38.5, LeBron James 40.5'; a
+    player given without a line gets default_line
+    """
+    entries = []
+    for item in text.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, last = item.rpartition(' ')
+        try:
+            player, line = name.strip(), float(last)
+        except ValueError:
+            player, line = item, default_line
+        if not player:
+            raise ValueError(f"Missing player name in '{item}'")
+        if line is None:
+            raise ValueError(f"No line for {player}")
+        entries.append((player, line))
+    if not entries:
+        raise ValueError("Enter at least one player to compare")
+    if len(entries) > MAX_COMPARISON_PLAYERS:
+        raise ValueError(f"Compare at most {MAX_COMPARISON_PLAYERS} players at a time")
+    return entries
+
+
+def fetch_player_logs(evaluator, sport, players, statistic=None, team='Any', time_duration=DEFAULT_TIME_DURATION,
+                      position=None):
+    """
+    Cleaned log of every player (None where it could not be fetched), fetched
+    concurrently on the evaluator's worker pool and served from its log cache.
+    NHL and MLB logs are cleaned for the position that records the statistic.
+    """
+    if sport not in PLAYER_CLEANERS:
+        raise ValueError(f"No player data pipeline for {sport}")
+    position = resolve_position(sport, position, statistic)
+    for player in players:
+        evaluator.window_planner.reserve(sport.lower(), player, time_duration)
+
+    def fetch(player):
+        try:
+            return evaluator.fetch_player_log(sport, player, team, time_duration, position)
+        except Exception:
+            return None
+
+    return list(evaluator.executor.map(fetch, players))
+
+
+def game_matrix(logs, sport, statistic):
+    """
+    (games, values, errors): every log's [(date, value, team, opponent), ...]
+    in date order, the values as a (players x games) matrix padded with NaN on
+    the right, and {row: error} for the logs without values
+    """
+    components = get_combined_stat_components(sport, statistic)
+    games, errors = [], {}
+    for row, log in enumerate(logs):
+        if not log or len(log) < 2:
+            errors[row] = "No data found for this player"
+            games.append([])
+            continue
+        try:
+            games.append(sorted_games(log, statistic, components))
+        except ValueError as e:
+            errors[row] = str(e)
+            games.append([])
+            continue
+        if not games[row]:
+            errors[row] = f"No valid {statistic} values found"
+
+    values = np.full((len(logs), max((len(g) for g in games), default=0)), np.nan)
+    for row, player_games in enumerate(games):
+        values[row, :len(player_games)] = [g[1] for g in player_games]
+    return games, values, errors
+
+
+def batch_projections(values, lines, method='Mean', engine='Normal'):
+    """
+    Projection and hit probability of every row of a NaN-padded values matrix
+    at once. The Mean and WMA match simple_mean and weighted_moving_average,
+    the normal hit probability matches normal_hit_probability, and the
+    simulation engines are priced with batch_hit_probabilities.
+    Returns {field: array over the rows}; rows without games are NaN.
+    """
+    lines = np.asarray(lines, dtype=float)
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=1)
+    filled = np.where(valid, values, 0.0)
+
+    # weighted_moving_average: the most recent game of n weighs n, the one before n - 0.5, ...
+    index = np.arange(values.shape[1])
+    weights = np.where(valid, np.maximum(counts[:, None] - 0.5 * (counts[:, None] - 1 - index), 0), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = filled.sum(axis=1) / counts
+        wmas = (weights * filled).sum(axis=1) / weights.sum(axis=1)
+        squares = np.where(valid, (values - means[:, None]) ** 2, 0.0).sum(axis=1)
+        std_devs = np.where(counts > 1, np.sqrt(squares / (counts - 1)), 0.0)
+        hit_rates = (valid & (filled >= lines[:, None])).sum(axis=1) / counts * 100
+        projections = wmas if method == 'WMA' else means
+
+        if engine in SIMULATION_ENGINES:
+            rows = np.flatnonzero(counts)
+            hit_probabilities = np.full(len(values), np.nan)
+            hit_probabilities[rows] = batch_hit_probabilities([values[row, :counts[row]] for row in rows],
+                                                              lines[rows], engine)
+        else:
+            # No spread: the outcome is deterministic, as in normal_hit_probability; the clip keeps erf finite
+            z = np.clip(np.nan_to_num((lines - projections) / std_devs), -40, 40)
+            hit_probabilities = np.where(std_devs > 0, 1 - normal_cdf(z), (projections > lines).astype(float))
+
+    empty = counts == 0
+    fields = {'games': counts, 'mean': means, 'wma': wmas, 'projection': projections, 'std_dev': std_devs,
+              'hit_probability': hit_probabilities * 100, 'hit_rate': hit_rates}
+    return {name: np.where(empty, np.nan, field) for name, field in fields.items()}
+
+
+def compare_players(logs, sport, statistic, lines, players=None, method='Mean', engine='Normal'):
+    """
+    One comparison row per log, in order: the player's games in date order
+    (dates, values, opponents), the batch projection fields rounded like the
+    batch evaluator's results, the recommendation and an error for players
+    without values.
+    """
+    games, values, errors = game_matrix(logs, sport, statistic)
+    batch = batch_projections(values, lines, method, engine)
+    players = players or [None] * len(logs)
+
+    rows = []
+    for row, (player, line) in enumerate(zip(players, lines)):
+        result = {'player': player, 'stat': statistic, 'line': float(line), 'error': errors.get(row)}
+        if result['error'] is None:
+            result.update({
+                'dates': [g[0] for g in games[row]],
+                'values': [g[1] for g in games[row]],
+                'opponents': [g[3] for g in games[row]],
+                'games': int(batch['games'][row]),
+                'mean': round(float(batch['mean'][row]), 2),
+                'wma': round(float(batch['wma'][row]), 2),
+                'projection': round(float(batch['projection'][row]), 2),
+                'std_dev': round(float(batch['std_dev'][row]), 2),
+                'hit_probability': round(float(batch['hit_probability'][row]), 1),
+                'hit_rate': round(float(batch['hit_rate'][row]), 1),
+            })
+            result['recommendation'] = get_recommendation(result['hit_probability'])
+        rows.append(result)
+    return rows
@@ -0,0 +1,37 @@
+import numpy as np
+
+
+def erf(z):
+    """Numerical approximation of the error function used by the dashboards"""
+    t = 1.0 / (1.0 + 0.5 * abs(z))
+    tau = t * np.exp(-z*z - 1.26551223 + 1.00002368*t + 0.37409196*t*t + 0.09678418*t*t*t - 0.18628806*t*t*t*t + 0.27886807*t*t*t*t*t - 1.13520398*t*t*t*t*t*t + 1.48851587*t*t*t*t*t*t*t - 0.82215223*t*t*t*t*t*t*t*t + 0.17087277*t*t*t*t*t*t*t*t*t)
+    return 1 - tau if z >= 0 else tau - 1
+
+
+def normal_hit_probability(values, projection, quantitative):
+    """
+    Probability that the next game goes over the projection, assuming the
+    game values are normally distributed around the quantitative value.
+    Returns (hit_probability, std_dev) with hit_probability in [0, 1].
+    """
+    data = np.asarray(values, dtype=float)
+    if len(data) < 2:
+        return (1.0 if quantitative > projection else 0.0), 0.0
+
+    std_dev = np.std(data, ddof=1)
+    if std_dev == 0:
+        # Every game had the same value, so the outcome is deterministic
+        return (1.0 if quantitative > projection else 0.0), 0.0
+
+    z = (projection - quantitative) / std_dev
+    cdf = 0.5 * (1 + erf(z / np.sqrt(2)))
+    return 1 - cdf, std_dev
+
+
+def normal_cdf(z):
+    """Vectorized standard normal CDF using the same erf approximation"""
+    z = np.asarray(z, dtype=float) / np.sqrt(2)
+    t = 1.0 / (1.0 + 0.5 * np.abs(z))
+    tau = t * np.exp(-z*z - 1.26551223 + 1.00002368*t + 0.37409196*t*t + 0.09678418*t*t*t - 0.18628806*t*t*t*t + 0.27886807*t*t*t*t*t - 1.13520398*t*t*t*t*t*t + 1.48851587*t*t*t*t*t*t*t - 0.82215223*t*t*t*t*t*t*t*t + 0.17087277*t*t*t*t*t*t*t*t*t)
+    erf_values = np.where(z >= 0, 1 - tau, tau - 1)
+    return 0.5 * (1 + erf_values)
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Refresh Scheduler
+=================
+
+Keeps team defense matrices and a watchlist of players' logs warm. Each
+refresh is a job on a five-field cron schedule ('*/10 * * * *'); every run
+is pushed back by a random jitter so several processes do not hit StatMuse
+at the same moment. A job's refresh returns whether upstream content
+changed: DefenseEngine.refresh and SlateEvaluator.refresh_player_log
+revalidate their pages and keep what they have when nothing changed, so an
+unchanged run costs conditional requests and no rebuild. status() exposes
+the last refresh time of every job.
+
+The dashboard runs a scheduler in-process; as a standalone daemon it writes
+into a season backfill store:
+
+Usage:
+    python src/analyzers/refresh_scheduler.py --store data/backfill --watchlist data/watchlist.txt
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+try:
+    from ..scrapers.request_budget import PREFETCH, request_priority
+    from ..scrapers.scrape_result import ScrapeResult
+    from ..scrapers.season_backfill import BackfillStore, SeasonBackfill
+    from ..core.sports_config import SPORTS_CONFIG
+    from .defense_engine import DefenseEngine
+except ImportError:
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for subdir in ('scrapers', 'core', 'analyzers'):
+        path = os.path.join(src_dir, subdir)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    from request_budget import PREFETCH, request_priority
+    from scrape_result import ScrapeResult
+    from season_backfill import BackfillStore, SeasonBackfill
+    from sports_config import SPORTS_CONFIG
+    from defense_engine import DefenseEngine
+
+DEFENSE_SCHEDULE = '*/10 * * * *'
+WATCHLIST_SCHEDULE = '*/15 * * * *'
+# Upper bound of the random delay added to every run, in seconds
+DEFAULT_JITTER = 60
+DEFAULT_WATCHLIST = os.path.join('data', 'watchlist.txt')
+# Back-off after a transient failure (timeout, connection error, 429, 5xx), doubling per consecutive failure
+BACKOFF_SECONDS = 60
+MAX_BACKOFF_SECONDS = 60 * 60
+
+# (low, high) of the minute, hour, day, month and weekday fields; weekday 0 and 7 are Sunday
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def parse_cron_field(field, low, high):
+    """Values of one cron field: '*', 'n', 'a-b', any of them with '/step', and comma-separated lists"""
+    values = set()
+    for part in field.split(','):
+        spec, slash, step = part.partition('/')
+        try:
+            step = int(step) if slash else 1
+            if spec == '*':
+                start, stop = low, high
+            elif '-' in spec:
+                start, stop = (int(value) for value in spec.split('-', 1))
+            else:
+                start = int(spec)
+                # 'n/step' runs from n to the end of the range
+                stop = high if slash else start
+        except ValueError:
+            raise ValueError(f"Invalid cron field '{field}'") from None
+        if step < 1 or start < low or stop > high or start > stop:
+            raise ValueError(f"Invalid cron field '{field}'")
+        values.update(range(start, stop + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """A five-field cron expression: minute hour day month weekday, in local time"""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' needs 5 fields")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            sorted(parse_cron_field(field, low, high)) for field, (low, high) in zip(fields, CRON_FIELDS))
+        self.weekdays = {day % 7 for day in weekdays}
+        # As in cron, a day matching either field runs when both the day and the weekday are restricted
+        self._either_day = fields[2] != '*' and fields[4] != '*'
+
+    def _day_matches(self, day):
+        in_month = day.day in self.days
+        in_week = (day.weekday() + 1) % 7 in self.weekdays
+        return in_month or in_week if self._either_day else in_month and in_week
+
+    def next_after(self, moment):
+        """The first scheduled minute strictly after a datetime"""
+        start = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        # Four years and a day reaches any date, including February 29
+        for _ in range(4 * 366 + 1):
+            if day.month in self.months and self._day_matches(day):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        candidate = day.replace(hour=hour, minute=minute)
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression '{self.expression}' never runs")
+
+    def __repr__(self):
+        return f"CronSchedule('{self.expression}')"
+
+
+class RefreshJob:
+    """A refresh callable on a schedule and the outcome of its runs"""
+
+    def __init__(self, name, schedule, refresh):
+        self.name = name
+        self.schedule = schedule
+        self.refresh = refresh
+        self.next_run = None
+        # Last run that succeeded, changed or not, and last run that found new content
+        self.last_refresh = None
+        self.last_changed = None
+        self.error = None
+        self.error_kind = None
+        self.runs = 0
+        self.unchanged = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+
+
+class RefreshScheduler:
+    """
+    Runs refresh jobs on cron schedules, in a background thread after
+    start() or one pass at a time with run_pending(). A job's refresh()
+    returns True when upstream content changed and False when it did not.
+    Exceptions are recorded as failures with their ScrapeResult error kind;
+    after a transient one (timeout, connection error, 429, 5xx) the job
+    backs off exponentially, or for as long as a 429 asked, before its next
+    scheduled run. clock returns epoch seconds.
+    """
+
+    def __init__(self, jitter=DEFAULT_JITTER, clock=time.time, rng=None, report=print):
+        self.jitter = jitter
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.report = report
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _next_run(self, job, now):
+        moment = job.schedule.next_after(datetime.fromtimestamp(now)).timestamp()
+        return moment + self.rng.uniform(0, self.jitter)
+
+    def add_job(self, name, schedule, refresh):
+        """Schedule refresh() under a cron expression or CronSchedule; returns the job"""
+        if not isinstance(schedule, CronSchedule):
+            schedule = CronSchedule(schedule)
+        job = RefreshJob(name, schedule, refresh)
+        job.next_run = self._next_run(job, self.clock())
+        with self._lock:
+            self._jobs[name] = job
+        self._wake.set()
+        return job
+
+    def remove_job(self, name):
+        with self._lock:
+            self._jobs.pop(name, None)
+
+    def run_job(self, name):
+        """Run a job now; returns True (changed), False (unchanged) or None (failed)"""
+        with self._lock:
+            job = self._jobs[name]
+        try:
+            # Scheduled refreshes yield to interactive lookups in the request budget
+            with request_priority(PREFETCH):
+                changed = bool(job.refresh())
+        except Exception as e:
+            failure = ScrapeResult.from_exception(e)
+            now = self.clock()
+            with self._lock:
+                job.failures += 1
+                job.consecutive_failures += 1
+                job.error = failure.error
+                job.error_kind = failure.error_kind
+                if failure.transient:
+                    backoff = failure.retry_after or BACKOFF_SECONDS * 2 ** (job.consecutive_failures - 1)
+                    backoff = min(backoff, MAX_BACKOFF_SECONDS) + self.rng.uniform(0, self.jitter)
+                    job.next_run = max(job.next_run, now + backoff)
+            self.report(f"Refresh of {name} failed ({failure.error_kind}): {failure.error}")
+            return None
+
+        now = self.clock()
+        with self._lock:
+            job.runs += 1
+            job.consecutive_failures = 0
+            job.error = None
+            job.error_kind = None
+            job.last_refresh = now
+            if changed:
+                job.last_changed = now
+            else:
+                job.unchanged += 1
+        return changed
+
+    def run_pending(self):
+        """Run every job that is due; returns the seconds until the next one, or None without jobs"""
+        now = self.clock()
+        with self._lock:
+            due = [job for job in self._jobs.values() if job.next_run <= now]
+            for job in due:
+                job.next_run = self._next_run(job, now)
+        for job in due:
+            self.run_job(job.name)
+
+        with self._lock:
+            upcoming = min((job.next_run for job in self._jobs.values()), default=None)
+        return None if upcoming is None else max(0.0, upcoming - self.clock())
+
+    def _loop(self):
+        while not self._stopped.is_set():
+            delay = self.run_pending()
+            # Sleep until the next job is due, a job is added or stop() is called
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def start(self):
+        """Run the jobs in a daemon thread; returns the thread"""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._loop, name='refresh-scheduler', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self, timeout=5):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def status(self):
+        """
+        {job: {'last_refresh', 'last_changed', 'next_run', 'runs', 'unchanged',
+        'failures', 'error', 'error_kind'}} with times in epoch seconds (None
+        before the first run)
+        """
+        with self._lock:
+            return {name: {'last_refresh': job.last_refresh, 'last_changed': job.last_changed,
+                           'next_run': job.next_run, 'runs': job.runs, 'unchanged': job.unchanged,
+                           'failures': job.failures, 'error': job.error, 'error_kind': job.error_kind}
+                    for name, job in self._jobs.items()}
+
+    def last_refresh(self):
+        """Time of the most recent successful run of any job, or None"""
+        times = [entry['last_refresh'] for entry in self.status().values() if entry['last_refresh'] is not None]
+        return max(times, default=None)
+
+
+def load_watchlist(path):
+    """
+    [(sport, player), ...] from a file of 'NBA, Stephen Curry' lines; blank
+    lines and lines starting with '#' are skipped
+    """
+    watchlist = []
+    with open(path, 'r', encoding='utf-8') as fh:
+        for number, line in enumerate(fh, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            sport, _, player = (part.strip() for part in line.partition(','))
+            if sport.upper() not in SPORTS_CONFIG or not player:
+                raise ValueError(f"{path}:{number}: expected 'SPORT, Player Name'")
+            watchlist.append((sport.upper(), player))
+    return watchlist
+
+
+def schedule_defense(scheduler, engine, sports, schedule=DEFENSE_SCHEDULE, store=None):
+    """
+    One job per sport revalidating its team defense matrix; a rebuilt matrix
+    is also written to a BackfillStore when one is given
+    """
+    for sport in sports:
+        def refresh(sport=sport):
+            changed = engine.refresh(sport)
+            if changed and store is not None:
+                store.save_team_defense(sport, engine.cached_matrix(sport))
+            return changed
+
+        scheduler.add_job(f'{sport} defense', schedule, refresh)
+
+
+def schedule_watchlist(scheduler, watchlist, refresh_player, schedule=WATCHLIST_SCHEDULE):
+    """
+    One job per watched player; refresh_player(sport, player) returns whether
+    the player's log changed, e.g. SlateEvaluator.refresh_player_log
+    """
+    for sport, player in watchlist:
+        scheduler.add_job(f'{sport} {player}', schedule, lambda sport=sport, player=player: refresh_player(sport, player))
+
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime('%H:%M:%S') if timestamp is not None else 'never'
+
+
+def write_status(scheduler, path):
+    """Write the scheduler status as JSON for other processes to read"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(scheduler.status(), fh, indent=1)
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep team defense matrices and watched players' logs fresh")
+    parser.add_argument('--store', default=os.path.join('data', 'backfill'), help="directory of the local store")
+    parser.add_argument('--watchlist', default=DEFAULT_WATCHLIST, help="file of 'SPORT, Player Name' lines")
+    parser.add_argument('--sports', nargs='+', type=str.upper, default=sorted(SPORTS_CONFIG),
+                        choices=sorted(SPORTS_CONFIG), help="sports whose team defense is refreshed")
+    parser.add_argument('--defense-schedule', default=DEFENSE_SCHEDULE, help=f"cron schedule (default: '{DEFENSE_SCHEDULE}')")
+    parser.add_argument('--watchlist-schedule', default=WATCHLIST_SCHEDULE,
+                        help=f"cron schedule (default: '{WATCHLIST_SCHEDULE}')")
+    parser.add_argument('--jitter', type=float, default=DEFAULT_JITTER, help="maximum random delay per run in seconds")
+    parser.add_argument('--once', action='store_true', help="run every job once and exit")
+    parser.add_argument('-v', '--verbose', action='store_true', help="show scraper output while fetching")
+    args = parser.parse_args(argv)
+
+    store = BackfillStore(args.store)
+    os.makedirs(args.store, exist_ok=True)
+    status_path = os.path.join(args.store, 'refresh_status.json')
+
+    def report(line):
+        print(line, file=sys.__stdout__, flush=True)
+
+    scheduler = RefreshScheduler(jitter=args.jitter, report=report)
+    schedule_defense(scheduler, DefenseEngine(), args.sports, args.defense_schedule, store)
+    watchlist = load_watchlist(args.watchlist) if os.path.exists(args.watchlist) else []
+    # Watched players are stored as full-season logs, rewritten only when they changed
+    backfills = {}
+
+    def refresh_player(sport, player):
+        if sport not in backfills:
+            backfills[sport] = SeasonBackfill(sport, store, report=report)
+        return backfills[sport].refresh_player(player)
+
+    schedule_watchlist(scheduler, watchlist, refresh_player, args.watchlist_schedule)
+    report(f"Refreshing {len(args.sports)} team defense matrices and {len(watchlist)} watched players")
+
+    def run():
+        if args.once:
+            for name in list(scheduler.status()):
+                changed = scheduler.run_job(name)
+                report(f"{name}: {'failed' if changed is None else 'updated' if changed else 'unchanged'}")
+            write_status(scheduler, status_path)
+            return
+        while True:
+            delay = scheduler.run_pending()
+            write_status(scheduler, status_path)
+            time.sleep(delay if delay is not None else 60)
+
+    try:
+        if args.verbose:
+            run()
+        else:
+            # The scrapers print debugging output for every page; keep the refresh lines readable
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                run()
+    except KeyboardInterrupt:
+        write_status(scheduler, status_path)
+    return scheduler.status()
+
+
+if __name__ == "__main__":
+    main()
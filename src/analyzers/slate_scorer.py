@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Multi-Process Slate Scorer
+==========================
+
+The batch evaluator fetches on threads, but the per-prop analysis
+(simple_mean / weighted_moving_average / normal hit probability) is pure
+Python and runs on one core under the GIL. SlateScorer fetches and cleans
+the logs the same way, then scores the props on a process pool:
+
+- every prop's game values and dates are packed into NaN-padded matrices
+  in multiprocessing.shared_memory blocks, together with the line and the
+  opponent factor, so workers attach to them by name instead of receiving
+  pickled nested lists
+- props are split into contiguous shards, and each worker writes its rows
+  straight into one shared (props x RESULT_FIELDS) result array
+
+The result array holds the projections, hit probabilities and defense
+adjustments of the whole slate; to_results turns it into the batch
+evaluator's ranked result dicts.
+
+Usage:
+    python src/analyzers/slate_scorer.py props.csv -o results.csv --workers 8
+"""
+
+import argparse
+import contextlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    from ..core.game_log import date_ordinal, format_ordinal
+    from ..core.player_logs import PLAYER_CLEANERS, resolve_position
+    from ..core.sports_config import get_combined_stat_components
+    from .batch_evaluator import (DEFAULT_TIME_DURATION, DEFENSE_SPORTS, SlateEvaluator, build_stat_table,
+                                  get_recommendation, load_props, print_results, write_results)
+    from .probability import normal_hit_probability
+    from .simplemean import simple_mean
+    from .WMA import weighted_moving_average
+except ImportError:
+    import sys
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for subdir in ('scrapers', 'core', 'analyzers'):
+        path = os.path.join(src_dir, subdir)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    from game_log import date_ordinal, format_ordinal
+    from player_logs import PLAYER_CLEANERS, resolve_position
+    from sports_config import get_combined_stat_components
+    from batch_evaluator import (DEFAULT_TIME_DURATION, DEFENSE_SPORTS, SlateEvaluator, build_stat_table,
+                                 get_recommendation, load_props, print_results, write_results)
+    from probability import normal_hit_probability
+    from simplemean import simple_mean
+    from WMA import weighted_moving_average
+
+# Columns of the shared result array
+RESULT_FIELDS = ('games', 'mean', 'wma', 'projection', 'std_dev', 'hit_probability', 'hit_rate',
+                 'opponent_factor', 'adjusted_projection')
+# Columns of the shared per-prop parameters
+PARAM_FIELDS = ('line', 'opponent_factor', 'use_wma')
+
+
+class SharedArray:
+    """A NumPy array in a shared memory block that other processes attach to by name"""
+
+    def __init__(self, block, shape, dtype, owner):
+        self.block = block
+        self.array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        self.owner = owner
+
+    @classmethod
+    def create(cls, shape, dtype=float, fill=None):
+        dtype = np.dtype(dtype)
+        block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+        shared = cls(block, shape, dtype, owner=True)
+        if fill is not None:
+            shared.array.fill(fill)
+        return shared
+
+    @classmethod
+    def attach(cls, spec):
+        name, shape, dtype = spec
+        # Workers are children of the creating process and share its resource tracker,
+        # so the block is unlinked once, by its owner
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype, owner=False)
+
+    @property
+    def spec(self):
+        """(name, shape, dtype) to attach from another process"""
+        return self.block.name, self.array.shape, self.array.dtype.str
+
+    def close(self):
+        self.array = None
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+
+
+def score_values(dates, values, line, factor=1.0, use_wma=True):
+    """
+    One prop's RESULT_FIELDS row from its game dates (ordinals) and values,
+    computed with the same functions as the dashboard and batch evaluator
+    """
+    if not len(values):
+        raise ValueError("No valid values found")
+    table = [['DATE', 'VALUE']] + [[format_ordinal(day), value] for day, value in zip(dates, values)]
+    mean = simple_mean(table, 'VALUE')
+    wma = weighted_moving_average(table, 'VALUE')
+    projection = wma if use_wma else mean
+    adjusted = projection * factor
+    hit_probability, std_dev = normal_hit_probability(values, line, adjusted)
+    hit_rate = np.count_nonzero(values >= line) / len(values) * 100
+    return (len(values), mean, wma, projection, std_dev, hit_probability * 100, hit_rate, factor, adjusted)
+
+
+def _score_rows(dates, values, params, results, start, stop):
+    """Score rows start..stop of the inputs into results; returns {row: error}"""
+    errors = {}
+    for row in range(start, stop):
+        present = ~np.isnan(values[row])
+        line, factor, use_wma = params[row]
+        try:
+            results[row] = score_values(dates[row][present], values[row][present], line, factor, bool(use_wma))
+        except Exception as e:
+            errors[row] = str(e)
+    return errors
+
+
+def _score_shard(specs, start, stop):
+    """Worker process: attach to the shared inputs and results and score one shard"""
+    shared = [SharedArray.attach(spec) for spec in specs]
+    try:
+        return _score_rows(*(s.array for s in shared), start, stop)
+    finally:
+        for s in shared:
+            s.close()
+
+
+class SlateScorer:
+    """
+    Scores a slate on a process pool (see the module docstring). Logs are
+    fetched and cleaned by a SlateEvaluator, which also supplies the team
+    allowed matrices when adjusting for the opponent.
+    """
+
+    def __init__(self, max_workers=None, method='WMA', adjust_for_opponent=False, evaluator=None,
+                 shards_per_worker=4):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.method = method
+        self.adjust_for_opponent = adjust_for_opponent
+        self.evaluator = evaluator or SlateEvaluator(max_workers=8, method=method)
+        self.shards_per_worker = shards_per_worker
+        self._pool = None
+
+    def close(self):
+        """Shut down the worker processes and the evaluator's fetch pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self.evaluator.close()
+
+    def fetch_logs(self, props):
+        """Cleaned log of every prop (None where it could not be fetched), on the evaluator's threads"""
+        for prop in props:
+            if prop['sport'] in PLAYER_CLEANERS:
+                self.evaluator.window_planner.reserve(prop['sport'].lower(), prop['player'],
+                                                      prop.get('time_duration', DEFAULT_TIME_DURATION))
+
+        def fetch(prop):
+            try:
+                position = resolve_position(prop['sport'], prop.get('position'), prop['stat'])
+                return self.evaluator.fetch_player_log(prop['sport'], prop['player'], prop.get('team', 'Any'),
+                                                       prop.get('time_duration', DEFAULT_TIME_DURATION), position)
+            except Exception:
+                return None
+
+        return list(self.evaluator.executor.map(fetch, props))
+
+    def opponent_factors(self, props, allowed=None):
+        """
+        Allowed-vs-league-average factor of every prop's opponent, 1 where unknown.
+        allowed: {sport: TeamAllowedMatrix}; built from the evaluator's rankings when not given
+        """
+        factors = np.ones(len(props))
+        by_sport = {}
+        for i, prop in enumerate(props):
+            if prop.get('opponent') and prop['sport'] in DEFENSE_SPORTS:
+                by_sport.setdefault(prop['sport'], []).append(i)
+
+        for sport, rows in by_sport.items():
+            if allowed is not None:
+                matrix = allowed.get(sport)
+            else:
+                stats = sorted({comp for i in rows for comp in get_combined_stat_components(sport, props[i]['stat'])})
+                matrix = self.evaluator.get_allowed_matrix(sport, stats)
+            if matrix is not None:
+                factors[rows] = matrix.adjustment_factors(sport, [props[i]['opponent'] for i in rows],
+                                                          [props[i]['stat'] for i in rows])
+        return factors
+
+    def pack(self, props, logs, factors):
+        """Shared (dates, values, params) arrays for the slate, plus {row: error} for props without values"""
+        series, errors = [], {}
+        for row, (prop, log) in enumerate(zip(props, logs)):
+            games = []
+            if not log or len(log) < 2:
+                errors[row] = "No data found for this player"
+            else:
+                try:
+                    table = build_stat_table(log, prop['sport'], prop['stat'])
+                    games = [(date_ordinal(day), value) for day, value in table[1:]]
+                except ValueError as e:
+                    errors[row] = str(e)
+            series.append(games)
+
+        length = max((len(games) for games in series), default=0)
+        dates = SharedArray.create((len(props), length), np.int32, fill=0)
+        values = SharedArray.create((len(props), length), float, fill=np.nan)
+        params = SharedArray.create((len(props), len(PARAM_FIELDS)), float)
+        for row, games in enumerate(series):
+            if games:
+                dates.array[row, :len(games)] = [day for day, value in games]
+                values.array[row, :len(games)] = [value for day, value in games]
+        params.array[:, 0] = [prop['line'] for prop in props]
+        params.array[:, 1] = factors
+        params.array[:, 2] = [(prop.get('method') or self.method) == 'WMA' for prop in props]
+        return (dates, values, params), errors
+
+    def _shards(self, count):
+        shards = max(1, min(count, self.max_workers * self.shards_per_worker))
+        bounds = np.linspace(0, count, shards + 1).astype(int)
+        return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+    def score(self, props, logs=None, allowed=None):
+        """
+        (results, errors): the (props x RESULT_FIELDS) array, NaN for failed
+        props, and {row: error}. logs: cleaned log per prop (fetched when not
+        given); allowed: {sport: TeamAllowedMatrix} for the opponent factors.
+        """
+        logs = logs if logs is not None else self.fetch_logs(props)
+        factors = self.opponent_factors(props, allowed) if self.adjust_for_opponent else np.ones(len(props))
+        inputs, errors = self.pack(props, logs, factors)
+        output = SharedArray.create((len(props), len(RESULT_FIELDS)), float, fill=np.nan)
+        specs = [shared.spec for shared in inputs] + [output.spec]
+        try:
+            shards = self._shards(len(props))
+            if self.max_workers == 1:
+                arrays = [shared.array for shared in inputs + (output,)]
+                shard_errors = [_score_rows(*arrays, start, stop) for start, stop in shards]
+            else:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                futures = [self._pool.submit(_score_shard, specs, start, stop) for start, stop in shards]
+                shard_errors = [future.result() for future in futures]
+            for shard in shard_errors:
+                for row, error in shard.items():
+                    errors.setdefault(row, error)
+            results = output.array.copy()
+        finally:
+            for shared in inputs + (output,):
+                shared.close()
+        results[list(errors)] = np.nan
+        return results, errors
+
+    def evaluate(self, props, logs=None, allowed=None):
+        """Score the slate and return the batch evaluator's ranked result dicts"""
+        results, errors = self.score(props, logs, allowed)
+        return to_results(props, results, errors)
+
+
+def to_results(props, results, errors):
+    """Ranked result dicts (RESULT_COLUMNS of the batch evaluator) from the shared result array"""
+    rows = []
+    for row, prop in enumerate(props):
+        result = {'sport': prop['sport'], 'player': prop['player'], 'stat': prop['stat'], 'line': prop['line'],
+                  'opponent': prop.get('opponent'), 'error': errors.get(row)}
+        if result['error'] is None:
+            fields = dict(zip(RESULT_FIELDS, results[row]))
+            result.update({field: round(float(value), 1 if field in ('hit_probability', 'hit_rate') else 2)
+                           for field, value in fields.items()})
+            result['games'] = int(fields['games'])
+            result['opponent_factor'] = round(float(fields['opponent_factor']), 3)
+            result['recommendation'] = get_recommendation(result['hit_probability'])
+        rows.append(result)
+
+    # Highest hit probability first, failed props last
+    rows.sort(key=lambda r: (r['error'] is not None, -(r.get('hit_probability') or 0)))
+    for i, result in enumerate(rows, 1):
+        result['rank'] = i
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a slate of player props on every CPU core")
+    parser.add_argument('props', help="CSV or JSON file with sport, player, stat, line and opponent columns")
+    parser.add_argument('-o', '--output', help="write the ranked results to this CSV or JSON file")
+    parser.add_argument('-m', '--method', choices=('Mean', 'WMA'), default='WMA',
+                        help="projection method (default: WMA)")
+    parser.add_argument('-a', '--adjust-opponent', action='store_true',
+                        help="scale projections by what the opponent allows relative to league average")
+    parser.add_argument('-w', '--workers', type=int, help="worker processes (default: one per CPU core)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="show scraper output while fetching")
+    args = parser.parse_args(argv)
+
+    props = load_props(args.props)
+    scorer = SlateScorer(max_workers=args.workers, method=args.method, adjust_for_opponent=args.adjust_opponent)
+    print(f"Scoring {len(props)} props on {scorer.max_workers} worker processes...")
+    try:
+        if args.verbose:
+            results = scorer.evaluate(props)
+        else:
+            # The scrapers print a lot of debugging output; keep the table readable
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                results = scorer.evaluate(props)
+    finally:
+        scorer.close()
+
+    print_results(results)
+    if args.output:
+        write_results(results, args.output)
+        print(f"\nResults written to {args.output}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+WMA Parameter Sweep
+===================
+
+weighted_moving_average uses linearly decreasing weights (step 0.5) over the
+last-N window the dashboard asked for. This tool scores alternatives so the
+defaults can be picked with evidence:
+
+- 'mean':        equal weights (simple_mean)
+- 'linear':      most recent of k games weighs k, then k - step, k - 2*step, ...
+- 'exponential': weight halves every `half_life` games back
+
+each over windows of 3-20 games. Every scheme predicts each game from the
+games before it; the error is measured on held-out games (the last
+`holdout` fraction of each player's season). Schemes are evaluated in
+parallel across CPU cores, every scheme vectorized over all players and
+dates, and the output is a ranked table per statistic.
+
+Usage:
+    python src/analyzers/wma_sweep.py NBA --store data/backfill --stats PTS REB AST --workers 8
+"""
+
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    from ..core.sports_config import SPORTS_CONFIG, get_player_position
+    from ..scrapers.season_backfill import BackfillStore
+    from .backtest import series_matrix
+    from .WMA import rolling_weighted_moving_average
+except ImportError:
+    import sys
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for subdir in ('scrapers', 'core', 'analyzers'):
+        path = os.path.join(src_dir, subdir)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    from sports_config import SPORTS_CONFIG, get_player_position
+    from season_backfill import BackfillStore
+    from backtest import series_matrix
+    from WMA import rolling_weighted_moving_average
+
+DEFAULT_WINDOWS = tuple(range(3, 21))
+DEFAULT_STEPS = (0.25, 0.5, 0.75, 1.0)
+DEFAULT_HALF_LIVES = (1, 2, 3, 5, 8)
+DEFAULT_HOLDOUT = 0.3
+
+# What weighted_moving_average does today on the default last-5 window
+CURRENT_DEFAULT = ('linear', 0.5, 5)
+
+
+def default_schemes(windows=DEFAULT_WINDOWS, steps=DEFAULT_STEPS, half_lives=DEFAULT_HALF_LIVES):
+    """Every (scheme, param, window) combination to evaluate"""
+    schemes = []
+    for window in windows:
+        schemes.append(('mean', None, window))
+        schemes.extend(('linear', step, window) for step in steps)
+        schemes.extend(('exponential', half_life, window) for half_life in half_lives)
+    return schemes
+
+
+def predict(values, scheme, param, window):
+    """Prediction of every game (rows x games) from the `window` games before it; NaN without history"""
+    rolling = rolling_weighted_moving_average(values, window, scheme, param)
+    predictions = np.full(values.shape, np.nan)
+    predictions[:, 1:] = rolling[:, :-1]
+    return predictions
+
+
+def holdout_mask(values, holdout=DEFAULT_HOLDOUT):
+    """The last `holdout` fraction of each row's games, never its first game"""
+    games = (~np.isnan(values)).sum(axis=1)
+    first = np.maximum(np.ceil(games * (1 - holdout)).astype(int), 1)
+    index = np.arange(values.shape[1])
+    return (index >= first[:, None]) & (index < games[:, None])
+
+
+# Matrices handed to each worker process once, instead of with every task
+_MATRICES = {}
+
+
+def _init_worker(matrices, holdout):
+    _MATRICES.clear()
+    _MATRICES.update({stat: (values, holdout_mask(values, holdout)) for stat, values in matrices.items()})
+
+
+def _evaluate(task):
+    stat, (scheme, param, window) = task
+    values, mask = _MATRICES[stat]
+    predictions = predict(values, scheme, param, window)
+    scored = mask & ~np.isnan(predictions)
+    errors = predictions[scored] - values[scored]
+    if not len(errors):
+        return stat, scheme, param, window, None, None, 0
+    return (stat, scheme, param, window, float(np.abs(errors).mean()), float(np.sqrt((errors ** 2).mean())),
+            int(len(errors)))
+
+
+def sweep(matrices, schemes=None, holdout=DEFAULT_HOLDOUT, max_workers=None):
+    """
+    Rank the schemes for every statistic by mean absolute error on held-out games.
+    matrices: {stat: games matrix (players x games, date order, NaN padded)}
+    Returns {stat: [{'rank', 'scheme', 'param', 'window', 'mae', 'rmse', 'games'}, ...]}
+    """
+    schemes = schemes or default_schemes()
+    tasks = [(stat, scheme) for stat in matrices for scheme in schemes]
+    if max_workers == 1:
+        _init_worker(matrices, holdout)
+        results = list(map(_evaluate, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(matrices, holdout)) as executor:
+            results = list(executor.map(_evaluate, tasks, chunksize=max(1, len(tasks) // (4 * (os.cpu_count() or 1)))))
+
+    ranked = {}
+    for stat in matrices:
+        rows = [r for r in results if r[0] == stat and r[4] is not None]
+        rows.sort(key=lambda r: (r[4], r[5]))
+        ranked[stat] = [{'rank': i, 'scheme': scheme, 'param': param, 'window': window,
+                         'mae': round(mae, 4), 'rmse': round(rmse, 4), 'games': games}
+                        for i, (_, scheme, param, window, mae, rmse, games) in enumerate(rows, 1)]
+    return ranked
+
+
+def describe(row):
+    if row['scheme'] == 'linear':
+        return f"linear step {row['param']:g}"
+    if row['scheme'] == 'exponential':
+        return f"exponential half-life {row['param']:g}"
+    return 'mean'
+
+
+def print_rankings(ranked, top=10):
+    for stat, rows in ranked.items():
+        print(f"\n{stat}: {len(rows)} schemes ranked by MAE on held-out games")
+        print(f"{'#':>4s}  {'SCHEME':26s} {'WINDOW':>6s} {'MAE':>8s} {'RMSE':>8s} {'GAMES':>7s}")
+        shown = rows[:top] + [r for r in rows[top:] if (r['scheme'], r['param'], r['window']) == CURRENT_DEFAULT]
+        for row in shown:
+            marker = ' *' if (row['scheme'], row['param'], row['window']) == CURRENT_DEFAULT else ''
+            print(f"{row['rank']:4d}  {describe(row):26s} {row['window']:6d} {row['mae']:8.3f} {row['rmse']:8.3f} "
+                  f"{row['games']:7d}{marker}")
+    print("\n* current weighted_moving_average default (linear step 0.5 over the last 5 games)")
+
+
+def write_rankings(ranked, path):
+    with open(path, 'w', encoding='utf-8', newline='') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(['stat', 'rank', 'scheme', 'param', 'window', 'mae', 'rmse', 'games'])
+        for stat, rows in ranked.items():
+            writer.writerows([stat, r['rank'], r['scheme'], r['param'], r['window'], r['mae'], r['rmse'], r['games']]
+                             for r in rows)
+
+
+def load_matrices(store, league, stats):
+    """
+    {stat: games matrix} for every player the backfill store holds for the
+    league at the stat's position (skaters for GOALS, goalies for SAVES)
+    """
+    completed = store.checkpoint(league)['completed']
+    logs = {(league, player): store.load_log(league, player) for player, entry in completed.items() if entry['rows']}
+    matrices = {}
+    for stat in stats:
+        position = get_player_position(league, stat)
+        keys = [(league, player, stat) for _, player in logs
+                if position is None or completed[player]['position'] == position]
+        if not keys:
+            print(f"Skipping {stat}: no stored {position} logs")
+            continue
+        try:
+            matrices[stat] = series_matrix(logs, keys)[1]
+        except ValueError as e:
+            print(f"Skipping {stat}: {e}")
+    return matrices
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank WMA weighting schemes and window sizes per statistic")
+    parser.add_argument('league', type=str.upper)
+    parser.add_argument('--store', default=os.path.join('data', 'backfill'),
+                        help="season backfill store holding the game logs")
+    parser.add_argument('--stats', nargs='+', help="statistics to sweep (default: the league's stats)")
+    parser.add_argument('--holdout', type=float, default=DEFAULT_HOLDOUT,
+                        help=f"fraction of each season scored (default: {DEFAULT_HOLDOUT})")
+    parser.add_argument('-w', '--workers', type=int, help="worker processes (default: one per CPU core)")
+    parser.add_argument('--top', type=int, default=10, help="schemes shown per statistic (default: 10)")
+    parser.add_argument('-o', '--output', help="write every ranked scheme to this CSV file")
+    args = parser.parse_args(argv)
+
+    stats = args.stats or SPORTS_CONFIG[args.league]['stats']
+    matrices = load_matrices(BackfillStore(args.store), args.league, stats)
+    schemes = default_schemes()
+    print(f"Sweeping {len(schemes)} schemes x {len(matrices)} stats on "
+          f"{args.workers or os.cpu_count()} worker processes...")
+
+    ranked = sweep(matrices, schemes, args.holdout, args.workers)
+    print_rankings(ranked, args.top)
+    if args.output:
+        write_rankings(ranked, args.output)
+        print(f"\nRankings written to {args.output}")
+    return ranked
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,19 @@
+try:
+    from .fantasy_scoring import SCORING_RULES, FantasyScoring
+except ImportError:
+    from fantasy_scoring import SCORING_RULES, FantasyScoring
+
+
 def clean_mlb_data(data, position):
-    # Print the header to debug the available columns
-    header = data[0]
+    return list(iter_clean_mlb_data(data, position))
+
+
+def iter_clean_mlb_data(rows, position):
+    """Row-by-row clean_mlb_data: yields the renamed header, then each cleaned row"""
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
 
     # Define columns to keep for hitters and pitchers
     hitter_columns = ['NAME', 'DATE', 'TM', 'OPP', 'SO', 'R', 'RBI', 'H', 'BB', 'SB', '2B', 'HR', 'TB', 'CS', '3B', 'HBP']
@@ -42,62 +55,36 @@ def clean_mlb_data(data, position):
     # Get indices of columns to keep based on mapped names
     indices_to_keep = {col: header.index(col) if col in header else None for col in columns_to_keep}
 
+    # Fantasy score (and pitching outs) from the compiled Default scoring rules, with the columns resolved once
+    if position == 'hitter':
+        scoring = FantasyScoring('MLB', {'HFS': SCORING_RULES['Default']['MLB']['hitter']}, header)
+    else:
+        scoring = FantasyScoring('MLB', {'PFS': SCORING_RULES['Default']['MLB']['pitcher'], 'OUTS': {'OUTS': 1}},
+                                 header)
+
     # Function to clean a row and add new columns
     def clean_row(row):
         cleaned_row = [row[indices_to_keep[col]] if indices_to_keep[col] is not None else 0 for col in columns_to_keep]
 
-        if position == 'hitter':
-            try:
-                # Extract values to calculate new columns
-                singles = int(row[header.index('H')]) - (int(row[header.index('2B')]) + int(row[header.index('HR')]))
-                doubles = int(row[header.index('2B')])
-                triples = int(row[header.index('3B')]) if '3B' in header else 0
-                home_runs = int(row[header.index('HR')])
-                runs = int(row[header.index('R')])
-                rbis = int(row[header.index('RBI')])
-                walks = int(row[header.index('BB')])
-                hbp = int(row[header.index('HBP')]) if 'HBP' in header else 0
-                stolen_bases = int(row[header.index('SB')])
-                caught_stealing = int(row[header.index('CS')]) if 'CS' in header else 0
-
-                # Calculate fantasy score
-                fantasy_score = (singles + 2*doubles + 3*triples + 4*home_runs + runs + rbis + walks + hbp + 2*stolen_bases - caught_stealing)
-                cleaned_row.append(fantasy_score)
-            except ValueError:
-                # Handle cases where conversion to int fails
-                return None
-
-        elif position == 'pitcher':
-            try:
-                # Extract values to calculate new columns
-                innings_pitched = float(row[header.index('IP')])
-                wins = 1 if row[header.index('DEC')] == 'W' else 0
-                saves = 1 if row[header.index('DEC')] == 'SV' else 0
-                earned_runs = int(row[header.index('ER')])
-
-                # Calculate fantasy score
-                fantasy_score = (wins*4 + saves*2 + int(innings_pitched) + (innings_pitched - int(innings_pitched))*3 - earned_runs)
-                pitching_outs = int(innings_pitched) * 3 + (innings_pitched - int(innings_pitched)) * 10
-
-                cleaned_row.append(fantasy_score)
-                cleaned_row.append(pitching_outs)
-            except ValueError:
-                # Handle cases where conversion to int fails
-                return None
+        try:
+            scores = scoring.score_row(row)
+        except ValueError:
+            # Handle cases where conversion to a number fails
+            return None
 
+        # Whole-number scores stay ints, as the cleaned columns always were
+        cleaned_row.extend(int(score) if score.is_integer() else score for score in scores)
         return cleaned_row
 
-    # Clean data, skipping the header row
-    cleaned_data = [clean_row(row) for row in data[1:] if row and 'Average' not in row]
-
-    # Remove any rows that failed to process
-    cleaned_data = [row for row in cleaned_data if row is not None]
-
     # Rename the headers
-    renamed_headers = [column_map.get(col, col) for col in columns_to_keep] + additional_columns
-    cleaned_data.insert(0, renamed_headers)
-
-    return cleaned_data
+    yield [column_map.get(col, col) for col in columns_to_keep] + additional_columns
+
+    # Clean the remaining rows as they arrive, skipping averages and rows that failed to process
+    for row in rows:
+        if row and 'Average' not in row:
+            cleaned_row = clean_row(row)
+            if cleaned_row is not None:
+                yield cleaned_row
 
 
 def get_mlb_hitter_statistics():
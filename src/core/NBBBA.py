@@ -1,9 +1,22 @@
 def clean_nba_data(data):
+    return list(iter_clean_nba_data(data))
+
+
+def iter_clean_nba_data(rows):
+    """
+    Streaming version of clean_nba_data: consumes the header and then the rows
+    from any iterable (e.g. stream_statmuse) and yields the cleaned header and
+    rows one at a time, so a long game log is never held in memory at once
+    """
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
+
     # Indices of columns to keep
     columns_to_keep = ['NAME', 'DATE', 'TM', 'OPP', 'MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'FGM', 'FGA', '3PM', '3PA', 'FTM', 'FTA', 'OREB', 'DREB', 'TOV', 'PF']
 
     # Get indices of columns to keep from header
-    header = data[0]
     indices_to_keep = [header.index(col) for col in columns_to_keep]
 
     # Function to clean a row and add new columns
@@ -33,17 +46,16 @@ def clean_nba_data(data):
 
         return cleaned_row
 
-    # Clean data, skipping the header row
-    cleaned_data = [clean_row(row) for row in data[1:] if row and 'Average' not in row]
-
-    # Remove any rows that failed to process
-    cleaned_data = [row for row in cleaned_data if row is not None]
-
     # Add new headers for the additional columns
     new_columns = ['PTS + REB', 'PTS + AST', 'PTS + REB + AST', 'BLK + STL', 'REB + AST']
-    cleaned_data.insert(0, [header[i] for i in indices_to_keep] + new_columns)
-
-    return cleaned_data
+    yield [header[i] for i in indices_to_keep] + new_columns
+
+    # Clean the remaining rows as they arrive, skipping averages and rows that failed to process
+    for row in rows:
+        if row and 'Average' not in row:
+            cleaned_row = clean_row(row)
+            if cleaned_row is not None:
+                yield cleaned_row
 
 def get_nba_statistics():
     return ['MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'FGM', 'FGA', '3PM', '3PA', 'FTM', 'FTA', 'OREB', 'DREB', 'TOV', 'PF', 'PTS + REB', 'PTS + AST', 'PTS + REB + AST', 'BLK + STL', 'REB + AST']
@@ -5,3 +5,7 @@ Core sport modules for data processing and analysis.
 from .NBBBA import clean_nba_data, get_nba_statistics
 from .nhl import *
 from .MLB import *
+from .sports_config import SPORTS_CONFIG, is_combined_statistic, get_combined_stat_components, get_player_position
+from .player_logs import PLAYER_CLEANERS, clean_player_log, iter_clean_player_log
+from .game_log import GameLog, GameRow
+from .fantasy_scoring import SCORING_RULES, FantasyScoring, compile_scoring, fantasy_scores
@@ -0,0 +1,213 @@
+"""
+Declarative fantasy scoring.
+
+Every site's scoring system is a table of points per statistic in
+SCORING_RULES, per sport and, for NHL and MLB, per position. A statistic is
+either a log column (found under its raw StatMuse name or its cleaned name)
+or a term derived from columns, such as singles, pitching outs parsed from
+innings pitched, or a double-double.
+
+FantasyScoring compiles any number of rule tables for one log header: the
+columns are resolved once and the tables are stacked into a terms x rules
+points matrix, so scoring a whole league season for several sites is one
+matrix product over the columns:
+
+    scoring = compile_scoring('MLB', 'pitcher', log.header)
+    scores = scoring.score_log(log)     # {site: score of every game}
+"""
+
+import numpy as np
+
+try:
+    from .game_log import GameLog
+    from .sports_config import SPORTS_CONFIG
+except ImportError:
+    from game_log import GameLog
+    from sports_config import SPORTS_CONFIG
+
+# Points per statistic: site -> sport -> rules, or position -> rules for sports with positions.
+# 'Default' is the Hitter and Pitcher Fantasy Score that clean_mlb_data adds to every log.
+SCORING_RULES = {
+    'Default': {
+        'MLB': {
+            'hitter': {'1B': 1, '2B': 2, '3B': 3, 'HR': 4, 'R': 1, 'RBI': 1, 'BB': 1, 'HBP': 1, 'SB': 2, 'CS': -1},
+            'pitcher': {'W': 4, 'SV': 2, 'INN': 1, 'ER': -1},
+        },
+    },
+    'PrizePicks': {
+        'NBA': {'PTS': 1, 'REB': 1.2, 'AST': 1.5, 'STL': 3, 'BLK': 3, 'TOV': -1},
+        'WNBA': {'PTS': 1, 'REB': 1.2, 'AST': 1.5, 'STL': 3, 'BLK': 3, 'TOV': -1},
+        'NHL': {
+            'player': {'G': 8, 'A': 5, 'S': 1.5, 'BKS': 1.5},
+            'goalie': {'SV': 0.6, 'GA': -1},
+        },
+        'MLB': {
+            'hitter': {'1B': 3, '2B': 5, '3B': 8, 'HR': 10, 'R': 2, 'RBI': 2, 'BB': 2, 'HBP': 2, 'SB': 5},
+            'pitcher': {'W': 6, 'QS': 4, 'ER': -3, 'SO': 3, 'OUTS': 1},
+        },
+    },
+    'DraftKings': {
+        'NBA': {'PTS': 1, '3PM': 0.5, 'REB': 1.25, 'AST': 1.5, 'STL': 2, 'BLK': 2, 'TOV': -0.5, 'DD': 1.5, 'TD': 3},
+        'NHL': {
+            'player': {'G': 8.5, 'A': 5, 'S': 1.5, 'BKS': 1.3},
+            'goalie': {'SV': 0.7, 'GA': -3.5},
+        },
+        'MLB': {
+            'hitter': {'1B': 3, '2B': 5, '3B': 8, 'HR': 10, 'R': 2, 'RBI': 2, 'BB': 2, 'HBP': 2, 'SB': 5},
+            'pitcher': {'INN': 2.25, 'SO': 2, 'W': 4, 'ER': -2, 'H': -0.6, 'BB': -0.6},
+        },
+    },
+}
+
+# Log columns an input statistic may be found under: raw StatMuse name first, then the cleaned names
+INPUT_COLUMNS = {
+    'NBA': {},
+    'NHL': {
+        'G': ('G', 'GOALS', 'Goals'), 'A': ('A', 'ASSISTS', 'Assists'), 'P': ('P', 'POINTS', 'Points'),
+        'S': ('S', 'SHOTS', 'Shots On Goal'), 'HIT': ('HIT', 'HITS', 'Hits'),
+        'BKS': ('BKS', 'BLOCKS', 'Blocked Shots'), 'SV': ('SV', 'SAVES', 'Saves'),
+    },
+    'MLB': {
+        'H': ('H', 'HA', 'Hits', 'Hits Allowed'), 'R': ('R', 'Runs'), 'RBI': ('RBI', 'RBIs'),
+        '2B': ('2B', 'Doubles'), '3B': ('3B', 'Triples'), 'HR': ('HR', 'Home Runs'),
+        'BB': ('BB', 'BBA', 'Walks', 'Walks Allowed'), 'SO': ('SO', 'K', 'Strikeouts'),
+        'HBP': ('HBP', 'Hit By Pitch'), 'SB': ('SB', 'Stolen Bases'), 'CS': ('CS', 'Caught Stealing'),
+        'ER': ('ER', 'Earned Runs Allowed'), 'IP': ('IP', 'Innings Pitched'), 'DEC': ('DEC', 'Decision'),
+    },
+}
+INPUT_COLUMNS['WNBA'] = INPUT_COLUMNS['NBA']
+
+# Inputs read as text rather than numbers
+TEXT_INPUTS = {'DEC'}
+
+
+def innings_to_outs(innings):
+    """Outs from innings pitched in baseball notation, where 6.1 is six innings and one out"""
+    innings = np.asarray(innings, dtype=float)
+    whole = np.floor(innings)
+    return whole * 3 + np.round((innings - whole) * 10)
+
+
+def _double_digits(*stats):
+    return sum((np.asarray(stat) >= 10).astype(int) for stat in stats)
+
+
+# Terms computed from input columns: term -> (inputs, function of the input arrays)
+DERIVED_TERMS = {
+    'NBA': {
+        'DD': (('PTS', 'REB', 'AST', 'STL', 'BLK'), lambda *stats: (_double_digits(*stats) >= 2).astype(float)),
+        'TD': (('PTS', 'REB', 'AST', 'STL', 'BLK'), lambda *stats: (_double_digits(*stats) >= 3).astype(float)),
+    },
+    'NHL': {},
+    'MLB': {
+        '1B': (('H', '2B', '3B', 'HR'), lambda hits, doubles, triples, home_runs: hits - doubles - triples - home_runs),
+        'OUTS': (('IP',), innings_to_outs),
+        'INN': (('IP',), lambda innings: innings_to_outs(innings) / 3),
+        'W': (('DEC',), lambda decision: (decision == 'W').astype(float)),
+        'SV': (('DEC',), lambda decision: (decision == 'SV').astype(float)),
+        'QS': (('IP', 'ER'), lambda innings, earned_runs: ((innings_to_outs(innings) >= 18) &
+                                                           (earned_runs <= 3)).astype(float)),
+    },
+}
+DERIVED_TERMS['WNBA'] = DERIVED_TERMS['NBA']
+
+
+def site_rules(site, sport, position=None):
+    """A site's {term: points} for a sport (and position), or None if the site does not score it"""
+    if site not in SCORING_RULES:
+        raise ValueError(f"No fantasy scoring rules for {site}")
+    rules = SCORING_RULES[site].get(sport)
+    if rules and SPORTS_CONFIG.get(sport, {}).get('positions'):
+        return rules.get(position)
+    return rules
+
+
+class FantasyScoring:
+    """
+    Rule tables compiled for one sport and log header.
+    rules: {name: {term: points}}; scores come back per name, in order.
+    """
+
+    def __init__(self, sport, rules, header):
+        if sport not in INPUT_COLUMNS:
+            raise ValueError(f"No fantasy scoring inputs for {sport}")
+        self.sport = sport
+        self.names = list(rules)
+        self.terms = list(dict.fromkeys(term for table in rules.values() for term in table))
+        self.points = np.array([[rules[name].get(term, 0.0) for name in self.names] for term in self.terms],
+                               dtype=float).reshape(len(self.terms), len(self.names))
+
+        # Each term as (inputs, function); a plain column is its own input
+        derived = DERIVED_TERMS[sport]
+        self._plan = [derived[term] if term in derived else ((term,), None) for term in self.terms]
+
+        # Header column of every input, resolved once; None when the log does not have it
+        header = list(header)
+        inputs = dict.fromkeys(name for names, _ in self._plan for name in names)
+        self.columns = {}
+        for name in inputs:
+            candidates = INPUT_COLUMNS[sport].get(name, (name,))
+            self.columns[name] = next((col for col in candidates if col in header), None)
+        self._indices = {name: header.index(col) for name, col in self.columns.items() if col is not None}
+
+    def evaluate(self, inputs, games):
+        """(games x rules) scores from {input: array over the games}"""
+        matrix = np.empty((games, len(self.terms)))
+        for t, (names, function) in enumerate(self._plan):
+            arrays = [inputs[name] for name in names]
+            matrix[:, t] = arrays[0] if function is None else function(*arrays)
+        return matrix @ self.points
+
+    def _missing(self, name, games):
+        return np.full(games, '', dtype=object) if name in TEXT_INPUTS else np.zeros(games)
+
+    def score_log(self, log):
+        """{name: score of every game} for a GameLog or [header, row, ...] log, blanks counting as 0"""
+        if not isinstance(log, GameLog):
+            log = GameLog.from_rows(log)
+        games = log.games
+        inputs = {}
+        for name, col in self.columns.items():
+            if col is None:
+                inputs[name] = self._missing(name, games)
+            elif name in TEXT_INPUTS:
+                try:
+                    inputs[name] = np.array(log.text(col), dtype=object)
+                except ValueError:
+                    # A column of nothing but blanks is stored as numbers
+                    inputs[name] = self._missing(name, games)
+            else:
+                inputs[name] = np.nan_to_num(log.values(col))
+        scores = self.evaluate(inputs, games)
+        return {name: scores[:, i] for i, name in enumerate(self.names)}
+
+    def score_row(self, row):
+        """Scores of one raw row of the compiled header; raises ValueError for a non-numeric input"""
+        inputs = {}
+        for name in self.columns:
+            if name not in self._indices:
+                inputs[name] = self._missing(name, 1)
+            elif name in TEXT_INPUTS:
+                inputs[name] = np.array([row[self._indices[name]]], dtype=object)
+            else:
+                inputs[name] = np.array([float(row[self._indices[name]])])
+        return [float(score) for score in self.evaluate(inputs, 1)[0]]
+
+
+def compile_scoring(sport, position=None, header=(), sites=None):
+    """FantasyScoring for every site (or the given sites) with rules for the sport and position"""
+    rules = {}
+    for site in sites or SCORING_RULES:
+        table = site_rules(site, sport, position)
+        if table:
+            rules[site] = table
+    if not rules:
+        raise ValueError(f"No fantasy scoring rules for {sport} {position or ''}".rstrip())
+    return FantasyScoring(sport, rules, header)
+
+
+def fantasy_scores(log, sport, position=None, sites=None):
+    """{site: fantasy score of every game} for a whole log, e.g. BackfillStore.load_league()"""
+    if not isinstance(log, GameLog):
+        log = GameLog.from_rows(log)
+    return compile_scoring(sport, position, log.header, sites).score_log(log)
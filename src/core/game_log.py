@@ -0,0 +1,257 @@
+"""
+Compact, column-oriented game logs.
+
+A cleaned game log is a [header, row, row, ...] list in which every field is
+a boxed Python string or int, which is costly when whole-league seasons are
+held in memory for screening. GameLog keeps one typed NumPy array per
+column instead:
+
+- numeric columns are the smallest integer dtype that fits, or float64
+- DATE is an int32 array of date ordinals
+- text columns (NAME, TM, OPP, ...) are codes into one interned string table
+  shared by every log, so a team code is stored once per process
+
+GameLog still behaves like the [header, row, ...] list the cleaners return:
+index 0 is the header and every other index is a GameRow view, so existing
+code such as build_stat_table reads it unchanged.
+"""
+
+import threading
+from datetime import date, datetime
+
+import numpy as np
+
+DATE_FORMAT = '%m/%d/%Y'
+
+# Interned strings shared by every GameLog: code -> string and string -> code
+_STRINGS = []
+_CODES = {}
+_intern_lock = threading.Lock()
+
+
+def intern_code(value):
+    """Code of a string in the shared intern table, adding it if it is new"""
+    value = '' if value is None else str(value)
+    code = _CODES.get(value)
+    if code is None:
+        with _intern_lock:
+            code = _CODES.get(value)
+            if code is None:
+                code = len(_STRINGS)
+                _STRINGS.append(value)
+                _CODES[value] = code
+    return code
+
+
+def date_ordinal(value):
+    """Proleptic ordinal of a 'M/D/YYYY' date, or 0 when it cannot be parsed"""
+    try:
+        return datetime.strptime(str(value), DATE_FORMAT).toordinal()
+    except ValueError:
+        return 0
+
+
+def format_ordinal(ordinal):
+    if not ordinal:
+        return ''
+    day = date.fromordinal(int(ordinal))
+    return f'{day.month}/{day.day}/{day.year}'
+
+
+def _integer_dtype(low, high):
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+
+def _numeric(values):
+    """Parsed floats for a column (blanks are NaN), or None if any value is not a number"""
+    parsed = np.empty(len(values), dtype=float)
+    for i, value in enumerate(values):
+        if value is None or value == '':
+            parsed[i] = np.nan
+            continue
+        try:
+            parsed[i] = float(str(value).replace(',', ''))
+        except ValueError:
+            return None
+    return parsed
+
+
+def _encode_column(name, values):
+    """(kind, array) for one column's values"""
+    if name == 'DATE':
+        return 'date', np.array([date_ordinal(value) for value in values], dtype=np.int32)
+
+    parsed = _numeric(values)
+    if parsed is None:
+        codes = [intern_code(value) for value in values]
+        return 'text', np.array(codes, dtype=np.min_scalar_type(max(codes, default=0)))
+
+    finite = np.isfinite(parsed)
+    if finite.all() and np.array_equal(parsed, np.round(parsed)):
+        low, high = (parsed.min(), parsed.max()) if len(parsed) else (0, 0)
+        return 'int', parsed.astype(_integer_dtype(low, high))
+    return 'float', parsed
+
+
+class GameRow:
+    """Read-only view of one game in a GameLog, indexed by column position or name"""
+
+    __slots__ = ('_log', '_row')
+
+    def __init__(self, log, row):
+        self._log = log
+        self._row = row
+
+    def __len__(self):
+        return len(self._log.header)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[col] for col in range(len(self._log.header))[key]]
+        if isinstance(key, str):
+            key = self._log.column_index(key)
+        elif key < 0:
+            key += len(self._log.header)
+        return self._log._value(key, self._row)
+
+    def __iter__(self):
+        return (self[col] for col in range(len(self._log.header)))
+
+    def __contains__(self, value):
+        return any(field == value for field in self)
+
+    def __eq__(self, other):
+        if isinstance(other, (GameRow, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def to_list(self):
+        return list(self)
+
+    def __repr__(self):
+        return f'GameRow({self.to_list()!r})'
+
+
+class GameLog:
+    """Typed column arrays for a cleaned game log; see the module docstring"""
+
+    __slots__ = ('header', '_kinds', '_columns', '_index', '_games')
+
+    def __init__(self, header, kinds, columns):
+        self.header = list(header)
+        self._kinds = list(kinds)
+        self._columns = list(columns)
+        # The first column with a name wins, as with header.index()
+        self._index = {}
+        for col, name in enumerate(self.header):
+            self._index.setdefault(name, col)
+        self._games = len(self._columns[0]) if self._columns else 0
+
+    @classmethod
+    def from_rows(cls, data):
+        """Build from a [header, row, ...] game log as returned by the cleaners"""
+        if not data:
+            return cls([], [], [])
+        header, rows = list(data[0]), data[1:]
+        kinds, columns = [], []
+        for col, name in enumerate(header):
+            kind, column = _encode_column(name, [row[col] if col < len(row) else '' for row in rows])
+            kinds.append(kind)
+            columns.append(column)
+        return cls(header, kinds, columns)
+
+    @classmethod
+    def concat(cls, logs):
+        """One GameLog holding the games of several logs with the same header"""
+        logs = [log for log in logs if log.games]
+        if not logs:
+            return cls([], [], [])
+        header = logs[0].header
+        if any(log.header != header for log in logs):
+            raise ValueError("Cannot concatenate game logs with different headers")
+
+        kinds, columns = [], []
+        for col in range(len(header)):
+            col_kinds = {log._kinds[col] for log in logs}
+            if len(col_kinds) == 1:
+                kind = col_kinds.pop()
+                column = np.concatenate([log._columns[col] for log in logs])
+            else:
+                # A column that is numeric in one log and text in another is re-encoded from its values
+                kind, column = _encode_column(header[col], [log._value(col, row) for log in logs
+                                                            for row in range(log.games)])
+            kinds.append(kind)
+            columns.append(column)
+        return cls(header, kinds, columns)
+
+    @property
+    def games(self):
+        return self._games
+
+    @property
+    def nbytes(self):
+        """Bytes held by the column arrays"""
+        return sum(column.nbytes for column in self._columns)
+
+    def column_index(self, name):
+        try:
+            return self._index[name]
+        except KeyError:
+            raise ValueError(f"{name} is not in the game log header")
+
+    def values(self, name):
+        """A numeric column as float64 (NaN for blanks)"""
+        col = self.column_index(name)
+        if self._kinds[col] not in ('int', 'float'):
+            raise ValueError(f"{name} is not a numeric column")
+        return self._columns[col].astype(float)
+
+    def ordinals(self):
+        """Date ordinals of every game (0 where the date could not be parsed)"""
+        return self._columns[self.column_index('DATE')]
+
+    def text(self, name):
+        """A text column decoded to strings"""
+        col = self.column_index(name)
+        if self._kinds[col] != 'text':
+            raise ValueError(f"{name} is not a text column")
+        return [_STRINGS[code] for code in self._columns[col]]
+
+    def _value(self, col, row):
+        kind, value = self._kinds[col], self._columns[col][row]
+        if kind == 'int':
+            return int(value)
+        if kind == 'float':
+            return '' if np.isnan(value) else float(value)
+        if kind == 'date':
+            return format_ordinal(value)
+        return _STRINGS[value]
+
+    def to_rows(self):
+        """The [header, row, ...] list form"""
+        return [list(self.header)] + [GameRow(self, row).to_list() for row in range(self._games)]
+
+    # Sequence protocol of the [header, row, ...] list
+    def __len__(self):
+        return self._games + 1 if self.header else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if index == 0 and self.header:
+            return self.header
+        if not 0 < index < len(self):
+            raise IndexError('game log index out of range')
+        return GameRow(self, index - 1)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __repr__(self):
+        return f'GameLog({self._games} games, {len(self.header)} columns, {self.nbytes} bytes)'
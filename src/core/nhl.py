@@ -1,6 +1,13 @@
 def clean_nhl_data(data, position):
-    # Print the header to debug the available columns
-    header = data[0]
+    return list(iter_clean_nhl_data(data, position))
+
+
+def iter_clean_nhl_data(rows, position):
+    """Row-by-row clean_nhl_data: yields the renamed header, then each cleaned row"""
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
 
     # Define columns to keep for players and goalies
     player_columns = ['NAME', 'DATE', 'TM', 'OPP', 'G', 'A', 'P', 'S', 'TOI', 'FOW', 'HIT', 'BKS']
@@ -53,17 +60,15 @@ def clean_nhl_data(data, position):
 
         return cleaned_row
 
-    # Clean data, skipping the header row
-    cleaned_data = [clean_row(row) for row in data[1:] if row and 'Average' not in row]
-
-    # Remove any rows that failed to process
-    cleaned_data = [row for row in cleaned_data if row is not None]
-
     # Rename the headers
-    renamed_headers = [column_map.get(col, col) for col in columns_to_keep] + additional_columns
-    cleaned_data.insert(0, renamed_headers)
+    yield [column_map.get(col, col) for col in columns_to_keep] + additional_columns
 
-    return cleaned_data
+    # Clean the remaining rows as they arrive, skipping averages and rows that failed to process
+    for row in rows:
+        if row and 'Average' not in row:
+            cleaned_row = clean_row(row)
+            if cleaned_row is not None:
+                yield cleaned_row
 
 
 def get_nhl_player_statistics():
@@ -0,0 +1,76 @@
+"""
+Sport-aware cleaning of StatMuse player game logs.
+
+NBA and WNBA logs go through the NBA cleaner. NHL and MLB logs are cleaned
+per position (player/goalie, hitter/pitcher) and their columns are renamed
+to the statistic names in SPORTS_CONFIG, so the dashboard and the batch
+evaluator read every sport's log the same way.
+"""
+
+try:
+    from .NBBBA import iter_clean_nba_data
+    from .nhl import iter_clean_nhl_data
+    from .MLB import iter_clean_mlb_data
+    from .sports_config import SPORTS_CONFIG, get_player_position
+except ImportError:
+    from NBBBA import iter_clean_nba_data
+    from nhl import iter_clean_nhl_data
+    from MLB import iter_clean_mlb_data
+    from sports_config import SPORTS_CONFIG, get_player_position
+
+# Row-by-row cleaner for each sport's player game logs: cleaner(rows, position)
+PLAYER_CLEANERS = {
+    'NBA': lambda rows, position: iter_clean_nba_data(rows),
+    'WNBA': lambda rows, position: iter_clean_nba_data(rows),
+    'NHL': iter_clean_nhl_data,
+    'MLB': iter_clean_mlb_data,
+}
+
+
+def resolve_position(sport, position=None, statistic=None):
+    """The position to clean a log for, from the argument or the statistic; None if the sport has none"""
+    positions = SPORTS_CONFIG.get(sport, {}).get('positions')
+    if not positions:
+        return None
+    if position is None:
+        return get_player_position(sport, statistic)
+    position = position.strip().lower()
+    if position not in positions:
+        raise ValueError(f"Unknown {sport} position '{position}' (expected {', '.join(positions)})")
+    return position
+
+
+# Raw log columns only found in one position's log: (position, column it needs, column it never has)
+POSITION_MARKERS = {
+    'NHL': ('goalie', 'SV', 'G'),
+    'MLB': ('pitcher', 'IP', 'AB'),
+}
+
+
+def detect_position(sport, header):
+    """Position a raw StatMuse log belongs to, from its header; None if the sport has no positions"""
+    if sport not in POSITION_MARKERS:
+        return resolve_position(sport)
+    position, has, lacks = POSITION_MARKERS[sport]
+    if has in header and lacks not in header:
+        return position
+    return resolve_position(sport)
+
+
+def iter_clean_player_log(sport, rows, position=None):
+    """Cleaned header (with statistic names) and then each cleaned game, one at a time"""
+    if sport not in PLAYER_CLEANERS:
+        raise ValueError(f"No player data pipeline for {sport}")
+    position = resolve_position(sport, position)
+    columns = SPORTS_CONFIG[sport].get('positions', {}).get(position, {}).get('columns', {})
+
+    cleaned = PLAYER_CLEANERS[sport](rows, position)
+    header = next(cleaned, None)
+    if header is None:
+        return
+    yield [columns.get(col, col) for col in header]
+    yield from cleaned
+
+
+def clean_player_log(sport, data, position=None):
+    return list(iter_clean_player_log(sport, data, position))
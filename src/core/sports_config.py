@@ -0,0 +1,176 @@
+"""
+Sport-specific configuration shared by the dashboard and the headless tools.
+"""
+
+SPORTS_CONFIG = {
+    'NBA': {
+        'stats': ['PTS', 'REB', 'AST', 'STL', 'BLK', '3PM', 'FTM', 'TOV', 'PRA', 'PR', 'PA', 'RA'],
+        'combined_stats': {
+            'PRA': ['PTS', 'REB', 'AST'],
+            'PR': ['PTS', 'REB'],
+            'PA': ['PTS', 'AST'],
+            'RA': ['REB', 'AST']
+        },
+        'url_template': 'https://www.statmuse.com/nba/ask/nba-teams-that-give-up-the-most-{}-per-game-this-season',
+        'stat_mapping': {
+            'PTS': 'points', 'REB': 'rebounds', 'AST': 'assists', 'STL': 'steals',
+            'BLK': 'blocks', '3PM': '3-pointers', 'FTM': 'free-throws', 'TOV': 'turnovers'
+        }
+    },
+    'NFL': {
+        'stats': ['PASS_YDS', 'RUSH_YDS', 'REC_YDS', 'TD', 'INT', 'SACK', 'FUM', 'PRA', 'PR', 'PA'],
+        'combined_stats': {
+            'PRA': ['PASS_YDS', 'RUSH_YDS', 'REC_YDS'],
+            'PR': ['PASS_YDS', 'RUSH_YDS'],
+            'PA': ['PASS_YDS', 'REC_YDS']
+        },
+        'url_template': 'https://www.statmuse.com/nfl/ask/nfl-teams-that-give-up-the-most-{}-per-game-this-season',
+        'stat_mapping': {
+            'PASS_YDS': 'passing-yards', 'RUSH_YDS': 'rushing-yards', 'REC_YDS': 'receiving-yards',
+            'TD': 'touchdowns', 'INT': 'interceptions', 'SACK': 'sacks', 'FUM': 'fumbles'
+        },
+        'team_abbrevs': {
+            'ARI': 'Cardinals', 'ATL': 'Falcons', 'BAL': 'Ravens', 'BUF': 'Bills', 'CAR': 'Panthers',
+            'CHI': 'Bears', 'CIN': 'Bengals', 'CLE': 'Browns', 'DAL': 'Cowboys', 'DEN': 'Broncos',
+            'DET': 'Lions', 'GB': 'Packers', 'HOU': 'Texans', 'IND': 'Colts', 'JAX': 'Jaguars',
+            'KC': 'Chiefs', 'LV': 'Raiders', 'LAC': 'Chargers', 'LAR': 'Rams', 'MIA': 'Dolphins',
+            'MIN': 'Vikings', 'NE': 'Patriots', 'NO': 'Saints', 'NYG': 'Giants', 'NYJ': 'Jets',
+            'PHI': 'Eagles', 'PIT': 'Steelers', 'SF': '49ers', 'SEA': 'Seahawks', 'TB': 'Buccaneers',
+            'TEN': 'Titans', 'WAS': 'Commanders'
+        }
+    },
+    'NHL': {
+        'stats': ['GOALS', 'ASSISTS', 'POINTS', 'PIM', 'SHOTS', 'HITS', 'BLOCKS', 'SAVES', 'PRA', 'PA'],
+        'combined_stats': {
+            'PRA': ['GOALS', 'ASSISTS', 'POINTS'],
+            'PA': ['GOALS', 'ASSISTS']
+        },
+        'url_template': 'https://www.statmuse.com/nhl/ask/nhl-teams-that-give-up-the-most-{}-per-game-this-season',
+        'stat_mapping': {
+            'GOALS': 'goals', 'ASSISTS': 'assists', 'POINTS': 'points', 'PIM': 'penalty-minutes',
+            'SHOTS': 'shots', 'HITS': 'hits', 'BLOCKS': 'blocks'
+        },
+        'team_abbrevs': {
+            'ANA': 'Ducks', 'BOS': 'Bruins', 'BUF': 'Sabres', 'CGY': 'Flames', 'CAR': 'Hurricanes',
+            'CHI': 'Blackhawks', 'COL': 'Avalanche', 'CBJ': 'Blue Jackets', 'DAL': 'Stars', 'DET': 'Red Wings',
+            'EDM': 'Oilers', 'FLA': 'Panthers', 'LA': 'Kings', 'LAK': 'Kings', 'MIN': 'Wild',
+            'MTL': 'Canadiens', 'NSH': 'Predators', 'NJ': 'Devils', 'NJD': 'Devils', 'NYI': 'Islanders',
+            'NYR': 'Rangers', 'OTT': 'Senators', 'PHI': 'Flyers', 'PIT': 'Penguins', 'SJ': 'Sharks',
+            'SJS': 'Sharks', 'SEA': 'Kraken', 'STL': 'Blues', 'TB': 'Lightning', 'TBL': 'Lightning',
+            'TOR': 'Maple Leafs', 'UTA': 'Utah', 'VAN': 'Canucks', 'VGK': 'Golden Knights', 'WSH': 'Capitals',
+            'WPG': 'Jets'
+        },
+        # Cleaned game log columns (clean_nhl_data) -> statistic names, per position
+        'positions': {
+            'player': {
+                'stats': ['GOALS', 'ASSISTS', 'POINTS', 'SHOTS', 'HITS', 'BLOCKS', 'PRA', 'PA'],
+                'columns': {
+                    'Goals': 'GOALS', 'Assists': 'ASSISTS', 'Points': 'POINTS', 'Shots On Goal': 'SHOTS',
+                    'Hits': 'HITS', 'Blocked Shots': 'BLOCKS'
+                }
+            },
+            'goalie': {
+                'stats': ['SAVES'],
+                'columns': {'Saves': 'SAVES'}
+            }
+        }
+    },
+    'WNBA': {
+        'stats': ['PTS', 'REB', 'AST', 'STL', 'BLK', '3PM', 'FTM', 'TOV', 'PRA', 'PR', 'PA', 'RA'],
+        'combined_stats': {
+            'PRA': ['PTS', 'REB', 'AST'],
+            'PR': ['PTS', 'REB'],
+            'PA': ['PTS', 'AST'],
+            'RA': ['REB', 'AST']
+        },
+        'url_template': 'https://www.statmuse.com/wnba/ask/wnba-teams-that-give-up-the-most-{}-per-game-this-season',
+        'stat_mapping': {
+            'PTS': 'points', 'REB': 'rebounds', 'AST': 'assists', 'STL': 'steals',
+            'BLK': 'blocks', '3PM': '3-pointers', 'FTM': 'free-throws', 'TOV': 'turnovers'
+        },
+        'team_abbrevs': {
+            'ATL': 'Dream', 'CHI': 'Sky', 'CON': 'Sun', 'DAL': 'Wings', 'GS': 'Valkyries', 'GSV': 'Valkyries',
+            'IND': 'Fever', 'LV': 'Aces', 'LVA': 'Aces', 'LA': 'Sparks', 'LAS': 'Sparks', 'MIN': 'Lynx',
+            'NY': 'Liberty', 'NYL': 'Liberty', 'PHX': 'Mercury', 'SEA': 'Storm', 'WAS': 'Mystics'
+        }
+    },
+    'MLB': {
+        'stats': ['H', 'R', 'RBI', 'HR', 'TB', 'SB', 'BB', 'SO', 'HFS', 'H+R+RBI', 'K', 'ER', 'HA', 'BBA', 'OUTS', 'PFS'],
+        'combined_stats': {
+            'H+R+RBI': ['H', 'R', 'RBI']
+        },
+        'url_template': 'https://www.statmuse.com/mlb/ask/mlb-teams-that-give-up-the-most-{}-per-game-this-season',
+        'stat_mapping': {
+            'H': 'hits', 'R': 'runs', 'HR': 'home-runs', 'BB': 'walks', 'SO': 'strikeouts'
+        },
+        'team_abbrevs': {
+            'ARI': 'Diamondbacks', 'ATL': 'Braves', 'BAL': 'Orioles', 'BOS': 'Red Sox', 'CHC': 'Cubs',
+            'CWS': 'White Sox', 'CIN': 'Reds', 'CLE': 'Guardians', 'COL': 'Rockies', 'DET': 'Tigers',
+            'HOU': 'Astros', 'KC': 'Royals', 'LAA': 'Angels', 'LAD': 'Dodgers', 'MIA': 'Marlins',
+            'MIL': 'Brewers', 'MIN': 'Twins', 'NYM': 'Mets', 'NYY': 'Yankees', 'OAK': 'Athletics',
+            'ATH': 'Athletics', 'PHI': 'Phillies', 'PIT': 'Pirates', 'SD': 'Padres', 'SF': 'Giants',
+            'SEA': 'Mariners', 'STL': 'Cardinals', 'TB': 'Rays', 'TEX': 'Rangers', 'TOR': 'Blue Jays',
+            'WSH': 'Nationals'
+        },
+        # Cleaned game log columns (clean_mlb_data) -> statistic names, per position.
+        # clean_mlb_data labels a hitter's H and BB columns 'Hits Allowed' and 'Walks Allowed'.
+        'positions': {
+            'hitter': {
+                'stats': ['H', 'R', 'RBI', 'HR', 'TB', 'SB', 'BB', 'SO', 'HFS', 'H+R+RBI'],
+                'columns': {
+                    'Hits Allowed': 'H', 'Runs': 'R', 'RBIs': 'RBI', 'Home Runs': 'HR', 'Total Bases': 'TB',
+                    'Stolen Bases': 'SB', 'Walks Allowed': 'BB', 'Strikeouts': 'SO', 'Doubles': '2B',
+                    'Triples': '3B', 'Hitter Fantasy Score': 'HFS'
+                }
+            },
+            'pitcher': {
+                'stats': ['K', 'ER', 'HA', 'BBA', 'OUTS', 'PFS'],
+                'columns': {
+                    'Strikeouts': 'K', 'Earned Runs Allowed': 'ER', 'Hits Allowed': 'HA', 'Walks Allowed': 'BBA',
+                    'Innings Pitched': 'IP', 'Pitching Outs': 'OUTS', 'Pitcher Fantasy Score': 'PFS'
+                }
+            }
+        }
+    }
+}
+
+
+def is_combined_statistic(statistic):
+    """Check if statistic is a combined statistic"""
+    return '+' in statistic or statistic in ['PRA', 'PR', 'PA', 'RA']
+
+
+def get_combined_stat_components(sport, statistic):
+    """Get components for combined statistics"""
+    combined_stats = SPORTS_CONFIG.get(sport, {}).get('combined_stats', {})
+    if statistic in combined_stats:
+        return combined_stats[statistic]
+    elif '+' in statistic:
+        return [comp.strip() for comp in statistic.split('+')]
+    return [statistic]
+
+
+def get_player_position(sport, statistic):
+    """
+    Position whose game log carries the statistic (e.g. 'goalie' for NHL SAVES),
+    the sport's first position when no position lists it, or None for sports
+    without positions
+    """
+    positions = SPORTS_CONFIG.get(sport, {}).get('positions')
+    if not positions:
+        return None
+    for position, config in positions.items():
+        if statistic in config['stats']:
+            return position
+    return next(iter(positions))
+
+
+def same_team(name, other):
+    """
+    True when two team names refer to the same team: equal, or one is the
+    other's nickname ('Brooklyn Nets' and 'Nets', but not 'Hornets')
+    """
+    name, other = name.strip().lower(), other.strip().lower()
+    if not name or not other:
+        return False
+    return name == other or name.endswith(' ' + other) or other.endswith(' ' + name)
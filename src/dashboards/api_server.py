@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Projection API Server
+=====================
+
+Small HTTP JSON service that exposes the player projection and defense
+analytics to other tools without the GUI. Built on asyncio from the standard
+library: every handler awaits its upstream work on a thread pool, so one slow
+StatMuse fetch does not hold up other requests.
+
+- Successful responses are cached for `cache_ttl` seconds
+- Identical concurrent queries are coalesced onto a single computation
+- Failed StatMuse fetches answer 503 with Retry-After when retrying may help, 502 otherwise
+
+Endpoints:
+    GET  /health
+    GET  /player-log?sport=NBA&player=LeBron James[&team=Any&time_duration=...&position=]
+    GET  /projection?sport=NBA&player=LeBron James&stat=PTS&line=25.5[&opponent=&method=WMA]
+    GET  /combos?sport=NBA&player=LeBron James&PRA=38.5&PR=31.5[&PA=&RA=&method=WMA]
+    GET  /defense-rankings?sport=NBA&stat=PTS
+    GET  /defense-analysis?sport=NBA&player=LeBron James&stat=PTS[&opponent=]
+    POST /slate   (JSON list of props, same fields as the batch evaluator)
+
+Usage:
+    python src/dashboards/api_server.py --port 8080
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+
+import requests
+
+try:
+    # Try relative imports first (when run as package)
+    from ..analyzers.batch_evaluator import NoDataError, SlateEvaluator, DEFAULT_TIME_DURATION
+    from ..scrapers.team_defense_scraper import get_defense_analysis
+    from ..scrapers.scrape_result import ScrapeError
+    from ..core.sports_config import SPORTS_CONFIG
+except ImportError:
+    # Fallback to flat imports with the src subdirectories on the path
+    import sys
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for subdir in ('scrapers', 'core', 'analyzers'):
+        path = os.path.join(src_dir, subdir)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    from batch_evaluator import NoDataError, SlateEvaluator, DEFAULT_TIME_DURATION
+    from team_defense_scraper import get_defense_analysis
+    from scrape_result import ScrapeError
+    from sports_config import SPORTS_CONFIG
+
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                500: 'Internal Server Error', 502: 'Bad Gateway', 503: 'Service Unavailable'}
+
+# Seconds clients are told to wait after a transient upstream failure without a Retry-After of its own
+DEFAULT_RETRY_AFTER = 30
+
+
+class ApiError(Exception):
+    """Error that maps directly onto an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def upstream_failure(result):
+    """
+    (status, payload) for a failed StatMuse fetch: 503 with retry_after for a
+    timeout, connection error, 429 or 5xx, 502 for anything retrying won't fix
+    """
+    payload = {'error': f"Upstream fetch failed: {result.error}", 'error_kind': result.error_kind}
+    if not result.transient:
+        return 502, payload
+    payload['retry_after'] = result.retry_after or DEFAULT_RETRY_AFTER
+    return 503, payload
+
+
+class ProjectionService:
+    """
+    Routes API requests onto the analytics modules with response caching and
+    coalescing of identical in-flight queries.
+    """
+
+    def __init__(self, cache_ttl=300, max_workers=16, method='WMA'):
+        self.cache_ttl = cache_ttl
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.evaluator = SlateEvaluator(max_workers=max_workers, method=method, cache_ttl=cache_ttl)
+        self._cache = {}      # key -> (expires_at, status, payload)
+        self._inflight = {}   # key -> asyncio.Future shared by identical queries
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'computed': 0}
+        self.routes = {
+            '/health': self.health,
+            '/player-log': self.player_log,
+            '/projection': self.projection,
+            '/combos': self.combos,
+            '/defense-rankings': self.defense_rankings,
+            '/defense-analysis': self.defense_analysis,
+        }
+
+    async def dispatch(self, method, target, body=b''):
+        """Handle one request and return (status, payload)"""
+        self.stats['requests'] += 1
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+
+        try:
+            if url.path == '/slate':
+                if method != 'POST':
+                    raise ApiError(405, "Use POST with a JSON list of props")
+                return 200, await self.slate(body)
+
+            handler = self.routes.get(url.path)
+            if handler is None:
+                raise ApiError(404, f"Unknown endpoint {url.path}")
+            if method != 'GET':
+                raise ApiError(405, f"Use GET for {url.path}")
+            if url.path == '/health':
+                return 200, handler(params)
+
+            key = (url.path, tuple(sorted(params.items())))
+            return await self._cached(key, handler, params)
+        except ApiError as e:
+            return e.status, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': str(e)}
+
+    async def _cached(self, key, handler, params):
+        """Serve from the response cache, or join/start the single computation for this key"""
+        entry = self._cache.get(key)
+        if entry and entry[0] > time.time():
+            self.stats['cache_hits'] += 1
+            return entry[1], entry[2]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The request computing it was cancelled (its client went away): compute it for this one
+                return await self._cached(key, handler, params)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        self.stats['computed'] += 1
+        try:
+            status, payload = await loop.run_in_executor(self.executor, handler, params)
+        except ApiError as e:
+            status, payload = e.status, {'error': str(e)}
+        except ScrapeError as e:
+            status, payload = upstream_failure(e.result)
+        except requests.RequestException as e:
+            status, payload = 502, {'error': f"Upstream fetch failed: {e}"}
+        except Exception as e:
+            status, payload = 500, {'error': str(e)}
+        except asyncio.CancelledError:
+            # This request's client went away mid-computation; release the coalesced waiters
+            future.cancel()
+            raise
+        finally:
+            del self._inflight[key]
+
+        # Only successful responses are cached; failures are retried on the next request
+        if status == 200:
+            self._cache[key] = (time.time() + self.cache_ttl, status, payload)
+        future.set_result((status, payload))
+        return status, payload
+
+    def health(self, params):
+        return {'status': 'ok', 'cached_responses': len(self._cache),
+                'inflight': len(self._inflight), **self.stats}
+
+    def _prop_from_params(self, params, *required):
+        missing = [name for name in required if not params.get(name)]
+        if missing:
+            raise ApiError(400, f"Missing query parameter(s): {', '.join(missing)}")
+        return {
+            'sport': params['sport'].upper(),
+            'player': params['player'],
+            'stat': params.get('stat', ''),
+            'line': float(params.get('line') or 0),
+            'opponent': params.get('opponent') or None,
+            'team': params.get('team') or 'Any',
+            'time_duration': params.get('time_duration') or DEFAULT_TIME_DURATION,
+            'method': params.get('method'),
+            'position': params.get('position') or None,
+        }
+
+    def player_log(self, params):
+        prop = self._prop_from_params(params, 'sport', 'player')
+        try:
+            data = self.evaluator.fetch_player_log(prop['sport'], prop['player'], prop['team'], prop['time_duration'],
+                                                   prop['position'])
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        if not data:
+            raise ApiError(404, "No data found for this player")
+        return 200, {'header': data[0], 'games': data[1:]}
+
+    def projection(self, params):
+        try:
+            prop = self._prop_from_params(params, 'sport', 'player', 'stat', 'line')
+        except ValueError:
+            raise ApiError(400, "line must be a number")
+        try:
+            return 200, self.evaluator.evaluate_prop(prop)
+        except NoDataError as e:
+            raise ApiError(404, str(e))
+        except ValueError as e:
+            raise ApiError(400, str(e))
+
+    def combos(self, params):
+        prop = self._prop_from_params(params, 'sport', 'player')
+        combined_stats = SPORTS_CONFIG.get(prop['sport'], {}).get('combined_stats', {})
+        try:
+            lines = {combo: float(params[combo]) for combo in combined_stats if params.get(combo)}
+        except ValueError:
+            raise ApiError(400, "combo lines must be numbers")
+        if not lines:
+            raise ApiError(400, f"Give at least one combo line: {', '.join(combined_stats)}")
+        try:
+            priced = self.evaluator.price_combos(prop['sport'], prop['player'], lines, prop['team'],
+                                                 prop['time_duration'], prop['method'], prop['position'])
+        except NoDataError as e:
+            raise ApiError(404, str(e))
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        return 200, {'sport': prop['sport'], 'player': prop['player'], 'combos': priced}
+
+    def defense_rankings(self, params):
+        if not params.get('stat'):
+            raise ApiError(400, "Missing query parameter(s): stat")
+        sport = params.get('sport', 'NBA').upper()
+        rankings = self.evaluator.get_rankings(sport, params['stat'])
+        if rankings is None:
+            raise ApiError(404, f"No defense rankings available for {sport}")
+        if not rankings:
+            return 502, {'error': f"No rankings found for {params['stat']}"}
+
+        teams = []
+        for item in rankings:
+            # Individual stats come as (team, value, rank), combined stats as (rank, team, value)
+            if isinstance(item[0], int):
+                rank, team, value = item
+            else:
+                team, value, rank = item
+            teams.append({'rank': rank, 'team': team, 'value': value})
+        return 200, {'sport': sport, 'stat': params['stat'], 'rankings': teams}
+
+    def defense_analysis(self, params):
+        prop = self._prop_from_params(params, 'sport', 'player', 'stat')
+        rankings = self.evaluator.get_rankings(prop['sport'], prop['stat'])
+        if rankings is None:
+            raise ApiError(404, f"No defense rankings available for {prop['sport']}")
+        player_data = self.evaluator.fetch_player_log(prop['sport'], prop['player'], prop['team'], prop['time_duration'])
+        analysis = get_defense_analysis(player_data, prop['stat'], opponent=prop['opponent'], rankings=rankings)
+        if not analysis:
+            raise ApiError(404, "No opponent data available")
+        return 200, analysis
+
+    async def slate(self, body):
+        try:
+            props = json.loads(body or b'[]')
+            props = [self._prop_from_params({k: str(v) for k, v in p.items() if v is not None},
+                                            'sport', 'player', 'stat', 'line') for p in props]
+        except (ValueError, AttributeError, TypeError):
+            raise ApiError(400, "Body must be a JSON list of props with sport, player, stat and line")
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(self.executor, self.evaluator.evaluate, props)
+        return {'results': results}
+
+
+class ApiServer:
+    """Minimal asyncio HTTP/1.1 server for ProjectionService"""
+
+    def __init__(self, service, host='127.0.0.1', port=8080):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Pick up the real port when started with port 0
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                body = b''
+                if int(headers.get('content-length', 0) or 0) > 0:
+                    body = await reader.readexactly(int(headers['content-length']))
+
+                status, payload = await self.service.dispatch(method.upper(), target, body)
+                data = json.dumps(payload, default=str).encode('utf-8')
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                retry_after = payload.get('retry_after') if status == 503 and isinstance(payload, dict) else None
+                retry_header = f"Retry-After: {math.ceil(retry_after)}\r\n" if retry_after else ''
+
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"{retry_header}"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve player projections and defense rankings as JSON")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--cache-ttl', type=float, default=300, help="seconds to cache responses (default: 300)")
+    parser.add_argument('--workers', type=int, default=16, help="upstream worker threads (default: 16)")
+    args = parser.parse_args(argv)
+
+    service = ProjectionService(cache_ttl=args.cache_ttl, max_workers=args.workers)
+    server = ApiServer(service, args.host, args.port)
+    print(f"Serving projections on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
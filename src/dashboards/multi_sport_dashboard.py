@@ -8,13 +8,38 @@ import requests
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime
+import os
 import threading
 import time
 
+# Sport-specific configuration and probability engines are shared with the headless tools
+try:
+    from ..core.sports_config import SPORTS_CONFIG, get_player_position
+    from ..analyzers.monte_carlo import PROBABILITY_ENGINES, SIMULATION_ENGINES
+    from ..analyzers.defense_engine import DefenseEngine
+    from ..analyzers.derived_values import DashboardValues, RECOMMENDATION_COLORS
+    from ..analyzers.player_comparison import compare_players, fetch_player_logs, parse_player_lines
+    from ..analyzers.refresh_scheduler import (DEFAULT_WATCHLIST, RefreshScheduler, format_time, load_watchlist,
+                                               schedule_defense, schedule_watchlist)
+except ImportError:
+    import sys
+    import os
+    for subdir in ('core', 'analyzers'):
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', subdir))
+    from sports_config import SPORTS_CONFIG, get_player_position
+    from monte_carlo import PROBABILITY_ENGINES, SIMULATION_ENGINES
+    from defense_engine import DefenseEngine
+    from derived_values import DashboardValues, RECOMMENDATION_COLORS
+    from player_comparison import compare_players, fetch_player_logs, parse_player_lines
+    from refresh_scheduler import (DEFAULT_WATCHLIST, RefreshScheduler, format_time, load_watchlist,
+                                   schedule_defense, schedule_watchlist)
+
 # Import the modules from the integrated dashboard
 try:
     # Try relative imports first (when run as package)
     from ..scrapers.datascrapper import geturl, scrape_statmuse
+    from ..analyzers.batch_evaluator import SlateEvaluator
+    from ..core.player_logs import PLAYER_CLEANERS
     from ..core.NBBBA import clean_nba_data, get_nba_statistics
     from ..analyzers.simplemean import simple_mean
     from ..analyzers.WMA import weighted_moving_average
@@ -40,6 +65,8 @@ except ImportError:
             sys.path.insert(0, project_dir)
         
         from scrapers.datascrapper import geturl, scrape_statmuse
+        from analyzers.batch_evaluator import SlateEvaluator
+        from core.player_logs import PLAYER_CLEANERS
         from core.NBBBA import clean_nba_data, get_nba_statistics
         from analyzers.simplemean import simple_mean
         from analyzers.WMA import weighted_moving_average
@@ -50,6 +77,8 @@ except ImportError:
         # Final fallback to direct imports (for backward compatibility)
         try:
             from datascrapper import geturl, scrape_statmuse
+            from batch_evaluator import SlateEvaluator
+            from player_logs import PLAYER_CLEANERS
             from NBBBA import clean_nba_data, get_nba_statistics
             from simplemean import simple_mean
             from WMA import weighted_moving_average
@@ -60,12 +89,33 @@ except ImportError:
             INTEGRATED_MODULES_AVAILABLE = False
             print("Warning: Some integrated dashboard modules not available. Using sample data.")
 
+# Dark plot theme, fetched once at startup; matplotlib's own dark theme when it cannot be fetched
+PLOT_STYLE = 'https://github.com/dhaitz/matplotlib-stylesheets/raw/master/pitayasmoothie-dark.mplstyle'
+FALLBACK_PLOT_STYLE = 'dark_background'
+
+
+def apply_plot_style():
+    """Set the plot theme for every figure drawn after this"""
+    try:
+        plt.style.use(PLOT_STYLE)
+    except (OSError, ValueError) as e:
+        print(f"Warning: plot style unavailable ({e}); using {FALLBACK_PLOT_STYLE}")
+        plt.style.use(FALLBACK_PLOT_STYLE)
+
+
+# Step of the live projection slider and spinbox; sportsbook lines move in half points
+PROJECTION_STEP = 0.5
+
+# How often the status panel's last-refresh line is updated, in milliseconds
+REFRESH_STATUS_INTERVAL = 30000
+
 class MultiSportDashboard:
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("Multi-Sport Quantitative Betting Dashboard")
         self.root.geometry("1400x900")
         self.root.configure(bg='#1a1a1a')
+        apply_plot_style()
         
         # Style configuration
         style = ttk.Style()
@@ -76,61 +126,29 @@ class MultiSportDashboard:
         style.configure('TEntry', background='#4a4a4a', foreground='white', fieldbackground='#4a4a4a')
         
         # Sport-specific configurations
-        self.sports_config = {
-            'NBA': {
-                'stats': ['PTS', 'REB', 'AST', 'STL', 'BLK', '3PM', 'FTM', 'TOV', 'PRA', 'PR', 'PA', 'RA'],
-                'combined_stats': {
-                    'PRA': ['PTS', 'REB', 'AST'],
-                    'PR': ['PTS', 'REB'],
-                    'PA': ['PTS', 'AST'],
-                    'RA': ['REB', 'AST']
-                },
-                'url_template': 'https://www.statmuse.com/nba/ask/nba-teams-that-give-up-the-most-{}-per-game-this-season',
-                'stat_mapping': {
-                    'PTS': 'points', 'REB': 'rebounds', 'AST': 'assists', 'STL': 'steals',
-                    'BLK': 'blocks', '3PM': '3-pointers', 'FTM': 'free-throws', 'TOV': 'turnovers'
-                }
-            },
-            'NFL': {
-                'stats': ['PASS_YDS', 'RUSH_YDS', 'REC_YDS', 'TD', 'INT', 'SACK', 'FUM', 'PRA', 'PR', 'PA'],
-                'combined_stats': {
-                    'PRA': ['PASS_YDS', 'RUSH_YDS', 'REC_YDS'],
-                    'PR': ['PASS_YDS', 'RUSH_YDS'],
-                    'PA': ['PASS_YDS', 'REC_YDS']
-                },
-                'url_template': 'https://www.statmuse.com/nfl/ask/nfl-teams-that-give-up-the-most-{}-per-game-this-season',
-                'stat_mapping': {
-                    'PASS_YDS': 'passing-yards', 'RUSH_YDS': 'rushing-yards', 'REC_YDS': 'receiving-yards',
-                    'TD': 'touchdowns', 'INT': 'interceptions', 'SACK': 'sacks', 'FUM': 'fumbles'
-                }
-            },
-            'NHL': {
-                'stats': ['GOALS', 'ASSISTS', 'POINTS', 'PIM', 'SHOTS', 'HITS', 'BLOCKS', 'PRA', 'PA'],
-                'combined_stats': {
-                    'PRA': ['GOALS', 'ASSISTS', 'POINTS'],
-                    'PA': ['GOALS', 'ASSISTS']
-                },
-                'url_template': 'https://www.statmuse.com/nhl/ask/nhl-teams-that-give-up-the-most-{}-per-game-this-season',
-                'stat_mapping': {
-                    'GOALS': 'goals', 'ASSISTS': 'assists', 'POINTS': 'points', 'PIM': 'penalty-minutes',
-                    'SHOTS': 'shots', 'HITS': 'hits', 'BLOCKS': 'blocks'
-                }
-            },
-            'WNBA': {
-                'stats': ['PTS', 'REB', 'AST', 'STL', 'BLK', '3PM', 'FTM', 'TOV', 'PRA', 'PR', 'PA', 'RA'],
-                'combined_stats': {
-                    'PRA': ['PTS', 'REB', 'AST'],
-                    'PR': ['PTS', 'REB'],
-                    'PA': ['PTS', 'AST'],
-                    'RA': ['REB', 'AST']
-                },
-                'url_template': 'https://www.statmuse.com/wnba/ask/wnba-teams-that-give-up-the-most-{}-per-game-this-season',
-                'stat_mapping': {
-                    'PTS': 'points', 'REB': 'rebounds', 'AST': 'assists', 'STL': 'steals',
-                    'BLK': 'blocks', '3PM': '3-pointers', 'FTM': 'free-throws', 'TOV': 'turnovers'
-                }
-            }
-        }
+        self.sports_config = SPORTS_CONFIG
+        
+        # NBA, WNBA, NHL and MLB logs are fetched and cleaned on one bounded worker pool with a shared cache;
+        # game windows are sliced from one fetch per player, so switching the time duration does not refetch
+        self.player_pipeline = SlateEvaluator(max_workers=4, cache_ttl=300) if INTEGRATED_MODULES_AVAILABLE else None
+        
+        # Team defense matrices for every sport, built in the background so the first analysis does not wait
+        self.defense_engine = DefenseEngine()
+        self.defense_engine.warm()
+        
+        # Team defense and the watchlist's logs are revalidated on a schedule and kept when unchanged
+        self.refresh_scheduler = RefreshScheduler()
+        schedule_defense(self.refresh_scheduler, self.defense_engine, self.sports_config)
+        if self.player_pipeline and os.path.exists(DEFAULT_WATCHLIST):
+            try:
+                schedule_watchlist(self.refresh_scheduler, load_watchlist(DEFAULT_WATCHLIST),
+                                   self.player_pipeline.refresh_player_log)
+            except ValueError as e:
+                print(f"Warning: watchlist not loaded: {e}")
+        self.refresh_scheduler.start()
+        
+        # Derived values of the dashboard on screen (DashboardValues), memoized per projection change
+        self.dashboard_values = None
         
         self.setup_ui()
         
@@ -191,6 +209,13 @@ class MultiSportDashboard:
                                                 'Playoff Game Log', 'Last 5 Playoff Games', 'combined'))
         time_duration_combo.grid(row=2, column=1, sticky='ew', padx=5, pady=5)
         
+        # Players to compare side by side; a player without a line uses the projection
+        tk.Label(player_frame, text="Compare Players:", bg='#1a1a1a', fg='white').grid(row=3, column=0, sticky='w', padx=5, pady=5)
+        self.compare_entry = tk.Entry(player_frame, bg='#4a4a4a', fg='white', font=('Arial', 10))
+        self.compare_entry.grid(row=3, column=1, sticky='ew', padx=5, pady=5)
+        tk.Label(player_frame, text="e.g. Stephen Curry 38.5, LeBron James 40.5", bg='#1a1a1a', fg='gray',
+                 font=('Arial', 8)).grid(row=4, column=1, sticky='w', padx=5)
+        
         # Configure grid weights
         player_frame.columnconfigure(1, weight=1)
         
@@ -211,12 +236,35 @@ class MultiSportDashboard:
         self.projection_entry = tk.Entry(analysis_frame, bg='#4a4a4a', fg='white', font=('Arial', 10))
         self.projection_entry.grid(row=1, column=1, sticky='ew', padx=5, pady=5)
         
+        # Live projection: moves the line on the loaded dashboard without re-scraping or re-rendering
+        tk.Label(analysis_frame, text="Live Projection:", bg='#1a1a1a', fg='white').grid(row=2, column=0, sticky='w', padx=5, pady=5)
+        live_frame = tk.Frame(analysis_frame, bg='#1a1a1a')
+        live_frame.grid(row=2, column=1, sticky='ew', padx=5, pady=5)
+        self.live_projection_var = tk.StringVar(value="")
+        self.projection_scale = tk.Scale(live_frame, from_=0, to=50, resolution=PROJECTION_STEP,
+                                         orient='horizontal', showvalue=False, bg='#1a1a1a', fg='white',
+                                         troughcolor='#4a4a4a', highlightthickness=0, state='disabled',
+                                         command=self.on_projection_scale)
+        self.projection_scale.pack(side='left', fill='x', expand=True)
+        self.projection_spinbox = ttk.Spinbox(live_frame, textvariable=self.live_projection_var, from_=0, to=50,
+                                              increment=PROJECTION_STEP, width=7, state='disabled',
+                                              command=self.on_projection_spinbox)
+        self.projection_spinbox.pack(side='left', padx=(5, 0))
+        self.projection_spinbox.bind('<Return>', self.on_projection_spinbox)
+        
         # Quantitative analysis
-        tk.Label(analysis_frame, text="Analysis Method:", bg='#1a1a1a', fg='white').grid(row=2, column=0, sticky='w', padx=5, pady=5)
+        tk.Label(analysis_frame, text="Analysis Method:", bg='#1a1a1a', fg='white').grid(row=3, column=0, sticky='w', padx=5, pady=5)
         self.quantitative_var = tk.StringVar(value="Mean")
         quantitative_combo = ttk.Combobox(analysis_frame, textvariable=self.quantitative_var, 
                                         values=('Mean', 'WMA'))
-        quantitative_combo.grid(row=2, column=1, sticky='ew', padx=5, pady=5)
+        quantitative_combo.grid(row=3, column=1, sticky='ew', padx=5, pady=5)
+        
+        # Probability engine
+        tk.Label(analysis_frame, text="Probability Engine:", bg='#1a1a1a', fg='white').grid(row=4, column=0, sticky='w', padx=5, pady=5)
+        self.probability_engine_var = tk.StringVar(value="Normal")
+        probability_engine_combo = ttk.Combobox(analysis_frame, textvariable=self.probability_engine_var, 
+                                              values=PROBABILITY_ENGINES)
+        probability_engine_combo.grid(row=4, column=1, sticky='ew', padx=5, pady=5)
         
         # Configure grid weights
         analysis_frame.columnconfigure(1, weight=1)
@@ -230,7 +278,14 @@ class MultiSportDashboard:
                                   command=self.generate_dashboard, 
                                   bg='#00aa00', fg='white', font=('Arial', 14, 'bold'),
                                   height=2, width=25)
-        self.submit_btn.pack(expand=True, pady=20)
+        self.submit_btn.pack(expand=True, pady=(20, 5))
+        
+        # Comparison button
+        self.compare_btn = tk.Button(button_frame, text="Compare Players", 
+                                   command=self.generate_comparison, 
+                                   bg='#0055aa', fg='white', font=('Arial', 12, 'bold'),
+                                   width=25)
+        self.compare_btn.pack(expand=True, pady=(5, 20))
         
         # Status Section
         status_frame = tk.LabelFrame(parent, text="Status", 
@@ -247,17 +302,29 @@ class MultiSportDashboard:
         self.progress = ttk.Progressbar(status_frame, mode='indeterminate')
         self.progress.pack(fill='x', padx=10, pady=5)
         
+        # Last background refresh of team defense and watched players
+        self.refresh_var = tk.StringVar(value="Last refresh: never")
+        tk.Label(status_frame, textvariable=self.refresh_var, bg='#1a1a1a', fg='#888888',
+                 font=('Arial', 9), wraplength=350).pack(pady=(0, 5), padx=10)
+        self.root.after(REFRESH_STATUS_INTERVAL, self.update_refresh_status)
+        
     def setup_dashboard(self, parent):
         # Create matplotlib figure
         self.fig = Figure(figsize=(12, 8), facecolor='#1a1a1a')
         self.canvas = FigureCanvasTkAgg(self.fig, parent)
         self.canvas.get_tk_widget().pack(fill='both', expand=True)
         
+        # Artists that follow the live projection; they are animated and blitted over a cached background
+        self.projection_artists = {}
+        self._background = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        
         # Show placeholder
         self.show_placeholder()
         
     def show_placeholder(self):
         """Show placeholder when no data is available"""
+        self.projection_artists = {}
         self.fig.clear()
         ax = self.fig.add_subplot(111)
         ax.set_facecolor('#1a1a1a')
@@ -306,6 +373,7 @@ class MultiSportDashboard:
                 return
                 
             quantitative_analysis = self.quantitative_var.get()
+            probability_engine = self.probability_engine_var.get()
             
             if not player_name:
                 self.root.after(0, lambda: self.status_var.set("ERROR: Please enter a player name"))
@@ -315,16 +383,15 @@ class MultiSportDashboard:
             self.root.after(0, lambda: self.status_var.set(f"Fetching data for {player_name}..."))
             
             # Get data based on availability of integrated modules
-            if INTEGRATED_MODULES_AVAILABLE and sport == "NBA":
-                # Use real data scraping for NBA
-                url = geturl("nba", player_name, team, time_duration)
-                data = scrape_statmuse(url)
+            if INTEGRATED_MODULES_AVAILABLE and sport in PLAYER_CLEANERS:
+                # Use real data scraping; NHL and MLB logs are cleaned for the position that records the statistic
+                position = get_player_position(sport, statistic)
+                player_data = self.player_pipeline.executor.submit(
+                    self.player_pipeline.fetch_player_log, sport, player_name, team, time_duration, position).result()
                 
-                if not data:
+                if not player_data:
                     self.root.after(0, lambda: self.status_var.set("ERROR: No data found for this player"))
                     return
-                    
-                player_data = clean_nba_data(data)
             else:
                 # Use sample data for other sports or when modules not available
                 player_data = self.get_sample_data(sport, player_name)
@@ -333,17 +400,17 @@ class MultiSportDashboard:
                 self.root.after(0, lambda: self.status_var.set("ERROR: No valid data found"))
                 return
                 
-            # Calculate quantitative value
-            if quantitative_analysis == "WMA":
-                quantitative_value = self.calculate_wma(player_data, statistic)
-            else:
-                quantitative_value = self.calculate_quantitative(player_data, statistic, "Mean")
+            # Derived values are computed lazily and memoized; compute the projection-independent
+            # ones the engine draws here so the UI thread only evaluates what depends on the projection
+            dashboard_values = DashboardValues(player_data, sport, statistic, projection, quantitative_analysis,
+                                               probability_engine)
+            dashboard_values['simulated' if probability_engine in SIMULATION_ENGINES else 'pdf_curve']
             
             # Get defense analysis
             defense_analysis = self.get_defense_analysis(sport, player_data, statistic)
             
             # Create dashboard
-            self.root.after(0, lambda: self.create_dashboard(player_data, statistic, projection, quantitative_value, player_name, defense_analysis, sport))
+            self.root.after(0, lambda: self.create_dashboard(dashboard_values, player_name, defense_analysis))
             
             # Update status
             self.root.after(0, lambda: self.status_var.set(f"Dashboard generated successfully for {player_name} ({sport})"))
@@ -355,6 +422,62 @@ class MultiSportDashboard:
             self.root.after(0, lambda: self.submit_btn.config(state='normal'))
             self.root.after(0, self.progress.stop)
             
+    def generate_comparison(self):
+        """Compare the players in the Compare Players field when the compare button is clicked"""
+        self.submit_btn.config(state='disabled')
+        self.compare_btn.config(state='disabled')
+        self.status_var.set("Comparing players...")
+        self.progress.start()
+        
+        thread = threading.Thread(target=self._generate_comparison_thread)
+        thread.daemon = True
+        thread.start()
+        
+    def _generate_comparison_thread(self):
+        """Thread function for the comparison: concurrent fetch, one batched computation, one draw"""
+        try:
+            sport = self.sport_var.get()
+            team = self.team_name_entry.get().strip()
+            time_duration = self.time_duration_var.get()
+            statistic = self.statistic_var.get()
+            method = self.quantitative_var.get()
+            probability_engine = self.probability_engine_var.get()
+            
+            try:
+                default_line = float(self.projection_entry.get())
+            except ValueError:
+                default_line = None
+            try:
+                players, lines = zip(*parse_player_lines(self.compare_entry.get(), default_line))
+            except ValueError as e:
+                error_msg = str(e)
+                self.root.after(0, lambda: self.status_var.set(f"ERROR: {error_msg}"))
+                return
+            
+            self.root.after(0, lambda: self.status_var.set(f"Fetching data for {len(players)} players..."))
+            
+            if INTEGRATED_MODULES_AVAILABLE and sport in PLAYER_CLEANERS:
+                # Fetched concurrently and served from the same log cache as Generate Dashboard
+                logs = fetch_player_logs(self.player_pipeline, sport, players, statistic, team, time_duration)
+            else:
+                logs = [self.get_sample_data(sport, player) for player in players]
+            
+            rows = compare_players(logs, sport, statistic, lines, players, method, probability_engine)
+            defense_analyses = [None if row['error'] else self.get_defense_analysis(sport, log, statistic)
+                                for row, log in zip(rows, logs)]
+            
+            self.root.after(0, lambda: self.create_comparison(rows, defense_analyses, sport, statistic, method,
+                                                              probability_engine))
+            self.root.after(0, lambda: self.status_var.set(f"Compared {len(players)} players ({sport} {statistic})"))
+            
+        except Exception as e:
+            error_msg = str(e)
+            self.root.after(0, lambda: self.status_var.set(f"ERROR: {error_msg}"))
+        finally:
+            self.root.after(0, lambda: self.submit_btn.config(state='normal'))
+            self.root.after(0, lambda: self.compare_btn.config(state='normal'))
+            self.root.after(0, self.progress.stop)
+            
     def is_combined_statistic(self, statistic):
         """Check if statistic is a combined statistic"""
         return '+' in statistic or statistic in ['PRA', 'PR', 'PA', 'RA']
@@ -370,36 +493,7 @@ class MultiSportDashboard:
         
     def calculate_wma(self, player_data, statistic):
         """Calculate Weighted Moving Average"""
-        if not INTEGRATED_MODULES_AVAILABLE:
-            return self.calculate_quantitative(player_data, statistic, "Mean")
-            
-        header = player_data[0]
-        
-        if self.is_combined_statistic(statistic):
-            components = self.get_combined_stat_components(statistic)
-            combined_values = []
-            
-            for game in player_data[1:]:
-                game_total = 0
-                for comp in components:
-                    try:
-                        comp_index = header.index(comp)
-                        game_total += float(game[comp_index])
-                    except (ValueError, IndexError):
-                        continue
-                combined_values.append(game_total)
-            values = combined_values
-        else:
-            try:
-                stat_index = header.index(statistic)
-                values = [float(game[stat_index]) for game in player_data[1:] if game[stat_index]]
-            except (ValueError, IndexError):
-                return 0
-                
-        if not values:
-            return 0
-            
-        return weighted_moving_average(values)
+        return self.calculate_quantitative(player_data, statistic, "WMA")
         
     def get_sample_data(self, sport, player_name):
         """Generate sample data for the selected sport"""
@@ -439,46 +533,25 @@ class MultiSportDashboard:
                 ['4', '', 'Breanna StewartB. Stewart', '2/25/2025', 'NYL', 'vs', 'DAL', '31', '20', '6', '4', '1', '1', '7', '15', '46.7', '2', '4', '50.0', '4', '5', '80.0'],
                 ['5', '', 'Breanna StewartB. Stewart', '2/27/2025', 'NYL', '@', 'PHX', '33', '26', '8', '3', '2', '1', '9', '17', '52.9', '2', '5', '40.0', '6', '7', '85.7']
             ]
+        elif sport == "MLB":
+            return [
+                ['', '', 'NAME', 'DATE', 'TM', '', 'OPP', 'H', 'R', 'RBI', 'HR', 'TB', 'SB', 'BB', 'SO'],
+                ['1', '', 'Aaron JudgeA. Judge', '6/13/2025', 'NYY', '@', 'BOS', '2', '1', '2', '1', '5', '0', '1', '1'],
+                ['2', '', 'Aaron JudgeA. Judge', '6/14/2025', 'NYY', '@', 'BOS', '1', '0', '0', '0', '1', '0', '0', '2'],
+                ['3', '', 'Aaron JudgeA. Judge', '6/15/2025', 'NYY', '@', 'BOS', '3', '2', '3', '1', '7', '1', '1', '0'],
+                ['4', '', 'Aaron JudgeA. Judge', '6/17/2025', 'NYY', 'vs', 'LAA', '0', '0', '0', '0', '0', '0', '2', '1'],
+                ['5', '', 'Aaron JudgeA. Judge', '6/18/2025', 'NYY', 'vs', 'LAA', '2', '1', '1', '0', '3', '0', '0', '1']
+            ]
         
     def calculate_quantitative(self, player_data, statistic, method):
-        """Calculate quantitative value based on method"""
+        """Calculate quantitative value based on method (Mean, WMA, Median or Mode)"""
         if len(player_data) < 2:
             return 0
-            
-        header = player_data[0]
-        values = []
-        
-        # Handle combined statistics
-        if self.is_combined_statistic(statistic):
-            components = self.get_combined_stat_components(statistic)
-            for game in player_data[1:]:
-                game_total = 0
-                for comp in components:
-                    try:
-                        comp_index = header.index(comp)
-                        game_total += float(game[comp_index])
-                    except (ValueError, IndexError):
-                        continue
-                values.append(game_total)
-        else:
-            try:
-                stat_index = header.index(statistic)
-                values = [float(game[stat_index]) for game in player_data[1:] if game[stat_index]]
-            except (ValueError, IndexError):
-                return 0
-        
-        if not values:
+        try:
+            return DashboardValues(player_data, self.sport_var.get(), statistic, 0, method)['quantitative']
+        except ValueError:
             return 0
             
-        if method.lower() == "mean":
-            return np.mean(values)
-        elif method.lower() == "median":
-            return np.median(values)
-        elif method.lower() == "mode":
-            return max(set(values), key=values.count)
-        else:
-            return np.mean(values)
-            
     def get_defense_analysis(self, sport, player_data, statistic):
         """Get defense analysis for the opponent"""
         if not player_data or len(player_data) < 2:
@@ -491,79 +564,28 @@ class MultiSportDashboard:
         opp_index = header.index('OPP')
         opponent = player_data[1][opp_index]
         
-        # Simulate defense analysis (in real implementation, this would scrape sport-specific data)
-        return {
-            'opponent': opponent,
-            'rank': 2,
-            'total_teams': 30,
-            'value_allowed': 120.44,
-            'difficulty': "Easy",
-            'color': "green",
-            'rank_percentage': 6.7
-        }
+        try:
+            return self.defense_engine.analyze(sport, opponent, statistic)
+        except Exception as e:
+            print(f"Defense analysis unavailable for {sport}: {e}")
+            return None
         
-    def create_dashboard(self, player_data, statistic, projection, quantitative, player_name, defense_analysis, sport):
-        """Create the integrated dashboard"""
-        self.fig.clear()
+    def create_dashboard(self, values, player_name, defense_analysis):
+        """Create the integrated dashboard from the player's DashboardValues"""
+        self.dashboard_values = values
+        statistic, projection, sport = values['statistic'], values['projection'], values['sport']
+        quantitative, probability_engine = values['quantitative'], values['engine']
+        texts = self.projection_texts(values)
+        artists = {}
         
-        # Set dark theme
-        plt.style.use('https://github.com/dhaitz/matplotlib-stylesheets/raw/master/pitayasmoothie-dark.mplstyle')
+        self.projection_artists = {}
+        self.fig.clear()
         
         # Ensure figure background matches the dark theme
         self.fig.patch.set_facecolor('#1a1a1a')
         
-        header = player_data[0]
-        
-        # Handle combined statistics
-        if self.is_combined_statistic(statistic):
-            # Calculate combined statistic from individual components
-            components = self.get_combined_stat_components(statistic)
-            combined_values = []
-            
-            for game in player_data[1:]:
-                game_total = 0
-                valid_components = 0
-                
-                for comp in components:
-                    try:
-                        comp_index = header.index(comp)
-                        game_total += float(game[comp_index])
-                        valid_components += 1
-                    except (ValueError, IndexError):
-                        continue
-                
-                if valid_components > 0:
-                    combined_values.append(game_total)
-                else:
-                    combined_values.append(0)
-            
-            # Use combined values instead of single statistic
-            values = combined_values
-            index_to_extract = None  # Not needed for combined stats
-        else:
-            # Handle individual statistics
-            try:
-                index_to_extract = header.index(statistic)
-            except ValueError:
-                self.status_var.set(f"Parameter {statistic} not found in header.")
-                return
-        
-        # Extract data
-        dates = [datetime.strptime(game[header.index('DATE')], '%m/%d/%Y') for game in player_data[1:] if game[header.index('DATE')]]
-        
-        if self.is_combined_statistic(statistic):
-            # Use pre-calculated combined values
-            values = combined_values
-        else:
-            # Extract individual statistic values
-            values = [float(game[index_to_extract]) for game in player_data[1:] if game[index_to_extract]]
-        
-        team_abbrs = [game[header.index('TM')] for game in player_data[1:] if game[header.index('TM')]]
-        opponent_names = [game[header.index('OPP')] for game in player_data[1:] if game[header.index('OPP')]]
-        
-        # Sort data by date
-        sorted_data = sorted(zip(dates, values, team_abbrs, opponent_names))
-        sorted_dates, sorted_values, sorted_team_abbrs, sorted_opponent_names = zip(*sorted_data)
+        # Game values in date order (combined statistics are summed from their components)
+        sorted_dates, sorted_values, sorted_opponent_names = values['dates'], values['values'], values['opponents']
         
         x_values = list(range(len(sorted_dates)))
         
@@ -575,21 +597,22 @@ class MultiSportDashboard:
         ax1.set_facecolor('#1a1a1a')
         
         # Color-coded bars (green for hits, red for misses)
-        colors = ['green' if value >= projection else 'red' for value in sorted_values]
-        bars = ax1.bar(x_values, sorted_values, width=0.6, color=colors, alpha=0.8)
+        bars = ax1.bar(x_values, sorted_values, width=0.6, color=values['bar_colors'], alpha=0.8)
+        artists['bars'] = list(bars)
         
         # Add lines
         ax1.axhline(y=quantitative, color='purple', linestyle='solid', linewidth=2, 
                    label=f'Average: {quantitative:.2f}')
-        ax1.axhline(y=projection, color='yellow', linestyle='dotted', linewidth=2, 
-                   label=f'Projection: {projection:.2f}')
+        artists['projection_line'] = ax1.axhline(y=projection, color='yellow', linestyle='dotted', linewidth=2, 
+                                                 label=texts['projection_label'])
         
         ax1.set_xlabel('Recent Games', fontsize=11)
         ax1.set_ylabel(statistic, fontsize=11)
         ax1.set_title(f'{player_name} - {statistic} Performance', fontsize=13, fontweight='bold')
         ax1.set_xticks(x_values)
         ax1.set_xticklabels([date.strftime('%m/%d') for date in sorted_dates], rotation=45, ha='right', fontsize=9)
-        ax1.legend(fontsize=9)
+        artists['performance_legend'] = ax1.legend(fontsize=9)
+        artists['projection_label'] = artists['performance_legend'].get_texts()[1]
         ax1.grid(True, alpha=0.3)
         
         # Add value labels on bars
@@ -610,56 +633,59 @@ class MultiSportDashboard:
         title = f'{sport} Team Defense Rankings\n(Worst to Best)'
         ax2.text(0.5, 0.95, title, fontsize=12, fontweight='bold', ha='center', va='top', transform=ax2.transAxes, color='white')
         
-        # Simulate team rankings
-        teams = ['Jazz', 'Wizards', 'Bulls', 'Hawks', 'Pelicans', 'Nuggets', 'Grizzlies', 'Spurs', 'Suns', '76ers']
-        values = [121.23, 120.44, 119.37, 119.32, 119.26, 116.87, 116.85, 116.68, 116.62, 115.84]
-        
-        y_start = 0.85
-        y_spacing = 0.07
-        for i, (team, value) in enumerate(zip(teams, values)):
-            y_pos = y_start - (i * y_spacing)
-            color = 'yellow' if (defense_analysis and team == defense_analysis['opponent']) else 'white'
-            fontweight = 'bold' if (defense_analysis and team == defense_analysis['opponent']) else 'normal'
-            team_text = f"{i+1}. {team}: {value:.2f}"
-            ax2.text(0.05, y_pos, team_text, fontsize=10, color=color, fontweight=fontweight, transform=ax2.transAxes)
+        # Real rankings from the cached defense matrix; never fetch on the UI thread
+        rankings = self.defense_engine.rankings(sport, statistic, wait=False)
+        if rankings:
+            y_start = 0.85
+            y_spacing = 0.07
+            for team, value, rank in rankings[:10]:
+                y_pos = y_start - ((rank - 1) * y_spacing)
+                is_opponent = defense_analysis and team == defense_analysis['opponent']
+                color = 'yellow' if is_opponent else 'white'
+                fontweight = 'bold' if is_opponent else 'normal'
+                team_text = f"{rank}. {team}: {value:.2f}"
+                ax2.text(0.05, y_pos, team_text, fontsize=10, color=color, fontweight=fontweight, transform=ax2.transAxes)
+        else:
+            message = "Loading defense rankings..." if rankings is None else f"No {statistic} rankings available"
+            ax2.text(0.5, 0.5, message, fontsize=10, color='gray', ha='center', transform=ax2.transAxes)
         
         # Statistical Analysis (bottom left)
         ax3 = self.fig.add_subplot(gs[1, 0])
         ax3.set_facecolor('#1a1a1a')
         
-        data = np.array(sorted_values)
-        std_dev = np.std(data, ddof=1)
-        n = len(data)
-        
-        # Confidence Interval Calculation
-        t_critical = 2.571
-        margin_of_error = t_critical * (std_dev / np.sqrt(n))
-        conf_interval = (quantitative - margin_of_error, quantitative + margin_of_error)
-        
-        # CDF and PDF Calculation
         x = projection
-        z = (x - quantitative) / std_dev
-        
-        def erf(z):
-            t = 1.0 / (1.0 + 0.5 * abs(z))
-            tau = t * np.exp(-z*z - 1.26551223 + 1.00002368*t + 0.37409196*t*t + 0.09678418*t*t*t - 0.18628806*t*t*t*t + 0.27886807*t*t*t*t*t - 1.13520398*t*t*t*t*t*t + 1.48851587*t*t*t*t*t*t*t - 0.82215223*t*t*t*t*t*t*t*t + 0.17087277*t*t*t*t*t*t*t*t*t)
-            return 1 - tau if z >= 0 else tau - 1
-        
-        cdf = 0.5 * (1 + erf(z / np.sqrt(2)))
-        pdf = (1 / (std_dev * np.sqrt(2 * np.pi))) * np.exp(-0.5 * z**2)
-        
-        # Normal Distribution PDF Plot
-        x_values_pdf = np.linspace(quantitative - 4*std_dev, quantitative + 4*std_dev, 1000)
-        pdf_values = (1 / (std_dev * np.sqrt(2 * np.pi))) * np.exp(-0.5 * ((x_values_pdf - quantitative) / std_dev) ** 2)
-        ax3.plot(x_values_pdf, pdf_values, color='blue', linewidth=2)
-        ax3.axvline(x, color='yellow', linestyle='dashed', linewidth=2, label=f'Projection: {projection:.2f}')
-        ax3.axvline(quantitative, color='purple', linestyle='solid', linewidth=2, label=f'Mean: {quantitative:.2f}')
-        ax3.fill_between(x_values_pdf, pdf_values, where=(x_values_pdf <= x), color='gray', alpha=0.5)
-        ax3.text(projection, 0.02, f"CDF at Projection: {cdf:.4f}", fontsize=10, color='white')
-        ax3.set_title('Normal Distribution PDF', fontsize=11, fontweight='bold')
+        
+        if probability_engine in SIMULATION_ENGINES:
+            # Simulated next-game distribution instead of the normal approximation
+            simulated = values['simulated']
+            bins = np.arange(simulated.min(), simulated.max() + 2) - 0.5 if simulated.max() - simulated.min() < 60 else 40
+            counts, edges, patches = ax3.hist(simulated, bins=bins, density=True, color='blue', alpha=0.6)
+            artists['histogram'] = (list(patches), edges)
+            self.shade_histogram(patches, edges, x)
+            artists['distribution_line'] = ax3.axvline(x, color='yellow', linestyle='dashed', linewidth=2,
+                                                       label=texts['distribution_label'])
+            ax3.axvline(quantitative, color='purple', linestyle='solid', linewidth=2, label=f'Mean: {quantitative:.2f}')
+            artists['cdf_label'] = ax3.text(projection, 0.02, texts['cdf_label'], fontsize=10, color='white')
+            ax3.set_title(f'{probability_engine} Simulated Distribution', fontsize=11, fontweight='bold')
+        else:
+            # Normal Distribution PDF Plot; there is no curve when every game had the same value
+            pdf_curve = values['pdf_curve']
+            if pdf_curve is not None:
+                x_values_pdf, pdf_values = pdf_curve
+                ax3.plot(x_values_pdf, pdf_values, color='blue', linewidth=2)
+            artists['distribution_line'] = ax3.axvline(x, color='yellow', linestyle='dashed', linewidth=2,
+                                                       label=texts['distribution_label'])
+            ax3.axvline(quantitative, color='purple', linestyle='solid', linewidth=2, label=f'Mean: {quantitative:.2f}')
+            if pdf_curve is not None:
+                artists['cdf_fill'] = ax3.fill_between(x_values_pdf, pdf_values, where=(x_values_pdf <= x), color='gray',
+                                                       alpha=0.5)
+            artists['cdf_label'] = ax3.text(projection, 0.02, texts['cdf_label'], fontsize=10, color='white')
+            ax3.set_title('Normal Distribution PDF' if pdf_curve is not None else 'No Spread: Every Game Equal',
+                          fontsize=11, fontweight='bold')
         ax3.set_xlabel(statistic, fontsize=10)
         ax3.set_ylabel('Density', fontsize=10)
-        ax3.legend(fontsize=9)
+        artists['distribution_legend'] = ax3.legend(fontsize=9)
+        artists['distribution_label'] = artists['distribution_legend'].get_texts()[0]
         ax3.grid(True, alpha=0.3)
         
         # Opponent Analysis (bottom right)
@@ -685,22 +711,13 @@ class MultiSportDashboard:
                     fontsize=12, fontweight='bold', transform=ax4.transAxes, color=difficulty_color)
             
             # Hit probability
-            hit_prob = (1 - cdf) * 100
-            ax4.text(0.1, 0.45, f"Hit Probability: {hit_prob:.1f}%", 
+            artists['hit_text'] = ax4.text(0.1, 0.45, texts['hit_text'], 
                     fontsize=12, transform=ax4.transAxes, color='white')
             
             # Recommendation
-            if hit_prob > 60:
-                recommendation = "STRONG BET"
-                rec_color = "green"
-            elif hit_prob > 40:
-                recommendation = "MODERATE BET"
-                rec_color = "orange"
-            else:
-                recommendation = "AVOID BET"
-                rec_color = "red"
+            recommendation, rec_color = values['recommendation']
             
-            ax4.text(0.1, 0.35, f"Recommendation: {recommendation}", 
+            artists['rec_text'] = ax4.text(0.1, 0.35, texts['rec_text'], 
                     fontsize=14, fontweight='bold', transform=ax4.transAxes, color=rec_color)
         
         # Footer with summary
@@ -711,17 +728,221 @@ class MultiSportDashboard:
         self.fig.text(0.02, 0.02, footer_text, fontsize=10, color='white', transform=self.fig.transFigure)
         
         # Additional stats
-        stats_text = f"Mean: {quantitative:.2f} | Std Dev: {std_dev:.2f} | Hit Rate: {((np.array(sorted_values) >= projection).sum() / len(sorted_values) * 100):.1f}%"
-        self.fig.text(0.02, 0.04, stats_text, fontsize=10, color='white', transform=self.fig.transFigure)
+        artists['stats_text'] = self.fig.text(0.02, 0.04, texts['stats_text'], fontsize=10, color='white',
+                                              transform=self.fig.transFigure)
+        artists['conf_text'] = self.fig.text(0.02, 0.06, texts['conf_text'], fontsize=10, color='white',
+                                             transform=self.fig.transFigure)
         
-        conf_text = f"Confidence Interval: [{conf_interval[0]:.2f}, {conf_interval[1]:.2f}] | CDF at Projection: {cdf:.4f}"
-        self.fig.text(0.02, 0.06, conf_text, fontsize=10, color='white', transform=self.fig.transFigure)
+        # Everything that follows the projection is drawn over the cached background by _on_draw
+        self.projection_artists = artists
+        for artist in self._animated_artists():
+            artist.set_animated(True)
+        self.set_projection_range(projection)
         
         self.fig.tight_layout()
         self.canvas.draw()
         
+        # A 'best' legend searches the plot for a free spot on every draw; keep it where it landed
+        for name in ('performance_legend', 'distribution_legend'):
+            legend = artists[name]
+            legend.set_loc(tuple(legend.axes.transAxes.inverted().transform(legend.get_window_extent().p0)))
+    
+    def create_comparison(self, rows, defense_analyses, sport, statistic, method, probability_engine):
+        """Small-multiples grid of the compared players, drawn once"""
+        # The live projection follows a single player's dashboard
+        self.dashboard_values = None
+        self.projection_artists = {}
+        self.projection_scale.config(state='disabled')
+        self.projection_spinbox.config(state='disabled')
+        
+        self.fig.clear()
+        self.fig.patch.set_facecolor('#1a1a1a')
+        
+        columns = int(np.ceil(np.sqrt(len(rows))))
+        grid_rows = int(np.ceil(len(rows) / columns))
+        # One value axis, so the players' games are directly comparable
+        axes = self.fig.subplots(grid_rows, columns, sharey=True, squeeze=False)
+        
+        for ax, row, defense_analysis in zip(axes.flat, rows, defense_analyses):
+            ax.set_facecolor('#1a1a1a')
+            if row['error']:
+                ax.text(0.5, 0.5, f"{row['player']}\n{row['error']}", fontsize=10, color='gray', ha='center',
+                        va='center', wrap=True, transform=ax.transAxes)
+                ax.axis('off')
+                continue
+            
+            x_values = list(range(len(row['values'])))
+            # Color-coded bars (green for hits, red for misses)
+            ax.bar(x_values, row['values'], width=0.6, alpha=0.8,
+                   color=['green' if value >= row['line'] else 'red' for value in row['values']])
+            ax.axhline(y=row['projection'], color='purple', linestyle='solid', linewidth=1.5)
+            ax.axhline(y=row['line'], color='yellow', linestyle='dotted', linewidth=2)
+            ax.set_xticks(x_values)
+            ax.set_xticklabels([date.strftime('%m/%d') for date in row['dates']], rotation=45, ha='right', fontsize=7)
+            ax.set_title(f"{row['player']} - {statistic} {row['line']:g}", fontsize=10, fontweight='bold')
+            ax.grid(True, alpha=0.3)
+            
+            summary = (f"{method}: {row['projection']:.2f} | Hit: {row['hit_probability']:.1f}% | "
+                       f"Rate: {row['hit_rate']:.0f}%")
+            if defense_analysis:
+                summary += (f"\nvs {defense_analysis['opponent']} "
+                            f"(#{defense_analysis['rank']} of {defense_analysis['total_teams']} {statistic} defenses)")
+            ax.text(0.02, 0.98, summary, fontsize=8, color='white', va='top', transform=ax.transAxes)
+            ax.text(0.98, 0.02, row['recommendation'], fontsize=9, fontweight='bold', ha='right',
+                    color=RECOMMENDATION_COLORS[row['recommendation']], transform=ax.transAxes)
+        
+        for ax in axes.flat[len(rows):]:
+            ax.axis('off')
+        
+        self.fig.suptitle(f"{sport} {statistic} Comparison ({method}, {probability_engine} hit probability)",
+                          fontsize=13, fontweight='bold', color='white')
+        self.fig.tight_layout()
+        self.canvas.draw()
+    
+    def projection_texts(self, values):
+        """Text of every label that depends on the projection"""
+        projection, cdf, conf_interval = values['projection'], values['cdf'], values['conf_interval']
+        return {
+            'projection_label': f"Projection: {projection:.2f}",
+            'distribution_label': f"Projection: {projection:.2f}",
+            'cdf_label': f"CDF at Projection: {cdf:.4f}",
+            'hit_text': f"Hit Probability ({values['engine']}): {values['hit_probability']:.1f}%",
+            'rec_text': f"Recommendation: {values['recommendation'][0]}",
+            'stats_text': f"Mean: {values['quantitative']:.2f} | Std Dev: {values['std_dev']:.2f} | "
+                          f"Hit Rate: {values['hit_rate']:.1f}%",
+            'conf_text': f"Confidence Interval: [{conf_interval[0]:.2f}, {conf_interval[1]:.2f}] | "
+                         f"CDF at Projection: {cdf:.4f}",
+        }
+    
+    def shade_histogram(self, patches, edges, projection):
+        """Grey out the simulated outcomes at or below the projection"""
+        for patch, left_edge in zip(patches, edges[:-1]):
+            patch.set_facecolor('gray' if left_edge + 0.5 <= projection else 'blue')
+    
+    def _animated_artists(self):
+        """The projection artists in drawing order"""
+        artists = self.projection_artists
+        if not artists:
+            return []
+        drawn = list(artists['bars'])
+        if 'histogram' in artists:
+            drawn.extend(artists['histogram'][0])
+        elif 'cdf_fill' in artists:
+            drawn.append(artists['cdf_fill'])
+        drawn.extend(artists[name] for name in ('projection_line', 'distribution_line', 'cdf_label', 'hit_text',
+                                                'rec_text', 'stats_text', 'conf_text', 'performance_legend',
+                                                'distribution_legend') if name in artists)
+        return drawn
+    
+    def _on_draw(self, event):
+        """After a full redraw, keep the background and draw the projection artists over it"""
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self._animated_artists():
+            self.fig.draw_artist(artist)
+    
+    def update_projection(self, projection):
+        """
+        Move the projection on the loaded dashboard without re-scraping or re-rendering: only the
+        projection-dependent values are recomputed and only their artists are redrawn (blitted).
+        Returns False when there is no dashboard or the projection did not change.
+        """
+        values = self.dashboard_values
+        artists = self.projection_artists
+        if values is None or not artists or not values.set('projection', float(projection)):
+            return False
+        projection = values['projection']
+        texts = self.projection_texts(values)
+        
+        for bar, color in zip(artists['bars'], values['bar_colors']):
+            bar.set_color(color)
+        artists['projection_line'].set_ydata([projection, projection])
+        artists['distribution_line'].set_xdata([projection, projection])
+        if 'histogram' in artists:
+            self.shade_histogram(*artists['histogram'], projection)
+        elif 'cdf_fill' in artists:
+            # The shaded area is a new polygon; replacing it is cheaper than a full redraw
+            ax3 = artists['cdf_fill'].axes
+            artists['cdf_fill'].remove()
+            x_values_pdf, pdf_values = values['pdf_curve']
+            artists['cdf_fill'] = ax3.fill_between(x_values_pdf, pdf_values, where=(x_values_pdf <= projection),
+                                                   color='gray', alpha=0.5, animated=True)
+        artists['cdf_label'].set_x(projection)
+        for name in ('projection_label', 'distribution_label', 'cdf_label', 'hit_text', 'rec_text', 'stats_text',
+                     'conf_text'):
+            if name in artists:
+                artists[name].set_text(texts[name])
+        if 'rec_text' in artists:
+            artists['rec_text'].set_color(values['recommendation'][1])
+        
+        if self._background is None:
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self._background)
+            for artist in self._animated_artists():
+                self.fig.draw_artist(artist)
+            self.canvas.blit(self.fig.bbox)
+        return True
+    
+    def set_projection_range(self, projection):
+        """Fit the live projection controls to the loaded game values and show the projection"""
+        game_values = self.dashboard_values['values']
+        low = min(0.0, float(game_values.min()) if len(game_values) else 0.0, projection)
+        high = max(float(game_values.max()) if len(game_values) else 0.0, projection)
+        high = float(np.ceil(high * 1.5)) or 10.0
+        self.projection_scale.config(from_=low, to=high, state='normal')
+        self.projection_spinbox.config(from_=low, to=high, state='normal')
+        self.live_projection_var.set(f"{projection:g}")
+        self.projection_scale.set(projection)
+    
+    def on_projection_scale(self, value):
+        """Slider moved"""
+        values = self.dashboard_values
+        # The slider snaps a typed projection to its step; that is not a new projection
+        if values is None or abs(float(value) - values['projection']) < PROJECTION_STEP / 2:
+            return
+        self.set_live_projection(float(value))
+    
+    def on_projection_spinbox(self, event=None):
+        """Spinbox stepped or a projection typed into it"""
+        try:
+            projection = float(self.live_projection_var.get())
+        except ValueError:
+            self.status_var.set("ERROR: Please enter a valid projection number")
+            return
+        self.set_live_projection(projection)
+    
+    def set_live_projection(self, projection):
+        """Apply a projection from the live controls and keep the other projection inputs in step"""
+        if not self.update_projection(projection):
+            return
+        values = self.dashboard_values
+        if float(self.projection_scale.cget('from')) <= projection <= float(self.projection_scale.cget('to')):
+            # Keep the range while the slider is dragged; re-ranging would move it out from under the cursor
+            self.live_projection_var.set(f"{projection:g}")
+            self.projection_scale.set(projection)
+        else:
+            # Only a typed projection past either end widens the range
+            self.set_projection_range(projection)
+        self.projection_entry.delete(0, tk.END)
+        self.projection_entry.insert(0, f"{projection:g}")
+        self.status_var.set(f"Projection {projection:g}: hit probability {values['hit_probability']:.1f}% "
+                            f"({values['recommendation'][0]})")
+        
+    def update_refresh_status(self):
+        """Show when the scheduler last refreshed anything and whether a job is failing"""
+        status = self.refresh_scheduler.status()
+        failing = [name for name, entry in status.items() if entry['error']]
+        text = f"Last refresh: {format_time(self.refresh_scheduler.last_refresh())}"
+        if failing:
+            text += f" ({len(failing)} failing: {', '.join(failing[:3])})"
+        self.refresh_var.set(text)
+        self.root.after(REFRESH_STATUS_INTERVAL, self.update_refresh_status)
+        
     def run(self):
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.refresh_scheduler.stop()
 
 if __name__ == "__main__":
     app = MultiSportDashboard()
@@ -2,6 +2,7 @@
 Data scraping modules for fetching sports statistics.
 """
 
-from .datascrapper import geturl, scrape_statmuse
+from .datascrapper import fetch_table_result, geturl, scrape_statmuse, scrape_statmuse_result
+from .scrape_result import ScrapeError, ScrapeResult
 from .teamstatscraper import *
-from .team_defense_scraper import get_defense_analysis, get_team_defense_rankings
+from .team_defense_scraper import get_defense_analysis, get_team_defense_rankings, team_defense_rankings_result
@@ -1,11 +1,24 @@
+import codecs
+import heapq
+import os
+import time
 import requests
 from bs4 import BeautifulSoup
-from datetime import datetime
+from collections import deque
+from datetime import date
+from html.parser import HTMLParser
+from singleflight import SingleFlight
+from http_cache import REQUEST_TIMEOUT, RevalidatingTableCache
+from request_budget import default_budget
+from scrape_result import NETWORK, NO_DATA, ScrapeResult
+
+# Can be pointed at a local fixture backend for testing and load tests
+STATMUSE_BASE_URL = os.environ.get('STATMUSE_BASE_URL', 'https://www.statmuse.com').rstrip('/')
 
 
 def geturl(league: str, player_name: str, team: str, time_duration: str):
     """Get the URL for StatMuse"""
-    return f"https://www.statmuse.com/{league}/ask/{player_name}-vs-{team}-{time_duration}"
+    return f"{STATMUSE_BASE_URL}/{league}/ask/{player_name}-vs-{team}-{time_duration}"
 
 # something important for the get_url
 # we can leave the team blank if we want the 7 games of any game they played
@@ -13,40 +26,235 @@ def geturl(league: str, player_name: str, team: str, time_duration: str):
 # I am thinking the last 6 games of the player and the last 5 games against that team
 # "last-5-regular-season-games', "last-5-playoff-games', "playoff-game-log", "combined" the number can alawys be changed
 
-def scrape_statmuse(url):
-    """
-    Scrapes data from a StatMuse page and returns it as a nested list.
-    """
-    if "combined" in url:
-        data1 = scrape_statmuse(url[:-8] + "last-5-regular-season-games")
-        data2 = scrape_statmuse(slice_after_vs(url) + "last-6-games")
-        return sort_combined_data(data1 + data2)
+# Concurrent requests for the same page (dashboard, prefetch, batch jobs) share one fetch
+_table_flight = SingleFlight()
 
-    response = requests.get(url)
-    soup = BeautifulSoup(response.content, 'html.parser')
+
+def _parse_table(content):
+    """Parse the first table of a StatMuse page into cell text"""
+    soup = BeautifulSoup(content, 'html.parser')
 
     # Find the table
     table = soup.find('table')
     if not table:
-        print("No table found on the page.")
-        return []
+        return None
 
-    # Extract headers
     headers = [header.get_text(strip=True) for header in table.find_all('th')]
+    rows = [[cell.get_text(strip=True) for cell in row.find_all('td')] for row in table.find_all('tr')[1:]]
+    return headers, rows
 
-    # Extract rows
-    rows = table.find_all('tr')
-    data = [headers]
 
-    for row in rows[1:]:
-        cells = row.find_all('td')
-        row_data = [cell.get_text(strip=True) for cell in cells]
+def _fetch_table(url):
+    """Download a StatMuse page and parse its first table into cell text"""
+    default_budget.acquire(url)
+    response = requests.get(url, timeout=REQUEST_TIMEOUT)
+    # An error page has no table either; it must not pass for a page without data
+    response.raise_for_status()
+    return _parse_table(response.content)
+
+
+# Season-to-date team tables change at most once per game day, so they are
+# revalidated with conditional requests instead of downloaded on every call
+team_table_cache = RevalidatingTableCache(_parse_table)
+
+
+def is_team_table(url):
+    """True for the league-wide team pages used by the defense rankings"""
+    return 'teams-that-give-up' in url or 'teams-who-give-up' in url
+
+
+def fetch_table_result(url):
+    """
+    Fetch the first table on a StatMuse page as a ScrapeResult whose data is
+    (headers, rows); a page without a table is a NO_DATA failure. Concurrent
+    callers for the same URL wait on a single in-flight fetch and each
+    receive their own copy of the parsed table.
+    """
+    start = time.perf_counter()
+    source = NETWORK
+    try:
+        if is_team_table(url):
+            table, source = team_table_cache.lookup(url)
+        else:
+            table = _table_flight.do(url, _fetch_table, url)
+    except Exception as e:
+        return ScrapeResult.from_exception(e, url, source, time.perf_counter() - start)
+
+    latency = time.perf_counter() - start
+    if table is None:
+        return ScrapeResult.no_data("No table found on the page", url, source, latency)
+    headers, rows = table
+    return ScrapeResult((list(headers), [list(row) for row in rows]), source, latency, url=url)
+
+
+def fetch_table(url):
+    """
+    Fetch the first table on a StatMuse page as (headers, rows), or None if the
+    page has no table; a failed request raises ScrapeError
+    """
+    return fetch_table_result(url).unwrap()
+
+
+def revalidate_table(url):
+    """
+    fetch_table for scheduled refreshes: a cached team table is revalidated
+    with a conditional request first instead of being served from memory
+    """
+    if is_team_table(url):
+        team_table_cache.refresh(url)
+    return fetch_table(url)
+
+
+class _StreamingTableParser(HTMLParser):
+    """
+    Incremental parser for the first table on a page. Completed rows are queued
+    on `rows` as soon as their closing tag is seen; the first row is the header
+    (its <th> cells), every later row is its <td> cells, like _fetch_table.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.rows = deque()
+        self.finished = False
+        self._in_table = False
+        self._seen_header = False
+        self._row = None
+        self._cell = None
+        self._text = []
+
+    def _flush_text(self):
+        # Same as get_text(strip=True): strip every text node and join them.
+        # A text node can arrive in several pieces when it spans two chunks.
+        text = ''.join(self._text).strip()
+        self._text = []
+        if text and self._cell is not None:
+            self._cell.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if self.finished:
+            return
+        self._flush_text()
+        if tag == 'table':
+            self._in_table = True
+        elif not self._in_table:
+            return
+        elif tag == 'tr':
+            self._row = []
+        elif tag in ('th', 'td') and self._row is not None:
+            # Header row keeps its <th> cells, body rows their <td> cells
+            self._cell = [] if (tag == 'th') != self._seen_header else None
+
+    def handle_endtag(self, tag):
+        if self.finished or not self._in_table:
+            return
+        self._flush_text()
+        if tag in ('th', 'td') and self._cell is not None:
+            self._row.append(''.join(self._cell))
+            self._cell = None
+        elif tag == 'tr' and self._row is not None:
+            self.rows.append(self._row)
+            self._seen_header = True
+            self._row = None
+        elif tag == 'table':
+            self.finished = True
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._text.append(data)
+
+
+def stream_table(url, chunk_size=16384):
+    """
+    Stream the first table on a StatMuse page: yields the header row, then each
+    row as soon as it has been downloaded and parsed. The page is never held in
+    memory in full, so peak memory stays flat for long game logs. Yields nothing
+    if the page has no table.
+    """
+    default_budget.acquire(url)
+    with requests.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+        response.raise_for_status()
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        parser = _StreamingTableParser()
+        for chunk in response.iter_content(chunk_size):
+            parser.feed(decoder.decode(chunk))
+            while parser.rows:
+                yield parser.rows.popleft()
+            if parser.finished:
+                return
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+        while parser.rows:
+            yield parser.rows.popleft()
+
+
+def stream_statmuse(url):
+    """
+    Generator version of scrape_statmuse: yields the header and then the game
+    rows one at a time, with the same filtering. Feed it straight into the
+    iter_clean_* cleaners to process a log row by row.
+    """
+    if "combined" in url:
+        # The two windows have to be merged and sorted, so they are fetched whole
+        yield from scrape_statmuse(url)
+        return
+
+    rows = stream_table(url)
+    headers = next(rows, None)
+    if headers is None:
+        print("No table found on the page.")
+        return
+
+    yield headers
+    for row_data in rows:
+        # Skip empty rows and totals
+        if any(cell.strip() for cell in row_data) and 'Total' not in row_data:
+            yield row_data
+
+
+def scrape_statmuse_result(url):
+    """
+    scrape_statmuse as a ScrapeResult: data is the [header, rows...] log on
+    success, and a page without a table is a NO_DATA failure instead of []
+    """
+    if "combined" in url:
+        start = time.perf_counter()
+        parts = [scrape_statmuse_result(url[:-8] + "last-5-regular-season-games"),
+                 scrape_statmuse_result(slice_after_vs(url) + "last-6-games")]
+        failed = [part for part in parts if not part.ok and part.error_kind != NO_DATA]
+        if failed:
+            return failed[0]
+        data = merge_game_logs(*(part.data for part in parts if part.ok))
+        latency = time.perf_counter() - start
+        if not data:
+            return ScrapeResult.no_data("No table found on the page", url, latency=latency)
+        source = NETWORK if any(part.source == NETWORK for part in parts) else parts[0].source
+        return ScrapeResult(data, source, latency, url=url)
+
+    result = fetch_table_result(url)
+    if not result.ok:
+        return result
+
+    headers, rows = result.data
+    data = [headers]
 
+    for row_data in rows:
         # Skip empty rows and totals
         if any(cell.strip() for cell in row_data) and 'Total' not in row_data:
             data.append(row_data)
 
-    return data
+    return ScrapeResult(data, result.source, result.latency, url=url)
+
+
+def scrape_statmuse(url):
+    """
+    Scrapes data from a StatMuse page and returns it as a nested list, [] when
+    the page has no table. A failed request raises ScrapeError rather than
+    returning [], so callers do not cache a timeout as an empty log.
+    """
+    result = scrape_statmuse_result(url)
+    if result.error_kind == NO_DATA:
+        print("No table found on the page.")
+    return result.unwrap(empty=[])
 
 
 def slice_after_vs(url):
@@ -57,29 +265,73 @@ def slice_after_vs(url):
     return url
 
 
-def sort_combined_data(nested_list):
-    # Find the index of the "DATE" column
-    header = nested_list[0]
-    date_index = header.index("DATE")
+def _date_ordinal(value):
+    """Parse a StatMuse 'M/D/YYYY' date into a day ordinal, or None if it is not a date"""
+    try:
+        month, day, year = value.split('/')
+        return date(int(year), int(month), int(day)).toordinal()
+    except (ValueError, AttributeError):
+        return None
 
-    # Function to parse the date from each row
-    def get_date(row):
-        try:
-            return datetime.strptime(row[date_index], '%m/%d/%Y')
-        except ValueError:
-            return datetime.min  # Return the smallest date for non-date rows (headers or averages)
 
-    # Separate the header and filter out rows with "Average" and duplicate headers
-    header = nested_list[0]
-    data = [row for row in nested_list[1:] if row[date_index] and "Average" not in row and row != header]
+def _dated_games(log, date_index):
+    """(ordinal, row) for every game row of one log, oldest first"""
+    header = log[0]
+    games = []
+    for row in log[1:]:
+        if not row[date_index] or "Average" in row or row == header:
+            continue
+        ordinal = _date_ordinal(row[date_index])
+        # Non-date rows sort first, as datetime.min did before
+        games.append((ordinal if ordinal is not None else 0, row))
 
-    # Sort the data by date
-    sorted_data = sorted(data, key=get_date)
+    # StatMuse lists games most recent first; anything else gets one sort
+    if games and games[0][0] > games[-1][0]:
+        games.reverse()
+    if any(games[i][0] > games[i + 1][0] for i in range(len(games) - 1)):
+        games.sort(key=lambda game: game[0])
+    return games
 
-    # Reconstruct the nested list with the header and sorted data
-    sorted_nested_list = [header] + sorted_data
 
-    return sorted_nested_list
+def merge_game_logs(*logs):
+    """
+    Merge game logs for the same player (each [header, rows...]) into one log
+    sorted oldest first. Dates are parsed once, the already ordered logs are
+    merged in linear time, and a game that appears in more than one log (for
+    example in both the vs-team and the last-6 windows) is kept once.
+    """
+    logs = [log for log in logs if log]
+    if not logs:
+        return []
+
+    header = logs[0][0]
+    date_index = header.index("DATE")
+    # The row number column has no name and differs between pages, so it is not part of a game's identity
+    named_columns = [i for i, name in enumerate(header) if name]
+
+    merged = [header]
+    seen = set()
+    for ordinal, row in heapq.merge(*(_dated_games(log, date_index) for log in logs), key=lambda game: game[0]):
+        identity = (ordinal, tuple(row[i] for i in named_columns if i < len(row)))
+        if identity in seen:
+            continue
+        seen.add(identity)
+        merged.append(row)
+    return merged
+
+
+def sort_combined_data(nested_list):
+    """Sort concatenated game logs by date; the header rows mark where each log starts"""
+    if not nested_list:
+        return []
+    header = nested_list[0]
+    logs = []
+    for row in nested_list:
+        if row == header:
+            logs.append([header])
+        else:
+            logs[-1].append(row)
+    return merge_game_logs(*logs)
 
 # Test code (commented out for production)
 # v = "https://www.statmuse.com/nba/ask/steph-curry-stats-in-last-25-regular-season-games"
@@ -0,0 +1,156 @@
+"""
+Revalidating cache for parsed StatMuse tables.
+
+Season-to-date team pages change at most once per game day, so downloading
+and parsing them on every call is wasted work. Each cached table keeps the
+response validators (ETag / Last-Modified) and a hash of the body:
+
+- fresh entries are served straight from memory
+- stale entries are served immediately while one background refresh runs
+  (stale-while-revalidate)
+- refreshes are conditional requests; a 304, or a 200 with the same body
+  hash, keeps the parsed table without parsing it again
+"""
+
+import hashlib
+import threading
+import time
+
+import requests
+
+from request_budget import PREFETCH, default_budget, request_priority
+from scrape_result import CACHE, NETWORK
+from singleflight import SingleFlight
+
+# Seconds an entry is served without revalidating
+DEFAULT_FRESH_SECONDS = 15 * 60
+# Seconds past freshness a stale entry may still be served while it refreshes
+DEFAULT_MAX_STALE_SECONDS = 24 * 60 * 60
+# Seconds to wait for StatMuse before a request fails as a timeout
+REQUEST_TIMEOUT = 15
+
+
+class _Entry:
+    def __init__(self, table, body_hash, etag, last_modified, fetched_at):
+        self.table = table
+        self.body_hash = body_hash
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+
+class RevalidatingTableCache:
+    """
+    Caches parse(body) per URL with conditional revalidation.
+    parse: function turning a response body (bytes) into the parsed table
+    """
+
+    def __init__(self, parse, fresh_seconds=DEFAULT_FRESH_SECONDS, max_stale_seconds=DEFAULT_MAX_STALE_SECONDS,
+                 clock=time.time):
+        self.parse = parse
+        self.fresh_seconds = fresh_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.clock = clock
+        self.stats = {'fresh_hits': 0, 'stale_hits': 0, 'not_modified': 0, 'unchanged_body': 0,
+                      'parsed': 0, 'refresh_errors': 0}
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._refreshing = set()
+
+    def get(self, url):
+        """Parsed table for the URL, from memory when possible"""
+        return self.lookup(url)[0]
+
+    def lookup(self, url):
+        """(table, source) for the URL; source is 'cache' when it was served from memory, else 'network'"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is not None:
+            age = self.clock() - entry.fetched_at
+            if age <= self.fresh_seconds:
+                self._count('fresh_hits')
+                return entry.table, CACHE
+            if age <= self.fresh_seconds + self.max_stale_seconds:
+                self._count('stale_hits')
+                self._refresh_in_background(url)
+                return entry.table, CACHE
+
+        # Nothing usable cached: callers wait on a single revalidation
+        return self._flight.do(url, self._revalidate, url).table, NETWORK
+
+    def refresh(self, url):
+        """Revalidate the URL now, fresh or not, and return its parsed table"""
+        return self._flight.do(url, self._revalidate, url).table
+
+    def invalidate(self, url=None):
+        """Forget one URL, or everything"""
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(url, None)
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _refresh_in_background(self, url):
+        with self._lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+
+        def refresh():
+            try:
+                # Serving the stale table already answered the caller; the refresh is background work
+                with request_priority(PREFETCH):
+                    self._flight.do(url, self._revalidate, url)
+            except Exception as e:
+                # Keep serving the stale table; the next stale hit tries again
+                self._count('refresh_errors')
+                print(f"Background refresh failed for {url}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _revalidate(self, url):
+        """Conditional GET; only parses when the body actually changed"""
+        with self._lock:
+            entry = self._entries.get(url)
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        default_budget.acquire(url)
+        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        now = self.clock()
+
+        if response.status_code == 304 and entry is not None:
+            self._count('not_modified')
+            updated = _Entry(entry.table, entry.body_hash, response.headers.get('ETag', entry.etag),
+                             response.headers.get('Last-Modified', entry.last_modified), now)
+        else:
+            response.raise_for_status()
+            body_hash = hashlib.sha256(response.content).hexdigest()
+            if entry is not None and body_hash == entry.body_hash:
+                # Server ignored the validators but sent the same page
+                self._count('unchanged_body')
+                table = entry.table
+            else:
+                self._count('parsed')
+                table = self.parse(response.content)
+            updated = _Entry(table, body_hash, response.headers.get('ETag'),
+                             response.headers.get('Last-Modified'), now)
+
+        # A page without a table is not worth keeping; ask again next time
+        if updated.table is not None:
+            with self._lock:
+                self._entries[url] = updated
+        return updated
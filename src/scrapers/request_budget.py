@@ -0,0 +1,189 @@
+"""
+Global request budget for upstream pages.
+
+Every request the scrapers make to StatMuse first takes a token from its
+host's bucket. Tokens refill at a steady rate up to a burst size, and
+callers waiting for one are served by priority class:
+
+- interactive: the dashboard and API looking something up for a user
+- prefetch: warming and scheduled refreshes (DefenseEngine.warm, the
+  refresh scheduler, stale-while-revalidate refreshes)
+- backfill: season backfills
+
+Lower classes also leave `reserve` tokens in the bucket, so an interactive
+request arriving while a backfill saturates the budget finds a token
+waiting instead of queueing behind it. The class of a request comes from
+the calling context:
+
+    with request_priority(BACKFILL):
+        rows = list(stream_statmuse(url))
+
+Loopback hosts (local fixture backends) are not limited.
+"""
+
+import contextlib
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from urllib.parse import urlsplit
+
+INTERACTIVE = 'interactive'
+PREFETCH = 'prefetch'
+BACKFILL = 'backfill'
+# Waiting requests are served in this order
+PRIORITIES = (INTERACTIVE, PREFETCH, BACKFILL)
+
+# Sustained requests per second and burst size per host
+DEFAULT_RATE = 4.0
+DEFAULT_BURST = 8
+# Tokens only interactive requests may take
+DEFAULT_RESERVE = 1
+
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+_priority = contextvars.ContextVar('request_priority', default=INTERACTIVE)
+
+
+def current_priority():
+    return _priority.get()
+
+
+@contextlib.contextmanager
+def request_priority(priority):
+    """Requests made inside the block (on this thread) use the priority class"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown request priority '{priority}' (expected {', '.join(PRIORITIES)})")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def bind_priority(fn):
+    """fn wrapped to run under the caller's current priority, for handing to worker threads"""
+    priority = current_priority()
+
+    def run(*args, **kwargs):
+        with request_priority(priority):
+            return fn(*args, **kwargs)
+
+    return run
+
+
+class _Bucket:
+    def __init__(self, rate, burst, reserve, now):
+        self.rate = rate
+        self.burst = burst
+        self.reserve = min(reserve, burst - 1)
+        self.tokens = float(burst)
+        self.updated = now
+        # Waiting tickets: (priority rank, arrival number)
+        self.queue = []
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def needed(self, priority):
+        return 1 if priority == INTERACTIVE else 1 + self.reserve
+
+
+class RequestBudget:
+    """
+    Per-host token buckets shared by every thread. hosts maps a host name to
+    (rate, burst), or to None for a host that is not limited; any other host
+    gets the default rate and burst.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, reserve=DEFAULT_RESERVE, hosts=None,
+                 clock=time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError("A request budget needs a positive rate and a burst of at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve
+        self.hosts = dict(hosts or {})
+        self.clock = clock
+        self._buckets = {}
+        self._arrivals = itertools.count()
+        self._cond = threading.Condition()
+        self._stats = {priority: {'requests': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0}
+                       for priority in PRIORITIES}
+
+    def configure(self, host, rate=None, burst=None):
+        """Set a host's rate and burst; rate None leaves the host unlimited"""
+        with self._cond:
+            self.hosts[host] = None if rate is None else (rate, burst or max(1, int(rate)))
+            self._buckets.pop(host, None)
+            self._cond.notify_all()
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            limits = self.hosts.get(host, (self.rate, self.burst))
+            if limits is None:
+                return None
+            bucket = self._buckets[host] = _Bucket(limits[0], limits[1], self.reserve, self.clock())
+        return bucket
+
+    def acquire(self, url, priority=None):
+        """
+        Wait for a token of the URL's host; returns the seconds waited.
+        priority defaults to the calling context's request_priority.
+        """
+        priority = priority or current_priority()
+        rank = PRIORITIES.index(priority)
+        host = (urlsplit(url).hostname or '').lower()
+        start = self.clock()
+        with self._cond:
+            bucket = self._bucket(host) if host not in LOOPBACK_HOSTS else None
+            if bucket is not None:
+                ticket = (rank, next(self._arrivals))
+                heapq.heappush(bucket.queue, ticket)
+                try:
+                    while True:
+                        bucket.refill(self.clock())
+                        needed = bucket.needed(priority)
+                        if bucket.queue[0] == ticket:
+                            if bucket.tokens >= needed:
+                                break
+                            # The head of the queue sleeps until its token has accumulated
+                            self._cond.wait((needed - bucket.tokens) / bucket.rate)
+                        else:
+                            self._cond.wait()
+                        if self._buckets.get(host) is not bucket:
+                            # The host was reconfigured while waiting
+                            return self.acquire(url, priority)
+                    heapq.heappop(bucket.queue)
+                    bucket.tokens -= 1
+                finally:
+                    if ticket in bucket.queue:
+                        bucket.queue.remove(ticket)
+                        heapq.heapify(bucket.queue)
+                    # Let the next ticket in line check the bucket
+                    self._cond.notify_all()
+
+            waited = self.clock() - start
+            stats = self._stats[priority]
+            stats['requests'] += 1
+            stats['wait_seconds'] += waited
+            stats['max_wait_seconds'] = max(stats['max_wait_seconds'], waited)
+        return waited
+
+    def queued(self, host=None):
+        """Requests waiting for a token, for one host or all of them"""
+        with self._cond:
+            buckets = [self._buckets.get(host)] if host else list(self._buckets.values())
+            return sum(len(bucket.queue) for bucket in buckets if bucket is not None)
+
+    def stats(self):
+        """{priority: {'requests', 'wait_seconds', 'max_wait_seconds'}}"""
+        with self._cond:
+            return {priority: dict(stats) for priority, stats in self._stats.items()}
+
+
+# The budget every scraper request goes through
+default_budget = RequestBudget()
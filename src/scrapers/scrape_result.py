@@ -0,0 +1,121 @@
+"""
+Typed outcomes of StatMuse fetches.
+
+The scrapers print a failure and return [] whether the page had no table or
+the request timed out, so callers cannot tell "no data" from "try again
+later" and end up caching the failure. A ScrapeResult carries the data
+together with where it came from (cache or network) and how long it took,
+or the kind of failure:
+
+    result = scrape_statmuse_result(url)
+    if result.ok:
+        log = result.data
+    elif result.transient:
+        ...  # back off and retry; result.retry_after is set for HTTP 429
+
+unwrap() turns a result back into data for code that wants exceptions:
+failures raise ScrapeError, and a page without data returns an empty value.
+"""
+
+import requests
+
+# Where the data came from
+CACHE = 'cache'
+NETWORK = 'network'
+
+# Kinds of failure
+NO_DATA = 'no_data'            # the page answered but had no table or rows
+TIMEOUT = 'timeout'
+CONNECTION = 'connection'
+RATE_LIMITED = 'rate_limited'  # HTTP 429
+HTTP_ERROR = 'http_error'      # any other 4xx/5xx status
+PARSE_ERROR = 'parse_error'    # the response could not be turned into data
+ERROR_KINDS = (NO_DATA, TIMEOUT, CONNECTION, RATE_LIMITED, HTTP_ERROR, PARSE_ERROR)
+
+
+class ScrapeError(Exception):
+    """A failed ScrapeResult raised by unwrap()"""
+
+    def __init__(self, result):
+        super().__init__(f"{result.error_kind}: {result.error}")
+        self.result = result
+
+
+class ScrapeResult:
+    """
+    data: the parsed value, None for a failure
+    source: CACHE or NETWORK
+    latency: seconds spent getting the result
+    error_kind: one of ERROR_KINDS, None on success
+    status: HTTP status of a failed response, when there was one
+    retry_after: seconds the server asked to wait before retrying (HTTP 429)
+    """
+
+    def __init__(self, data=None, source=NETWORK, latency=0.0, error_kind=None, error=None, url=None, status=None,
+                 retry_after=None):
+        if error_kind is not None and error_kind not in ERROR_KINDS:
+            raise ValueError(f"Unknown scrape error kind '{error_kind}'")
+        self.data = data
+        self.source = source
+        self.latency = latency
+        self.error_kind = error_kind
+        self.error = error
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def ok(self):
+        return self.error_kind is None
+
+    @property
+    def transient(self):
+        """True for failures that may succeed later: timeouts, connection errors, 429s and 5xx responses"""
+        if self.error_kind == HTTP_ERROR:
+            return self.status is not None and self.status >= 500
+        return self.error_kind in (TIMEOUT, CONNECTION, RATE_LIMITED)
+
+    @classmethod
+    def no_data(cls, message, url=None, source=NETWORK, latency=0.0):
+        return cls(None, source, latency, NO_DATA, message, url)
+
+    @classmethod
+    def from_exception(cls, exc, url=None, source=NETWORK, latency=0.0):
+        """The failure an exception raised while fetching or parsing stands for"""
+        if isinstance(exc, ScrapeError):
+            return exc.result
+        status = retry_after = None
+        if isinstance(exc, requests.Timeout):
+            kind = TIMEOUT
+        elif isinstance(exc, requests.ConnectionError):
+            kind = CONNECTION
+        elif isinstance(exc, requests.HTTPError):
+            response = exc.response
+            status = response.status_code if response is not None else None
+            kind = RATE_LIMITED if status == 429 else HTTP_ERROR
+            if kind == RATE_LIMITED:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        else:
+            kind = PARSE_ERROR
+        return cls(None, source, latency, kind, str(exc) or type(exc).__name__, url, status, retry_after)
+
+    def unwrap(self, empty=None):
+        """data on success, `empty` when the page had no data; raises ScrapeError for any other failure"""
+        if self.ok:
+            return self.data
+        if self.error_kind == NO_DATA:
+            return empty
+        raise ScrapeError(self)
+
+    def __repr__(self):
+        if self.ok:
+            return f"ScrapeResult(ok, source={self.source}, latency={self.latency:.3f}s)"
+        return f"ScrapeResult({self.error_kind}: {self.error})"
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header given in seconds; None for a missing or HTTP-date value"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Season Backfill
+===============
+
+Backfills full regular-season game logs for every player in a league. The
+player list comes from StatMuse's games-played leaderboard (or a file),
+each player's log is streamed through stream_statmuse and cleaned row by
+row with the sport's cleaner, and the cleaned log is written to a local
+store. Fetches run on a bounded worker pool behind a rate limiter, at the
+backfill priority of the global request budget.
+
+After every player the store's checkpoint is updated, so an interrupted run
+picks up where it stopped; players that failed are retried on the next run.
+
+Usage:
+    python src/scrapers/season_backfill.py NBA --store data/backfill --workers 4 --rate 2
+"""
+
+import argparse
+import contextlib
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+
+try:
+    from .datascrapper import STATMUSE_BASE_URL, fetch_table, geturl, stream_statmuse
+    from .request_budget import BACKFILL, request_priority
+    from .window_planner import window_duration
+    from ..core.player_logs import PLAYER_CLEANERS, detect_position, iter_clean_player_log
+    from ..core.game_log import GameLog, date_ordinal
+except ImportError:
+    src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    for subdir in ('scrapers', 'core'):
+        path = os.path.join(src_dir, subdir)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    from datascrapper import STATMUSE_BASE_URL, fetch_table, geturl, stream_statmuse
+    from request_budget import BACKFILL, request_priority
+    from window_planner import window_duration
+    from player_logs import PLAYER_CLEANERS, detect_position, iter_clean_player_log
+    from game_log import GameLog, date_ordinal
+
+# Regular-season games per team, the window asked for when backfilling a full log
+SEASON_GAMES = {'NBA': 82, 'WNBA': 44, 'NHL': 82, 'MLB': 162}
+# (month, day) each league's season year starts on; NBA and NHL seasons run across the new year
+SEASON_START = {'NBA': (7, 1), 'WNBA': (1, 1), 'NHL': (7, 1), 'MLB': (1, 1)}
+
+
+def player_list_url(league):
+    return f"{STATMUSE_BASE_URL}/{league.lower()}/ask/{league.lower()}-players-with-the-most-games-played-this-season"
+
+
+def season_start(league, day):
+    """First day of the league's season year that contains the day"""
+    month, first = SEASON_START[league]
+    start = date(day.year, month, first)
+    return start if start <= day else date(day.year - 1, month, first)
+
+
+def clean_player_name(name):
+    """'Stephen CurryS. Curry' -> 'Stephen Curry' (StatMuse prints the full and short name together)"""
+    match = re.match(r'^(.+?)([A-Z]\.\s?(.+))$', name.strip())
+    if match and match.group(1).endswith(match.group(3)):
+        return match.group(1).strip()
+    return name.strip()
+
+
+def fetch_player_list(league):
+    """Player names from the league's games-played leaderboard"""
+    table = fetch_table(player_list_url(league))
+    if not table:
+        return []
+    headers, rows = table
+    if 'NAME' not in headers:
+        return []
+    name_index = headers.index('NAME')
+    names = [clean_player_name(row[name_index]) for row in rows if len(row) > name_index and row[name_index]]
+    return list(dict.fromkeys(names))
+
+
+def player_slug(player):
+    return re.sub(r'[^a-z0-9]+', '-', player.lower()).strip('-')
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads"""
+
+    def __init__(self, rate, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = self.clock()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            self.sleep(slot - now)
+
+
+def log_digest(rows):
+    """Hash of a log's rows as they are written to the store"""
+    text = io.StringIO()
+    csv.writer(text).writerows(rows)
+    return hashlib.sha256(text.getvalue().encode('utf-8')).hexdigest()
+
+
+class BackfillStore:
+    """
+    Cleaned logs as one CSV per player under root/<league>/, with a
+    checkpoint.json recording which players are done and which failed
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _league_dir(self, league):
+        path = os.path.join(self.root, league.lower())
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _checkpoint_path(self, league):
+        return os.path.join(self._league_dir(league), 'checkpoint.json')
+
+    def checkpoint(self, league):
+        """{'completed': {player: {'rows', 'position', 'file'}}, 'failed': {player: error}}"""
+        path = self._checkpoint_path(league)
+        if not os.path.exists(path):
+            return {'completed': {}, 'failed': {}}
+        with open(path, 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+
+    def _write_atomic(self, path, write):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as fh:
+            write(fh)
+        os.replace(tmp_path, path)
+
+    def save_log(self, league, player, position, rows):
+        """Write a cleaned log and mark the player completed; returns the number of games"""
+        if len(rows) < 2:
+            # A completed player is never fetched again, so an empty log must stay pending
+            raise ValueError("No games to store")
+        filename = player_slug(player) + '.csv'
+        self._write_atomic(os.path.join(self._league_dir(league), filename),
+                           lambda fh: csv.writer(fh).writerows(rows))
+        self._update(league, player, completed={'rows': len(rows) - 1, 'position': position, 'file': filename,
+                                                'sha256': log_digest(rows)})
+        return len(rows) - 1
+
+    def stored_digest(self, league, player):
+        """log_digest of a stored player's log, or None"""
+        return self.checkpoint(league)['completed'].get(player, {}).get('sha256')
+
+    def save_team_defense(self, league, matrix):
+        """Write a teams x stats matrix of values allowed per game (TeamAllowedMatrix) as team_defense.csv"""
+        rows = [['TEAM'] + list(matrix.stats)]
+        rows.extend([team] + ['' if value != value else f'{value:g}' for value in values]
+                    for team, values in zip(matrix.teams, matrix.values.tolist()))
+        self._write_atomic(os.path.join(self._league_dir(league), 'team_defense.csv'),
+                           lambda fh: csv.writer(fh).writerows(rows))
+
+    def load_team_defense(self, league):
+        """(teams, stats, values) of the stored team defense matrix, missing values as NaN; None if not stored"""
+        path = os.path.join(self._league_dir(league), 'team_defense.csv')
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8', newline='') as fh:
+            rows = list(csv.reader(fh))
+        values = [[float(value) if value else float('nan') for value in row[1:]] for row in rows[1:]]
+        return [row[0] for row in rows[1:]], rows[0][1:], values
+
+    def mark_failed(self, league, player, error):
+        self._update(league, player, failed=str(error))
+
+    def _update(self, league, player, completed=None, failed=None):
+        with self._lock:
+            checkpoint = self.checkpoint(league)
+            if completed is not None:
+                checkpoint['completed'][player] = completed
+                checkpoint['failed'].pop(player, None)
+            else:
+                checkpoint['failed'][player] = failed
+            self._write_atomic(self._checkpoint_path(league), lambda fh: json.dump(checkpoint, fh, indent=1))
+
+    def load_log(self, league, player):
+        """A stored player's cleaned log as a GameLog, or None"""
+        entry = self.checkpoint(league)['completed'].get(player)
+        if entry is None:
+            return None
+        with open(os.path.join(self._league_dir(league), entry['file']), 'r', encoding='utf-8', newline='') as fh:
+            return GameLog.from_rows(list(csv.reader(fh)))
+
+    def load_league(self, league, position=None):
+        """Every stored log for the league (and position) in one GameLog"""
+        completed = self.checkpoint(league)['completed']
+        players = [player for player, entry in completed.items()
+                   if entry['rows'] and (position is None or entry['position'] == position)]
+        return GameLog.concat([self.load_log(league, player) for player in players])
+
+
+def format_eta(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m" if seconds >= 3600 else f"{seconds // 60}m{seconds % 60:02d}s"
+
+
+class SeasonBackfill:
+    """
+    Fetches, cleans and stores full-season logs for a league's players.
+    fetch_rows: url -> iterable of raw rows (header first), stream_statmuse by default
+    """
+
+    def __init__(self, league, store, max_workers=4, rate=2.0, fetch_rows=None, report=print, clock=time.time):
+        self.league = league.upper()
+        if self.league not in PLAYER_CLEANERS:
+            raise ValueError(f"No player data pipeline for {self.league}")
+        self.store = store
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(rate)
+        self.fetch_rows = fetch_rows or stream_statmuse
+        self.report = report
+        self.clock = clock
+
+    def season_url(self, player):
+        games = SEASON_GAMES[self.league]
+        return geturl(self.league.lower(), player, 'Any', window_duration('regular-season', games))
+
+    def backfill_player(self, player):
+        """Stream, clean and store one player's season; returns the number of games stored"""
+        position, cleaned = self.fetch_season(player)
+        return self.store.save_log(self.league, player, position, cleaned)
+
+    def refresh_player(self, player):
+        """Refetch a player's season and rewrite it only when it changed; returns True when it did"""
+        position, cleaned = self.fetch_season(player)
+        if self.store.stored_digest(self.league, player) == log_digest(cleaned):
+            return False
+        self.store.save_log(self.league, player, position, cleaned)
+        return True
+
+    def fetch_season(self, player):
+        """
+        (position, cleaned log) of a player's latest season, streamed behind
+        the rate limiter at backfill priority so interactive lookups go first.
+        The last-N-games window reaches back into the previous season early in
+        a season (or for a player who missed games), so games before the season
+        of the newest one are dropped.
+        """
+        self.limiter.acquire()
+        with request_priority(BACKFILL):
+            rows = iter(self.fetch_rows(self.season_url(player)))
+            header = next(rows, None)
+            if header is None:
+                raise ValueError("No game log found")
+            position = detect_position(self.league, header)
+
+            def raw():
+                yield header
+                yield from rows
+
+            cleaned = list(iter_clean_player_log(self.league, raw(), position))
+        date_index = cleaned[0].index('DATE')
+        dated = [(date_ordinal(row[date_index]), row) for row in cleaned[1:]]
+        newest = max((ordinal for ordinal, row in dated), default=0)
+        if not newest:
+            raise ValueError("No games found")
+        first_day = season_start(self.league, date.fromordinal(newest)).toordinal()
+        return position, [cleaned[0]] + [row for ordinal, row in dated if ordinal >= first_day]
+
+    def run(self, players=None):
+        """Backfill every player not already completed; returns a summary dict"""
+        players = players if players is not None else fetch_player_list(self.league)
+        completed = self.store.checkpoint(self.league)['completed']
+        pending = [player for player in players if player not in completed]
+        self.report(f"{self.league}: {len(players)} players, {len(players) - len(pending)} already stored, "
+                    f"{len(pending)} to fetch with {self.max_workers} workers")
+
+        start = self.clock()
+        rows = done = failed = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.backfill_player, player): player for player in pending}
+            for future in as_completed(futures):
+                player = futures[future]
+                done += 1
+                try:
+                    games = future.result()
+                    rows += games
+                    status = f"{games} games"
+                except Exception as e:
+                    failed += 1
+                    self.store.mark_failed(self.league, player, e)
+                    status = f"failed ({e})"
+
+                elapsed = max(self.clock() - start, 1e-9)
+                eta = elapsed / done * (len(pending) - done)
+                self.report(f"[{done}/{len(pending)}] {player}: {status} | {rows / elapsed:.1f} rows/s | "
+                            f"ETA {format_eta(eta)}")
+
+        elapsed = self.clock() - start
+        return {'players': len(players), 'skipped': len(players) - len(pending), 'fetched': done - failed,
+                'failed': failed, 'rows': rows, 'seconds': elapsed,
+                'rows_per_second': rows / elapsed if elapsed > 0 else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill full-season game logs for every player in a league")
+    parser.add_argument('league', choices=sorted(PLAYER_CLEANERS), type=str.upper)
+    parser.add_argument('--store', default=os.path.join('data', 'backfill'), help="directory of the local store")
+    parser.add_argument('--players', help="file with one player name per line instead of the league leaderboard")
+    parser.add_argument('--limit', type=int, help="only backfill the first N players")
+    parser.add_argument('-w', '--workers', type=int, default=4, help="concurrent fetches (default: 4)")
+    parser.add_argument('-r', '--rate', type=float, default=2.0, help="maximum fetches per second (default: 2)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="show scraper output while fetching")
+    args = parser.parse_args(argv)
+
+    if args.players:
+        with open(args.players, 'r', encoding='utf-8') as fh:
+            players = [line.strip() for line in fh if line.strip()]
+    else:
+        players = fetch_player_list(args.league)
+    if args.limit:
+        players = players[:args.limit]
+
+    backfill = SeasonBackfill(args.league, BackfillStore(args.store), args.workers, args.rate,
+                              report=lambda line: print(line, file=sys.__stdout__, flush=True))
+    if args.verbose:
+        summary = backfill.run(players)
+    else:
+        # The scrapers print debugging output for every page; keep the progress lines readable
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            summary = backfill.run(players)
+
+    print(f"\nStored {summary['rows']} games for {summary['fetched']} players in {summary['seconds']:.1f}s "
+          f"({summary['rows_per_second']:.1f} rows/s); {summary['skipped']} skipped, {summary['failed']} failed")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
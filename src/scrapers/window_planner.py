@@ -0,0 +1,228 @@
+"""
+Game window planner.
+
+The time durations offered by the dashboard and the batch evaluator
+("last-5-regular-season-games", "last-10-...", "playoff-game-log",
+"combined", ...) are nested slices of the same game log, so scraping each one
+separately downloads the same games again. The planner fetches the largest
+window needed for a player once and serves every smaller window, the
+vs-team subset and the combined window from it locally.
+"""
+
+import re
+import threading
+
+from datascrapper import geturl, merge_game_logs, scrape_statmuse
+from game_log import date_ordinal
+from sports_config import SPORTS_CONFIG, same_team
+from team_defense_scraper import NBA_TEAM_ABBREVS
+
+# Dashboard labels -> StatMuse time durations
+WINDOW_LABELS = {
+    'Last 5 Regular Games': 'last-5-regular-season-games',
+    'Last 7 Regular Games': 'last-7-regular-season-games',
+    'Last 10 Regular Games': 'last-10-regular-season-games',
+    'Playoff Game Log': 'playoff-game-log',
+    'Last 5 Playoff Games': 'last-5-playoff-games',
+}
+
+# Windows of the same kind are nested: a smaller one is the most recent games of a larger one
+WINDOW_PATTERNS = [
+    (re.compile(r'^last-(\d+)-regular-season-games$'), 'regular-season'),
+    (re.compile(r'^last-(\d+)-playoff-games$'), 'playoff'),
+    (re.compile(r'^last-(\d+)-games$'), 'games'),
+]
+
+# The combined window: last 5 regular season games vs the team + last 6 games against anyone
+COMBINED_WINDOWS = (('regular-season', 5, True), ('games', 6, False))
+
+ANY_TEAM = 'Any'
+
+
+def normalize_time_duration(time_duration):
+    """Map a dashboard label such as 'Last 7 Regular Games' to its StatMuse time duration"""
+    return WINDOW_LABELS.get(time_duration, time_duration)
+
+
+def parse_window(time_duration):
+    """
+    (kind, games) for a time duration; games is None for a whole log such as
+    'playoff-game-log'. Returns None for durations the planner cannot slice.
+    """
+    time_duration = normalize_time_duration(time_duration)
+    if time_duration == 'playoff-game-log':
+        return 'playoff', None
+    for pattern, kind in WINDOW_PATTERNS:
+        match = pattern.match(time_duration)
+        if match:
+            return kind, int(match.group(1))
+    return None
+
+
+def window_duration(kind, games):
+    """StatMuse time duration for a window"""
+    if kind == 'playoff':
+        return 'playoff-game-log' if games is None else f'last-{games}-playoff-games'
+    if kind == 'regular-season':
+        return f'last-{games}-regular-season-games'
+    return f'last-{games}-games'
+
+
+def is_any_team(team):
+    return not team or team.strip().lower() == ANY_TEAM.lower()
+
+
+def matches_team(opponent, team, league='NBA'):
+    """True if a log's OPP code refers to the team, given as a code or a name ('BKN', 'Nets' or 'Brooklyn Nets')"""
+    opponent, team = opponent.strip().upper(), team.strip()
+    if opponent == team.upper():
+        return True
+    league = league.upper()
+    abbreviations = NBA_TEAM_ABBREVS if league == 'NBA' else SPORTS_CONFIG.get(league, {}).get('team_abbrevs', {})
+    nickname = abbreviations.get(opponent)
+    return bool(nickname) and same_team(nickname, team)
+
+
+class _Log:
+    """Fetched games for one player and window kind, most recent first"""
+
+    def __init__(self, header, games, requested, url=None):
+        self.header = header
+        # Windows are sliced off the front, so never rely on the page's row order
+        if 'DATE' in header:
+            date_index = header.index('DATE')
+            games = sorted(games, key=lambda row: date_ordinal(row[date_index]), reverse=True)
+        self.games = games
+        self.requested = requested
+        self.url = url
+        # Fewer games than asked for means this is the player's whole log of this kind
+        self.complete = requested is None or len(games) < requested
+
+    def covers(self, games):
+        return self.complete or (games is not None and len(self.games) >= games)
+
+
+class WindowPlanner:
+    """
+    Serves nested game windows for players from one fetch of the largest
+    window. `reserve` lets a caller announce every window it is about to ask
+    for, so the first fetch is already large enough; `min_games` is the
+    smallest window ever fetched, so toggling between the dashboard's window
+    sizes does not refetch.
+    """
+
+    def __init__(self, fetch=None, min_games=10):
+        self._fetch = fetch or scrape_statmuse
+        self.min_games = min_games
+        self.fetches = 0
+        self._logs = {}
+        self._wanted = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def reserve(self, league, player, time_duration):
+        """Record that a window will be needed, before anything is fetched"""
+        normalized = normalize_time_duration(time_duration)
+        if normalized == 'combined':
+            windows = [(kind, games) for kind, games, vs_team in COMBINED_WINDOWS]
+        else:
+            window = parse_window(normalized)
+            windows = [window] if window else []
+        with self._guard:
+            for kind, games in windows:
+                key = (league, player.lower(), kind)
+                wanted = self._wanted.get(key, 0)
+                self._wanted[key] = None if games is None or wanted is None else max(wanted, games)
+
+    def _lock_for(self, key):
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _fetch_counted(self, url):
+        with self._guard:
+            self.fetches += 1
+        return self._fetch(url)
+
+    def _log(self, league, player, kind, games, team=ANY_TEAM):
+        """The cached log for a kind, fetching a large enough window when needed"""
+        key = (league, player.lower(), kind) if is_any_team(team) else (league, player.lower(), kind, team.lower())
+        with self._lock_for(key):
+            log = self._logs.get(key)
+            if log is not None and log.covers(games):
+                return log
+
+            with self._guard:
+                wanted = self._wanted.get(key, 0)
+            if games is None or wanted is None:
+                size = None
+            else:
+                size = max(games, wanted, self.min_games, len(log.games) if log else 0)
+
+            url = geturl(league, player, team, window_duration(kind, size))
+            data = self._fetch_counted(url)
+            if not data:
+                return None
+            log = _Log(data[0], [row for row in data[1:] if 'Average' not in row], size, url)
+            self._logs[key] = log
+            return log
+
+    def refresh(self, league, player):
+        """
+        Refetch every window cached for the player at the size it was fetched
+        at. Returns True when any of them changed, False when none did and
+        None when nothing is cached for the player.
+        """
+        with self._guard:
+            keys = [key for key in self._logs if key[:2] == (league, player.lower())]
+        if not keys:
+            return None
+
+        changed = False
+        for key in keys:
+            with self._lock_for(key):
+                log = self._logs[key]
+                data = self._fetch_counted(log.url)
+                if not data:
+                    raise ValueError(f"No game log returned for {player}")
+                fresh = _Log(data[0], [row for row in data[1:] if 'Average' not in row], log.requested, log.url)
+                if (fresh.header, fresh.games) != (log.header, log.games):
+                    self._logs[key] = fresh
+                    changed = True
+        return changed
+
+    def _window(self, league, player, kind, games, team):
+        """[header, rows...] for the most recent `games` of a kind, optionally vs one team"""
+        log = self._log(league, player, kind, games)
+        if is_any_team(team):
+            if log is None:
+                return []
+            return [list(log.header)] + [list(row) for row in log.games[:games]]
+
+        # Filter the games against the team out of the player's log
+        if log is not None and 'OPP' in log.header:
+            opp_index = log.header.index('OPP')
+            vs_team = [row for row in log.games if matches_team(row[opp_index], team, league)]
+            if log.complete or (games is not None and len(vs_team) >= games):
+                return [list(log.header)] + [list(row) for row in vs_team[:games]]
+
+        # Not enough games against this team in the player's log; ask StatMuse for them directly
+        log = self._log(league, player, kind, games, team)
+        if log is None:
+            return []
+        return [list(log.header)] + [list(row) for row in log.games[:games]]
+
+    def get(self, league, player, time_duration, team=ANY_TEAM):
+        """
+        Game log for a window, in the same [header, rows...] form as
+        scrape_statmuse. Durations the planner cannot slice are fetched as is.
+        """
+        normalized = normalize_time_duration(time_duration)
+        if normalized == 'combined':
+            logs = [self._window(league, player, kind, games, team if vs_team else ANY_TEAM)
+                    for kind, games, vs_team in COMBINED_WINDOWS]
+            return merge_game_logs(*logs)
+
+        window = parse_window(normalized)
+        if window is None:
+            return self._fetch_counted(geturl(league, player, team, normalized))
+        return self._window(league, player, window[0], window[1], team)
@@ -3,10 +3,12 @@ import matplotlib.patches as patches
 from datetime import datetime
 import numpy as np
 from team_defense_scraper import get_defense_analysis, get_team_defense_rankings
+from monte_carlo import SIMULATION_ENGINES, simulate_outcomes
 
-def create_enhanced_dashboard(player_data, statistic, projection, quantitative, player_name):
+def create_enhanced_dashboard(player_data, statistic, projection, quantitative, player_name, probability_engine='Normal'):
     """
     Creates a comprehensive dashboard showing player stats and team defense analysis
+    probability_engine: 'Normal' or one of the Monte Carlo engines ('Bootstrap', 'Poisson', 'NegBinomial')
     """
     plt.style.use('https://github.com/dhaitz/matplotlib-stylesheets/raw/master/pitayasmoothie-dark.mplstyle')
     
@@ -140,15 +142,29 @@ def create_enhanced_dashboard(player_data, statistic, projection, quantitative,
     cdf = 0.5 * (1 + erf(z / np.sqrt(2)))
     pdf = (1 / (std_dev * np.sqrt(2 * np.pi))) * np.exp(-0.5 * z**2)
     
-    # Normal Distribution PDF Plot (from original plot.py)
-    x_values_pdf = np.linspace(quantitative - 4*std_dev, quantitative + 4*std_dev, 1000)
-    pdf_values = (1 / (std_dev * np.sqrt(2 * np.pi))) * np.exp(-0.5 * ((x_values_pdf - quantitative) / std_dev) ** 2)
-    ax3.plot(x_values_pdf, pdf_values, color='blue', linewidth=2)
-    ax3.axvline(x, color='yellow', linestyle='dashed', linewidth=2, label=f'Projection: {projection:.2f}')
-    ax3.axvline(quantitative, color='purple', linestyle='solid', linewidth=2, label=f'Mean: {quantitative:.2f}')
-    ax3.fill_between(x_values_pdf, pdf_values, where=(x_values_pdf <= x), color='gray', alpha=0.5)
-    ax3.text(projection, 0.02, f"CDF at Projection: {cdf:.4f}", fontsize=10, color='white')
-    ax3.set_title('Normal Distribution PDF', fontsize=11, fontweight='bold')
+    if probability_engine in SIMULATION_ENGINES:
+        # Simulated next-game distribution instead of the normal approximation
+        simulated = simulate_outcomes(sorted_values, probability_engine)
+        cdf = 1 - float((simulated > projection).mean())
+        bins = np.arange(simulated.min(), simulated.max() + 2) - 0.5 if simulated.max() - simulated.min() < 60 else 40
+        counts, edges, patches = ax3.hist(simulated, bins=bins, density=True, color='blue', alpha=0.6)
+        for patch, left_edge in zip(patches, edges[:-1]):
+            if left_edge + 0.5 <= x:
+                patch.set_facecolor('gray')
+        ax3.axvline(x, color='yellow', linestyle='dashed', linewidth=2, label=f'Projection: {projection:.2f}')
+        ax3.axvline(quantitative, color='purple', linestyle='solid', linewidth=2, label=f'Mean: {quantitative:.2f}')
+        ax3.text(projection, 0.02, f"CDF at Projection: {cdf:.4f}", fontsize=10, color='white')
+        ax3.set_title(f'{probability_engine} Simulated Distribution', fontsize=11, fontweight='bold')
+    else:
+        # Normal Distribution PDF Plot (from original plot.py)
+        x_values_pdf = np.linspace(quantitative - 4*std_dev, quantitative + 4*std_dev, 1000)
+        pdf_values = (1 / (std_dev * np.sqrt(2 * np.pi))) * np.exp(-0.5 * ((x_values_pdf - quantitative) / std_dev) ** 2)
+        ax3.plot(x_values_pdf, pdf_values, color='blue', linewidth=2)
+        ax3.axvline(x, color='yellow', linestyle='dashed', linewidth=2, label=f'Projection: {projection:.2f}')
+        ax3.axvline(quantitative, color='purple', linestyle='solid', linewidth=2, label=f'Mean: {quantitative:.2f}')
+        ax3.fill_between(x_values_pdf, pdf_values, where=(x_values_pdf <= x), color='gray', alpha=0.5)
+        ax3.text(projection, 0.02, f"CDF at Projection: {cdf:.4f}", fontsize=10, color='white')
+        ax3.set_title('Normal Distribution PDF', fontsize=11, fontweight='bold')
     ax3.set_xlabel(statistic, fontsize=10)
     ax3.set_ylabel('Density', fontsize=10)
     ax3.legend(fontsize=9)
@@ -184,7 +200,7 @@ def create_enhanced_dashboard(player_data, statistic, projection, quantitative,
         
         # Hit probability
         hit_prob = (1 - cdf) * 100
-        ax4.text(0.1, 0.45, f"Hit Probability: {hit_prob:.1f}%", 
+        ax4.text(0.1, 0.45, f"Hit Probability ({probability_engine}): {hit_prob:.1f}%", 
                 fontsize=12, transform=ax4.transAxes, color='white')
         
         # Recommendation
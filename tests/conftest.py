@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The modules under src/ import their siblings by flat name, so put each
+# package directory on the path the same way the dashboard does when run directly
+src_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+for subdir in ('scrapers', 'core', 'analyzers', 'utils', 'dashboards'):
+    path = os.path.abspath(os.path.join(src_dir, subdir))
+    if path not in sys.path:
+        sys.path.insert(0, path)
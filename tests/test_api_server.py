@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Tests for the projection API service caching and request coalescing
+"""
+
+import asyncio
+import threading
+import time
+
+import batch_evaluator
+from api_server import DEFAULT_RETRY_AFTER, ApiServer, ProjectionService
+from scrape_result import HTTP_ERROR, RATE_LIMITED, TIMEOUT, ScrapeError, ScrapeResult
+from test_batch_evaluator import RANKINGS, RAW_LOG
+
+
+def test_identical_queries_are_coalesced_and_cached():
+    service = ProjectionService(cache_ttl=60, max_workers=4)
+    calls = []
+    lock = threading.Lock()
+
+    def slow_rankings(sport, statistic):
+        with lock:
+            calls.append((sport, statistic))
+        time.sleep(0.2)
+        return [('Jazz', 121.23, 1), ('Wizards', 120.44, 2)]
+
+    service.evaluator.get_rankings = slow_rankings
+
+    async def run():
+        target = '/defense-rankings?sport=NBA&stat=PTS'
+        first = await asyncio.gather(*[service.dispatch('GET', target) for _ in range(5)])
+        second = await service.dispatch('GET', target)
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(status == 200 for status, payload in first)
+    assert second[1]['rankings'][0] == {'rank': 1, 'team': 'Jazz', 'value': 121.23}
+    assert service.stats['coalesced'] == 4
+    assert service.stats['cache_hits'] == 1
+
+
+def test_errors_are_not_cached():
+    service = ProjectionService(cache_ttl=60, max_workers=2)
+    service.evaluator.get_rankings = lambda sport, statistic: []
+
+    async def run():
+        return [await service.dispatch('GET', '/defense-rankings?stat=PTS') for _ in range(2)]
+
+    results = asyncio.run(run())
+
+    assert [status for status, payload in results] == [502, 502]
+    assert service.stats['computed'] == 2
+    assert asyncio.run(service.dispatch('GET', '/projection?sport=NBA'))[0] == 400
+    assert asyncio.run(service.dispatch('GET', '/nope'))[0] == 404
+
+
+def test_upstream_failures_map_to_502_or_503_with_retry_after():
+    service = ProjectionService(cache_ttl=60, max_workers=2)
+    failures = {'PTS': ScrapeResult(error_kind=TIMEOUT, error="read timed out"),
+                'REB': ScrapeResult(error_kind=RATE_LIMITED, error="HTTP 429", status=429, retry_after=90),
+                'AST': ScrapeResult(error_kind=HTTP_ERROR, error="HTTP 404", status=404)}
+
+    def failing_rankings(sport, statistic):
+        raise ScrapeError(failures[statistic])
+
+    service.evaluator.get_rankings = failing_rankings
+
+    async def run():
+        server = await ApiServer(service, port=0).start()
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+        writer.write(b'GET /defense-rankings?stat=REB HTTP/1.1\r\nConnection: close\r\n\r\n')
+        response = await reader.read()
+        writer.close()
+        server.server.close()
+        return response, [await service.dispatch('GET', f'/defense-rankings?stat={stat}') for stat in failures]
+
+    response, results = asyncio.run(run())
+
+    assert response.startswith(b'HTTP/1.1 503 Service Unavailable') and b'Retry-After: 90\r\n' in response
+    assert [status for status, payload in results] == [503, 503, 502]
+    assert results[0][1]['retry_after'] == DEFAULT_RETRY_AFTER and results[0][1]['error_kind'] == TIMEOUT
+    assert 'retry_after' not in results[2][1]
+
+
+def test_waiters_survive_a_cancelled_leader():
+    service = ProjectionService(cache_ttl=60, max_workers=4)
+    calls = []
+
+    def slow_rankings(sport, statistic):
+        calls.append(statistic)
+        time.sleep(0.2)
+        return [('Jazz', 121.23, 1)]
+
+    service.evaluator.get_rankings = slow_rankings
+
+    async def run():
+        target = '/defense-rankings?sport=NBA&stat=PTS'
+        leader = asyncio.create_task(service.dispatch('GET', target))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.create_task(service.dispatch('GET', target))
+        await asyncio.sleep(0.05)
+        # The leader's client disconnects while the waiter is coalesced onto it
+        leader.cancel()
+        return await asyncio.wait_for(waiter, timeout=5)
+
+    status, payload = asyncio.run(run())
+
+    assert status == 200 and payload['rankings'][0]['team'] == 'Jazz'
+    assert len(calls) == 2 and service.stats['coalesced'] == 1
+    assert not service._inflight
+
+
+def test_projection_reports_a_timed_out_fetch_as_retryable():
+    service = ProjectionService(cache_ttl=60, max_workers=2)
+
+    def timed_out(*args, **kwargs):
+        raise ScrapeError(ScrapeResult(error_kind=TIMEOUT, error="read timed out"))
+
+    service.evaluator.fetch_player_log = timed_out
+
+    status, payload = asyncio.run(service.dispatch('GET', '/projection?sport=NBA&player=Stephen Curry&stat=PTS&line=25.5'))
+
+    assert status == 503 and payload['error_kind'] == TIMEOUT
+    assert payload['retry_after'] == DEFAULT_RETRY_AFTER
+    # A slate still reports the failure per prop
+    results = service.evaluator.evaluate([{'sport': 'NBA', 'player': 'Stephen Curry', 'stat': 'PTS', 'line': 25.5}])
+    assert results[0]['error'] == f"{TIMEOUT}: read timed out"
+
+
+def test_lookup_and_input_errors_are_not_upstream_failures(monkeypatch):
+    service = ProjectionService(cache_ttl=60, max_workers=2)
+    logs = {'stephen curry': RAW_LOG, 'nobody': []}
+    monkeypatch.setattr(batch_evaluator, 'scrape_statmuse', lambda url: logs[url.split('/ask/')[1].split('-vs-')[0].lower()])
+    monkeypatch.setattr(batch_evaluator, 'get_team_defense_rankings', lambda statistic: RANKINGS)
+
+    async def run():
+        targets = ['/projection?sport=NBA&player=Stephen Curry&stat=PTS&line=25.5',
+                   '/projection?sport=NFL&player=Stephen Curry&stat=PTS&line=25.5',
+                   '/projection?sport=NBA&player=Stephen Curry&stat=GOALS&line=0.5',
+                   '/projection?sport=NBA&player=Nobody&stat=PTS&line=25.5',
+                   '/player-log?sport=NBA&player=Nobody']
+        return [await service.dispatch('GET', target) for target in targets]
+
+    results = asyncio.run(run())
+
+    assert [status for status, payload in results] == [200, 400, 400, 404, 404]
+    assert results[0][1]['mean'] == 29.6
+    assert results[3][1]['error'] == "No data found for this player"
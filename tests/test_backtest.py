@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized projection backtester
+"""
+
+import time
+from datetime import date
+
+import numpy as np
+
+from backtest import backtest, parse_date
+from NBBBA import clean_nba_data
+from simplemean import simple_mean
+from test_batch_evaluator import RAW_LOG
+from WMA import weighted_moving_average
+
+
+def test_projections_only_use_prior_games():
+    cleaned = clean_nba_data(RAW_LOG)
+    logs = {('NBA', 'Stephen Curry'): cleaned}
+    lines = [{'sport': 'NBA', 'player': 'Stephen Curry', 'stat': 'PTS', 'date': parse_date('2/27/2025'), 'line': 25.5},
+             {'sport': 'NBA', 'player': 'Stephen Curry', 'stat': 'PTS', 'date': parse_date('2025-02-25'), 'line': 20.5},
+             {'sport': 'NBA', 'player': 'Stephen Curry', 'stat': 'PTS', 'date': parse_date('2/13/2025'), 'line': 20.5}]
+
+    report = backtest(logs, lines)
+
+    prior = [['DATE', 'PTS']] + [[game[1], game[5]] for game in cleaned[1:5]]
+    assert report['skipped'] == 1  # no games before the first one
+    assert report['Mean']['mae'] == round((abs(simple_mean(prior, 'PTS') - 56) + abs(77 / 3 - 15)) / 2, 3)
+    # The WMA of the 2/27 line is weighted_moving_average over the four earlier games
+    wma = weighted_moving_average(prior, 'PTS')
+    assert report['WMA']['mae'] == round((abs(wma - 56) + abs((3 * 30 + 2.5 * 20 + 2 * 27) / 7.5 - 15)) / 2, 3)
+    # Both projections were under 25.5 before the 56-point game and over 20.5 before the 15-point game
+    assert report['Mean']['hit_rate'] == 0.0
+    assert report['Mean']['roi'] == -100.0
+
+
+def test_full_season_backtest_runs_in_seconds():
+    rng = np.random.default_rng(3)
+    days = [parse_date('10/22/2024') + 2 * g for g in range(82)]
+    dates = [date.fromordinal(day) for day in days]
+    logs, lines = {}, []
+    for p in range(450):
+        points = rng.poisson(rng.uniform(5, 30), size=82)
+        logs[('NBA', f'Player {p}')] = [['NAME', 'DATE', 'PTS']] + [
+            ['Player', f'{day.month}/{day.day}/{day.year}', str(value)] for day, value in zip(dates, points)]
+        lines.extend({'sport': 'NBA', 'player': f'Player {p}', 'stat': 'PTS', 'date': day, 'line': 15.5}
+                     for day in days)
+
+    start = time.perf_counter()
+    report = backtest(logs, lines, window=10)
+    elapsed = time.perf_counter() - start
+
+    assert report['Mean']['lines'] == 450 * 81
+    assert sum(count for low, high, count, predicted, observed in report['WMA']['calibration']) <= 450 * 81
+    assert elapsed < 10
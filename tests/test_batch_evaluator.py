@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the headless batch evaluator (no network access required)
+"""
+
+import json
+
+import pytest
+
+import batch_evaluator
+from batch_evaluator import DEFAULT_TIME_DURATION, RESULT_COLUMNS, SlateEvaluator, load_props, write_results
+
+RAW_LOG = [
+    ['', '', 'NAME', 'DATE', 'TM', '', 'OPP', 'MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'FGM', 'FGA', 'FG%', '3PM', '3PA', '3P%', 'FTM', 'FTA', 'FT%', 'TS%', 'OREB', 'DREB', 'TOV', 'PF', '+/-'],
+    ['1', '', 'Stephen CurryS. Curry', '2/13/2025', 'GSW', '@', 'HOU', '35', '27', '5', '3', '0', '0', '7', '17', '41.2', '5', '13', '38.5', '8', '9', '88.9', '64.4', '1', '4', '1', '2', '+7'],
+    ['2', '', 'Stephen CurryS. Curry', '2/21/2025', 'GSW', '@', 'SAC', '31', '20', '1', '6', '2', '0', '7', '13', '53.8', '4', '9', '44.4', '2', '2', '100.0', '72.0', '0', '1', '1', '0', '0'],
+    ['3', '', 'Stephen CurryS. Curry', '2/23/2025', 'GSW', 'vs', 'DAL', '29', '30', '4', '7', '1', '0', '12', '20', '60.0', '3', '8', '37.5', '3', '3', '100.0', '70.4', '0', '4', '2', '3', '+14'],
+    ['4', '', 'Stephen CurryS. Curry', '2/25/2025', 'GSW', 'vs', 'CHA', '24', '15', '4', '6', '1', '0', '6', '14', '42.9', '2', '9', '22.2', '1', '1', '100.0', '51.9', '0', '4', '2', '2', '+26'],
+    ['5', '', 'Stephen CurryS. Curry', '2/27/2025', 'GSW', '@', 'ORL', '34', '56', '4', '3', '2', '0', '16', '25', '64.0', '12', '19', '63.2', '12', '12', '100.0', '92.5', '0', '4', '4', '0', '+15']
+]
+
+RANKINGS = [('Jazz', 121.23, 1), ('Wizards', 120.44, 2), ('Rockets', 110.0, 3)]
+
+
+def test_load_props_csv_and_json(tmp_path):
+    csv_path = tmp_path / "props.csv"
+    csv_path.write_text("sport,player,stat,line,opponent\nnba,Stephen Curry,PTS,25.5,UTA\n")
+    json_path = tmp_path / "props.json"
+    json_path.write_text(json.dumps([{'sport': 'NBA', 'player': 'Stephen Curry', 'stat': 'PRA', 'line': 35},
+                                     {'sport': 'NHL', 'player': 'Connor McDavid', 'stat': 'GOALS', 'line': 0}]))
+
+    csv_props = load_props(str(csv_path))
+    json_props = load_props(str(json_path))
+
+    assert csv_props[0]['sport'] == 'NBA'
+    assert csv_props[0]['line'] == 25.5
+    assert csv_props[0]['opponent'] == 'UTA'
+    assert json_props[0]['opponent'] is None
+    assert json_props[0]['team'] == 'Any'
+    assert json_props[1]['line'] == 0.0
+
+    json_path.write_text(json.dumps([{'sport': 'NBA', 'player': 'Stephen Curry', 'stat': 'PTS', 'line': ' '}]))
+    with pytest.raises(ValueError, match='line'):
+        load_props(str(json_path))
+
+
+def test_evaluate_scrapes_each_page_once(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_scrape(url):
+        calls.append(url)
+        return RAW_LOG
+
+    monkeypatch.setattr(batch_evaluator, 'scrape_statmuse', fake_scrape)
+    monkeypatch.setattr(batch_evaluator, 'get_team_defense_rankings', lambda stat: RANKINGS)
+    monkeypatch.setattr(batch_evaluator, 'get_combined_stats_rankings',
+                        lambda components: ([(rank, team, value) for team, value, rank in RANKINGS], {}))
+
+    props = [
+        {'sport': 'NBA', 'player': 'Stephen Curry', 'stat': 'PTS', 'line': 25.5, 'opponent': 'UTA'},
+        {'sport': 'NBA', 'player': 'Stephen Curry', 'stat': 'PTS', 'line': 40.5, 'opponent': 'UTA'},
+        {'sport': 'NBA', 'player': 'Stephen Curry', 'stat': 'PRA', 'line': 30.5, 'opponent': 'UTA'},
+        {'sport': 'NFL', 'player': 'Patrick Mahomes', 'stat': 'PASS_YDS', 'line': 280.5},
+    ]
+    results = SlateEvaluator(max_workers=4, method='Mean').evaluate(props)
+
+    assert len(calls) == 1
+    assert [r['rank'] for r in results] == [1, 2, 3, 4]
+    assert results[-1]['error'] is not None
+    probabilities = [r['hit_probability'] for r in results[:3]]
+    assert probabilities == sorted(probabilities, reverse=True)
+
+    pts = next(r for r in results if r['stat'] == 'PTS' and r['line'] == 25.5)
+    assert pts['mean'] == 29.6
+    assert pts['defense_rank'] == 1
+    pra = next(r for r in results if r['stat'] == 'PRA')
+    assert pra['mean'] == 38.2
+
+    output = tmp_path / "results.csv"
+    write_results(results, str(output))
+    assert output.read_text().splitlines()[0].startswith('rank,sport,player')
+
+    # The per-game values used for pricing are not part of the written results
+    output = tmp_path / "results.json"
+    write_results(results, str(output))
+    assert all(set(result) <= set(RESULT_COLUMNS) for result in json.loads(output.read_text()))
+
+
+def test_refresh_reprices_combos_from_the_new_log(monkeypatch):
+    logs = [RAW_LOG, RAW_LOG[:1] + [row[:8] + ['50'] + row[9:] for row in RAW_LOG[1:]]]
+    monkeypatch.setattr(batch_evaluator, 'scrape_statmuse', lambda url: logs[0])
+    evaluator = SlateEvaluator(max_workers=2, method='Mean')
+
+    before = evaluator.price_combos('NBA', 'Stephen Curry', {'PRA': 38.5})['PRA']
+    logs.pop(0)
+    assert evaluator.refresh_player_log('NBA', 'Stephen Curry') is True
+    after = evaluator.price_combos('NBA', 'Stephen Curry', {'PRA': 38.5})['PRA']
+
+    assert after['hit_probability'] > before['hit_probability']
+
+
+def test_combined_models_are_shared_across_name_spellings(monkeypatch):
+    monkeypatch.setattr(batch_evaluator, 'scrape_statmuse', lambda url: RAW_LOG)
+    evaluator = SlateEvaluator(max_workers=2, method='Mean')
+
+    model = evaluator.get_combined_model('NBA', 'Stephen Curry')
+    assert evaluator.get_combined_model('NBA', 'stephen curry') is model
+    assert list(evaluator._combined_models) == [('NBA', 'stephen curry', 'Any', DEFAULT_TIME_DURATION, None, 'Mean')]
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for the correlated combined-stat model
+"""
+
+import numpy as np
+
+from combined_distribution import CombinedStatModel, component_matrix
+from probability import normal_hit_probability
+
+HEADER = ['NAME', 'DATE', 'OPP', 'PTS', 'REB', 'AST']
+LOG = [
+    HEADER,
+    ['Stephen Curry', '2/13/2025', 'HOU', '27', '5', '3'],
+    ['Stephen Curry', '2/21/2025', 'SAC', '20', '1', '6'],
+    ['Stephen Curry', '2/23/2025', 'DAL', '30', '4', '7'],
+    ['Stephen Curry', '2/25/2025', 'CHA', '15', '4', '6'],
+    ['Stephen Curry', '2/27/2025', 'ORL', '56', '4', '3'],
+]
+
+
+def test_component_matrix_orders_most_recent_first():
+    matrix = component_matrix(LOG, ['PTS', 'REB'], most_recent_first=True)
+    assert matrix.shape == (5, 2)
+    assert matrix[0].tolist() == [56.0, 4.0]
+
+
+def test_combos_match_univariate_fit_of_summed_values():
+    model = CombinedStatModel.for_sport(LOG, 'NBA')
+    lines = {'PRA': 38.5, 'PR': 31.5, 'PA': 33.5, 'RA': 9.5}
+    priced = model.hit_probabilities(lines)
+
+    for combo, line in lines.items():
+        indices = [HEADER.index(c) for c in {'PRA': 'PTS REB AST', 'PR': 'PTS REB',
+                                               'PA': 'PTS AST', 'RA': 'REB AST'}[combo].split()]
+        totals = [sum(float(row[i]) for i in indices) for row in LOG[1:]]
+        expected, std_dev = normal_hit_probability(totals, line, np.mean(totals))
+        assert abs(priced[combo]['mean'] - np.mean(totals)) < 1e-9
+        assert abs(priced[combo]['std_dev'] - std_dev) < 1e-9
+        assert abs(priced[combo]['hit_probability'] - expected) < 1e-6
+
+
+def test_wma_centre_uses_recent_games():
+    mean_model = CombinedStatModel.for_sport(LOG, 'NBA', 'Mean')
+    wma_model = CombinedStatModel.for_sport(LOG, 'NBA', 'WMA')
+    # The 56 point game is the most recent, so the WMA centre sits above the mean
+    assert wma_model.distribution(['PRA'])[0][0] > mean_model.distribution(['PRA'])[0][0]
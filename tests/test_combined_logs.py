@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for merging the combined (vs-team + last-6) game log windows
+"""
+
+from datascrapper import merge_game_logs, sort_combined_data
+
+HEADER = ['', 'NAME', 'DATE', 'OPP', 'PTS']
+
+
+def log(*games):
+    """Log with the games listed most recent first, plus the StatMuse average row"""
+    rows = [[str(i + 1), 'Curry', day, opp, pts] for i, (day, opp, pts) in enumerate(games)]
+    return [HEADER] + rows + [['', 'Average', '', '', '25']]
+
+
+VS_TEAM = log(('2/27/2025', 'HOU', '30'), ('11/2/2024', 'HOU', '22'), ('3/5/2024', 'HOU', '18'))
+LAST_GAMES = log(('3/3/2025', 'DAL', '25'), ('2/27/2025', 'HOU', '30'), ('2/25/2025', 'CHA', '15'),
+                 ('12/30/2024', 'POR', '41'))
+
+
+def test_merge_sorts_oldest_first_and_dedupes_shared_games():
+    merged = merge_game_logs(VS_TEAM, LAST_GAMES)
+
+    assert merged[0] == HEADER
+    assert [row[2] for row in merged[1:]] == ['3/5/2024', '11/2/2024', '12/30/2024', '2/25/2025',
+                                               '2/27/2025', '3/3/2025']
+
+
+def test_sort_combined_data_splits_concatenated_logs():
+    assert sort_combined_data(VS_TEAM + LAST_GAMES) == merge_game_logs(VS_TEAM, LAST_GAMES)
+
+
+def test_empty_windows():
+    assert merge_game_logs([], []) == []
+    assert merge_game_logs([], LAST_GAMES)[1][2] == '12/30/2024'
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the generic multi-sport defense engine (no network access required)
+"""
+
+import re
+import threading
+
+import defense_engine
+from defense_engine import DefenseEngine, defense_url
+from sports_config import SPORTS_CONFIG
+
+NHL_ALLOWED = {
+    'goals': {'Sharks': 3.9, 'Blackhawks': 3.6, 'Oilers': 3.0, 'Kings': 2.6},
+    'assists': {'Sharks': 6.1, 'Blackhawks': 6.0, 'Oilers': 5.2, 'Kings': 4.4},
+    'points': {'Sharks': 10.0, 'Blackhawks': 9.6, 'Oilers': 8.2, 'Kings': 7.0},
+}
+
+
+def fake_fetch_table(calls):
+    lock = threading.Lock()
+
+    def fetch(url):
+        with lock:
+            calls.append(url)
+        slug = re.search(r'give-up-the-most-(.+?)-per-game', url).group(1)
+        teams = NHL_ALLOWED.get(slug)
+        if not teams:
+            return None
+        headers = ['', '', 'TEAM', f'OPP {slug.upper()}/GP', 'GP']
+        rows = [[str(i), '', f'{team} Logo', f'{value:.2f}', '60'] for i, (team, value) in enumerate(teams.items(), 1)]
+        return headers, rows
+
+    return fetch
+
+
+def test_matrix_is_fetched_once_and_feeds_lookups(monkeypatch):
+    calls = []
+    monkeypatch.setattr(defense_engine, 'fetch_table', fake_fetch_table(calls))
+    engine = DefenseEngine(max_workers=4)
+
+    analysis = engine.analyze('NHL', 'SJS', 'GOALS')
+    combined = engine.rankings('NHL', 'PA')
+    engine.analyze('NHL', 'LAK', 'ASSISTS')
+
+    # One request per mapped stat, all made while building the matrix
+    assert len(calls) == len(SPORTS_CONFIG['NHL']['stat_mapping'])
+    assert analysis['opponent'] == 'Sharks'
+    assert analysis['rank'] == 1 and analysis['difficulty'] == 'Easy'
+    assert combined[0] == ('Sharks', 10.0, 1)
+    assert [team for team, value, rank in combined] == ['Sharks', 'Blackhawks', 'Oilers', 'Kings']
+
+
+def test_rankings_do_not_fetch_when_not_waiting(monkeypatch):
+    calls = []
+    monkeypatch.setattr(defense_engine, 'fetch_table', fake_fetch_table(calls))
+    engine = DefenseEngine()
+
+    assert engine.rankings('NHL', 'GOALS', wait=False) is None
+    engine.warm(['NHL']).join(timeout=5)
+    assert engine.rankings('NHL', 'GOALS', wait=False)[0][0] == 'Sharks'
+    assert engine.rankings('NHL', 'SHOTS') == []
+
+
+def test_defense_url_uses_configured_base():
+    url = defense_url('NFL', 'PASS_YDS')
+    assert url.startswith(defense_engine.STATMUSE_BASE_URL)
+    assert url.endswith('/nfl/ask/nfl-teams-that-give-up-the-most-passing-yards-per-game-this-season')
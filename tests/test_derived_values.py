@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazily evaluated dashboard values
+"""
+
+import numpy as np
+import pytest
+
+from derived_values import DashboardValues
+from NBBBA import clean_nba_data
+from probability import normal_hit_probability
+from test_batch_evaluator import RAW_LOG
+from WMA import weighted_moving_average
+
+
+def test_values_match_the_dashboard_formulas():
+    values = DashboardValues(clean_nba_data(RAW_LOG), 'NBA', 'PRA', 38.5, method='WMA')
+
+    # Games in date order, with PRA summed from its components
+    assert list(values['values']) == [35, 27, 41, 25, 63]
+    assert values['opponents'][0] == 'HOU'
+    table = [['DATE', 'PRA']] + [[d.strftime('%m/%d/%Y'), v] for d, v in zip(values['dates'], values['values'])]
+    assert values['quantitative'] == pytest.approx(weighted_moving_average(table, 'PRA'))
+    std_dev = np.std([35, 27, 41, 25, 63], ddof=1)
+    assert values['conf_interval'][1] - values['quantitative'] == pytest.approx(2.571 * std_dev / np.sqrt(5))
+    assert values['hit_rate'] == 40.0
+    assert values['bar_colors'] == ['red', 'red', 'green', 'red', 'green']
+    assert values['hit_probability'] == pytest.approx((1 - values['cdf']) * 100)
+
+    with pytest.raises(ValueError):
+        DashboardValues(clean_nba_data(RAW_LOG), 'NBA', 'SAVES', 1.5)['values']
+
+
+def test_changing_the_projection_only_recomputes_what_depends_on_it():
+    values = DashboardValues(clean_nba_data(RAW_LOG), 'NBA', 'PTS', 25.5)
+    for name in ('pdf_curve', 'conf_interval', 'hit_probability', 'bar_colors', 'recommendation'):
+        values[name]
+    first = values['hit_probability']
+
+    assert values.set('projection', 30.5)
+    assert not values.set('projection', 30.5)
+    assert values.is_cached('pdf_curve') and values.is_cached('std_dev') and values.is_cached('games')
+    assert not values.is_cached('cdf') and not values.is_cached('bar_colors')
+
+    assert values['hit_probability'] < first
+    assert values['bar_colors'] == ['red', 'red', 'red', 'red', 'green']
+    for name in ('games', 'values', 'quantitative', 'std_dev', 'pdf_curve'):
+        assert values.evaluations[name] == 1, name
+    for name in ('cdf', 'hit_probability', 'bar_colors'):
+        assert values.evaluations[name] == 2, name
+
+    # Switching the method keeps the game values but recomputes the projection chain
+    assert values['quantitative'] == pytest.approx(29.6)
+    values.set('method', 'WMA')
+    assert values['quantitative'] == pytest.approx((5 * 56 + 4.5 * 15 + 4 * 30 + 3.5 * 20 + 3 * 27) / 20)
+    assert values.evaluations['values'] == 1 and values.evaluations['quantitative'] == 2
+
+
+def test_a_log_without_spread_is_deterministic_like_the_batch_evaluator():
+    steady = clean_nba_data([RAW_LOG[0]] + [row[:8] + ['20'] + row[9:] for row in RAW_LOG[1:]])
+    values = DashboardValues(steady, 'NBA', 'PTS', 19.5)
+
+    assert values['std_dev'] == 0 and values['pdf_curve'] is None
+    for projection in (19.5, 20.5):
+        values.set('projection', projection)
+        assert values['hit_probability'] == normal_hit_probability(values['values'], projection, 20.0)[0] * 100
+    assert values['hit_probability'] == 0.0
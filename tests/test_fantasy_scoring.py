@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the declarative fantasy scoring engine
+"""
+
+import numpy as np
+import pytest
+
+from fantasy_scoring import compile_scoring, fantasy_scores, innings_to_outs
+from game_log import GameLog
+from player_logs import clean_player_log
+from test_player_logs import MLB_LOG
+
+
+def test_mlb_cleaner_scores_with_the_default_rules():
+    hitter = clean_player_log('MLB', MLB_LOG, 'hitter')
+    pitcher = clean_player_log('MLB', MLB_LOG, 'pitcher')
+
+    # 6/18: a single, a home run, a run and two RBIs; 6/17: a double, a walk and a stolen base
+    assert [row[hitter[0].index('HFS')] for row in hitter[1:]] == [8, 5]
+    # A win over 6.1 innings (19 outs) with two earned runs; a loss over five innings with three
+    assert pitcher[1][pitcher[0].index('PFS')] == pytest.approx(4 + 19 / 3 - 2)
+    assert [row[pitcher[0].index('OUTS')] for row in pitcher[1:]] == [19, 15]
+    assert list(innings_to_outs([0.2, 7.0, 5.1])) == [2, 21, 16]
+
+
+def test_league_season_is_scored_for_every_site_at_once():
+    rng = np.random.default_rng(11)
+    games = 2000
+    outs = rng.integers(0, 22, size=games)
+    header = ['NAME', 'DATE', 'IP', 'ER', 'SO', 'H', 'BB', 'DEC']
+    rows = [['Pitcher', '6/1/2025', f'{o // 3}.{o % 3}', str(rng.integers(0, 6)), str(rng.integers(0, 12)),
+             str(rng.integers(0, 10)), str(rng.integers(0, 5)), str(rng.choice(['W', 'L', 'ND', 'SV']))]
+            for o in outs]
+    log = GameLog.from_rows([header] + rows)
+
+    scores = fantasy_scores(log, 'MLB', 'pitcher')
+    assert set(scores) == {'Default', 'PrizePicks', 'DraftKings'}
+
+    # The vectorized scores match scoring each raw row on its own
+    scoring = compile_scoring('MLB', 'pitcher', header)
+    for i in rng.choice(games, size=50, replace=False):
+        assert [scores[site][i] for site in scoring.names] == pytest.approx(scoring.score_row(rows[i]))
+    quality = (outs >= 18) & (log.values('ER') <= 3)
+    expected = (6 * (log.text('DEC') == np.array('W')) + 4 * quality - 3 * log.values('ER')
+                + 3 * log.values('SO') + outs)
+    assert scores['PrizePicks'] == pytest.approx(expected)
+
+    # Double-doubles and triple-doubles are derived from the box score
+    nba = [['PTS', 'REB', 'AST', 'STL', 'BLK', '3PM', 'TOV'], [20, 10, 10, 0, 0, 2, 3], [12, 9, 4, 1, 0, 0, 1]]
+    draftkings = fantasy_scores(nba, 'NBA', sites=['DraftKings'])['DraftKings']
+    assert draftkings == pytest.approx([20 + 1 + 12.5 + 15 - 1.5 + 1.5 + 3, 12 + 11.25 + 6 + 2 - 0.5])
+    with pytest.raises(ValueError):
+        fantasy_scores(nba, 'NBA', sites=['FanDuel'])
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact column-oriented game log
+"""
+
+import sys
+
+from batch_evaluator import build_stat_table
+from game_log import GameLog
+from NBBBA import clean_nba_data
+from test_batch_evaluator import RAW_LOG
+
+
+def deep_size(rows):
+    """Bytes held by a list of lists and every field in it"""
+    return sys.getsizeof(rows) + sum(sys.getsizeof(row) + sum(sys.getsizeof(field) for field in row)
+                                     for row in rows)
+
+
+def test_game_log_reads_like_the_cleaned_rows():
+    cleaned = clean_nba_data(RAW_LOG)
+    log = GameLog.from_rows(cleaned)
+
+    assert len(log) == len(cleaned)
+    assert log[0] == cleaned[0]
+    assert log[1]['DATE'] == '2/13/2025'
+    assert log[1]['OPP'] == 'HOU'
+    assert log[-1]['PTS'] == 56
+    assert build_stat_table(log, 'NBA', 'PRA') == build_stat_table(cleaned, 'NBA', 'PRA')
+    assert list(log.values('PTS')) == [27, 20, 30, 15, 56]
+    assert list(log.ordinals()[:2]) == [739295, 739303]
+
+
+def test_season_memory_is_an_order_of_magnitude_smaller():
+    cleaned = clean_nba_data(RAW_LOG)
+    season = [cleaned[0]] + [list(cleaned[1 + i % 5]) for i in range(82 * 30)]
+
+    rows_bytes = deep_size(season[1:])
+    log = GameLog.concat([GameLog.from_rows(season[:500]), GameLog.from_rows([season[0]] + season[500:])])
+
+    assert log.games == 82 * 30
+    assert build_stat_table(log, 'NBA', 'PTS') == build_stat_table(season, 'NBA', 'PTS')
+    assert rows_bytes / log.nbytes >= 10
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for conditional revalidation of cached team tables (no network access required)
+"""
+
+import time
+
+import http_cache
+from http_cache import RevalidatingTableCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeServer:
+    """Answers with a fixed body and ETag, honouring If-None-Match unless told not to"""
+
+    def __init__(self, body=b'<table>v1</table>', honour_validators=True):
+        self.body = body
+        self.honour_validators = honour_validators
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        headers = headers or {}
+        self.requests.append(headers)
+        etag = f'"{len(self.body)}-{hash(self.body)}"'
+        if self.honour_validators and headers.get('If-None-Match') == etag:
+            return FakeResponse(304, headers={'ETag': etag})
+        return FakeResponse(200, self.body, {'ETag': etag, 'Last-Modified': 'Sat, 01 Mar 2025 00:00:00 GMT'})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(monkeypatch, server, clock):
+    parsed = []
+
+    def parse(content):
+        parsed.append(content)
+        return ['parsed', content.decode()]
+
+    monkeypatch.setattr(http_cache.requests, 'get', server.get)
+    return RevalidatingTableCache(parse, fresh_seconds=60, max_stale_seconds=600, clock=clock), parsed
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_fresh_entries_skip_the_network(monkeypatch):
+    server, clock = FakeServer(), Clock()
+    cache, parsed = make_cache(monkeypatch, server, clock)
+
+    assert cache.get('u') == ['parsed', '<table>v1</table>']
+    clock.now += 30
+    cache.get('u')
+
+    assert len(server.requests) == 1
+    assert cache.stats['fresh_hits'] == 1
+
+
+def test_stale_entry_is_served_while_a_conditional_refresh_runs(monkeypatch):
+    server, clock = FakeServer(), Clock()
+    cache, parsed = make_cache(monkeypatch, server, clock)
+    cache.get('u')
+
+    clock.now += 120
+    assert cache.get('u') == ['parsed', '<table>v1</table>']
+    wait_for(lambda: cache.stats['not_modified'] == 1)
+
+    assert 'If-None-Match' in server.requests[-1]
+    assert cache.stats['stale_hits'] == 1
+    assert cache.stats['not_modified'] == 1
+    assert len(parsed) == 1
+
+    # The 304 renewed the entry
+    cache.get('u')
+    assert cache.stats['fresh_hits'] == 1
+
+
+def test_unchanged_body_is_not_reparsed_but_changes_are(monkeypatch):
+    server, clock = FakeServer(honour_validators=False), Clock()
+    cache, parsed = make_cache(monkeypatch, server, clock)
+    cache.get('u')
+
+    # Too old to serve stale: revalidate synchronously
+    clock.now += 10_000
+    cache.get('u')
+    assert cache.stats['unchanged_body'] == 1
+    assert len(parsed) == 1
+
+    server.body = b'<table>v2</table>'
+    clock.now += 10_000
+    assert cache.get('u') == ['parsed', '<table>v2</table>']
+    assert len(parsed) == 2
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the dashboard's live projection controls, drawn headless on Agg
+(no network access or display required)
+"""
+
+import importlib
+
+import matplotlib
+import pytest
+import requests
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+
+from derived_values import DashboardValues
+from NBBBA import clean_nba_data
+from test_batch_evaluator import RAW_LOG
+from test_scrape_result import FakeResponse
+
+# Importing the scrapers package scrapes a team assists table (teamstatscraper)
+TEAM_COLUMNS = ['TEAM', 'SEASON', 'OPP AST', 'GP', 'MPG', 'PPG', 'RPG', 'APG', 'SPG', 'BPG', 'FGM', 'FGA', '3PM', '3PA',
+                'FTM', 'FTA', 'OREB', 'DREB', 'TOV', 'PF']
+TEAM_PAGE = ('<table><tr>' + ''.join(f'<th>{column}</th>' for column in TEAM_COLUMNS) + '</tr><tr><td>Jazz</td>'
+             + '<td>2024-25</td>' + '<td>30</td>' * (len(TEAM_COLUMNS) - 2) + '</tr></table>').encode()
+
+DEFENSE = {'opponent': 'Jazz', 'total_teams': 30, 'rank': 1, 'value_allowed': 120.0, 'color': 'red',
+           'difficulty': 'Easy'}
+
+
+class FakeDefenseEngine:
+    def rankings(self, sport, statistic, wait=True):
+        return [('Jazz', 121.2, 1), ('Wizards', 120.4, 2)]
+
+
+class FakeControl:
+    """Stands in for the Tk slider, spinbox, entry and variables"""
+
+    def __init__(self, **options):
+        self.options = {}
+        self.value = ''
+        self.configured = 0
+        self.config(**options)
+
+    def config(self, **options):
+        # Tk takes from_= for its 'from' option
+        self.options.update((name.rstrip('_'), value) for name, value in options.items())
+        self.configured += 1
+
+    def cget(self, name):
+        return self.options[name]
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def delete(self, first, last=None):
+        self.value = ''
+
+    def insert(self, index, text):
+        self.value = text
+
+
+@pytest.fixture
+def module(monkeypatch):
+    monkeypatch.setattr(requests, 'get', lambda url, **kwargs: FakeResponse(200, TEAM_PAGE))
+    return importlib.import_module('multi_sport_dashboard')
+
+
+@pytest.fixture
+def dashboard(module):
+    class HeadlessDashboard(module.MultiSportDashboard):
+        def __init__(self):
+            self.fig = Figure(figsize=(16, 10))
+            self.canvas = FigureCanvasAgg(self.fig)
+            self.canvas.mpl_connect('draw_event', self._on_draw)
+            self.projection_artists = {}
+            self._background = None
+            self.dashboard_values = None
+            self.defense_engine = FakeDefenseEngine()
+            self.projection_scale = FakeControl(from_=0, to=50)
+            self.projection_spinbox = FakeControl(from_=0, to=50)
+            self.projection_entry = FakeControl()
+            self.live_projection_var = FakeControl()
+            self.status_var = FakeControl()
+
+    board = HeadlessDashboard()
+    values = module.DashboardValues(clean_nba_data(RAW_LOG), 'NBA', 'PTS', 25.5, 'WMA', 'Normal')
+    board.create_dashboard(values, 'Stephen Curry', DEFENSE)
+    board.canvas.draw()
+    return board
+
+
+def test_update_projection_moves_the_line_and_labels(dashboard):
+    artists = dashboard.projection_artists
+    assert artists['projection_label'].get_text() == "Projection: 25.50"
+
+    assert dashboard.update_projection(40)
+    assert not dashboard.update_projection(40)
+
+    values = dashboard.dashboard_values
+    assert list(artists['projection_line'].get_ydata()) == [40, 40]
+    assert list(artists['distribution_line'].get_xdata()) == [40, 40]
+    assert artists['projection_label'].get_text() == "Projection: 40.00"
+    assert artists['cdf_label'].get_position()[0] == 40
+    # Only the 56-point game clears a 40 line
+    assert [bar.get_facecolor() for bar in artists['bars']].count(to_rgba('green', 0.8)) == 1
+    assert values['hit_probability'] < 50
+
+
+def test_dragging_the_slider_keeps_its_range(dashboard):
+    scale = dashboard.projection_scale
+    low, high = scale.cget('from'), scale.cget('to')
+    configured = scale.configured
+
+    # Drag up to the top of the range one step at a time
+    projection = 25.5
+    while projection < high:
+        projection += 0.5
+        dashboard.on_projection_scale(projection)
+    assert (scale.cget('from'), scale.cget('to'), scale.configured) == (low, high, configured)
+    assert dashboard.dashboard_values['projection'] == high
+    assert dashboard.projection_entry.get() == f"{high:g}"
+
+    # A projection typed past the top widens the range to fit it
+    dashboard.live_projection_var.set(str(high + 20))
+    dashboard.on_projection_spinbox()
+    assert scale.cget('to') > high + 20 and scale.value == high + 20
+
+
+def test_a_log_without_spread_draws_and_moves_without_a_curve(dashboard):
+    steady = clean_nba_data([RAW_LOG[0]] + [row[:8] + ['20'] + row[9:] for row in RAW_LOG[1:]])
+    dashboard.create_dashboard(DashboardValues(steady, 'NBA', 'PTS', 19.5, 'Mean', 'Normal'), 'Stephen Curry', DEFENSE)
+    dashboard.canvas.draw()
+    assert 'cdf_fill' not in dashboard.projection_artists
+    assert dashboard.dashboard_values['hit_probability'] == 100.0
+
+    assert dashboard.update_projection(20.5)
+    assert dashboard.dashboard_values['hit_probability'] == 0.0
+    assert dashboard.projection_artists['hit_text'].get_text() == "Hit Probability (Normal): 0.0%"
+
+
+def test_plot_style_falls_back_when_it_cannot_be_fetched(module, monkeypatch, tmp_path):
+    monkeypatch.setattr(module, 'PLOT_STYLE', str(tmp_path / 'missing.mplstyle'))
+    with matplotlib.rc_context():
+        module.apply_plot_style()
+        assert matplotlib.rcParams['figure.facecolor'] == 'black'
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests for the Monte Carlo hit probability engines
+"""
+
+import math
+
+import numpy as np
+
+from monte_carlo import batch_hit_probabilities, hit_probability, simulate_outcomes
+
+BLOCKS = [0, 1, 3, 0, 2, 1, 0, 4, 1, 0]
+
+
+def test_bootstrap_matches_empirical_hit_rate():
+    rng = np.random.default_rng(0)
+    probability = hit_probability(BLOCKS, 1.5, 'Bootstrap', rng=rng)
+    assert abs(probability - 0.3) < 0.01
+
+
+def test_poisson_matches_analytic_tail():
+    rng = np.random.default_rng(1)
+    mean = np.mean(BLOCKS)
+    analytic = 1 - sum(math.exp(-mean) * mean ** k / math.factorial(k) for k in range(2))
+    assert abs(hit_probability(BLOCKS, 1.5, 'Poisson', rng=rng) - analytic) < 0.01
+
+
+def test_negative_binomial_is_overdispersed():
+    rng = np.random.default_rng(2)
+    outcomes = simulate_outcomes(BLOCKS, 'NegBinomial', rng=rng)
+    assert outcomes.var() > outcomes.mean()
+
+
+def test_batch_matches_single_prop_engines():
+    rng = np.random.default_rng(3)
+    logs = [BLOCKS, [25, 31, 18, 40, 22], [2, 2, 2]]
+    lines = [1.5, 24.5, 2.5]
+    for engine in ('Bootstrap', 'Poisson', 'NegBinomial'):
+        batch = batch_hit_probabilities(logs, lines, engine, rng=rng)
+        single = [hit_probability(v, line, engine, rng=rng) for v, line in zip(logs, lines)]
+        assert np.allclose(batch, single, atol=0.01)
+    assert batch_hit_probabilities(logs, lines, 'Bootstrap', rng=rng)[2] == 0.0
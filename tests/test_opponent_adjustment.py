@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for opponent-adjusted projections
+"""
+
+import numpy as np
+
+import batch_evaluator
+from batch_evaluator import SlateEvaluator
+from opponent_adjustment import TeamAllowedMatrix, adjust_projections
+from test_batch_evaluator import RAW_LOG
+
+RANKINGS = {
+    'PTS': [('Jazz', 120.0, 1), ('Lakers', 110.0, 2), ('Celtics', 100.0, 3)],
+    'REB': [('Jazz', 45.0, 2), ('Lakers', 50.0, 1), ('Celtics', 40.0, 3)],
+    'AST': [('Lakers', 28.0, 1), ('Jazz', 26.0, 2), ('Celtics', 24.0, 3)],
+}
+
+
+def test_factors_for_single_and_combined_stats():
+    matrix = TeamAllowedMatrix.from_rankings(RANKINGS)
+    adjusted, factors = adjust_projections(matrix, 'NBA', [30.0, 40.0, 30.0, 30.0],
+                                           ['UTA', 'Celtics', 'Unknown FC', None], ['PTS', 'PRA', 'PTS', 'PTS'])
+
+    assert np.isclose(factors[0], 120 / 110)
+    assert np.isclose(factors[1], (100 + 40 + 24) / (110 + 45 + 26))
+    assert factors[2] == 1 and factors[3] == 1
+    assert np.isclose(adjusted[0], 30 * 120 / 110)
+
+
+def test_slate_adjustment_uses_one_matrix(monkeypatch):
+    ranking_calls = []
+
+    def fake_rankings(stat):
+        ranking_calls.append(stat)
+        return RANKINGS[stat]
+
+    monkeypatch.setattr(batch_evaluator, 'scrape_statmuse', lambda url: RAW_LOG)
+    monkeypatch.setattr(batch_evaluator, 'get_team_defense_rankings', fake_rankings)
+    monkeypatch.setattr(batch_evaluator, 'get_combined_stats_rankings', lambda components: ([], {}))
+
+    props = [{'sport': 'NBA', 'player': 'Stephen Curry', 'stat': stat, 'line': line, 'opponent': opp}
+             for stat, line, opp in [('PTS', 29.5, 'UTA'), ('PTS', 29.5, 'BOS'), ('PRA', 38.5, 'LAL')]]
+    results = SlateEvaluator(max_workers=4, method='Mean', adjust_for_opponent=True).evaluate(props)
+
+    by_opponent = {r['opponent']: r for r in results}
+    assert by_opponent['Jazz']['adjusted_projection'] > by_opponent['Jazz']['projection']
+    assert by_opponent['Celtics']['adjusted_projection'] < by_opponent['Celtics']['projection']
+    assert by_opponent['Jazz']['hit_probability'] > by_opponent['Celtics']['hit_probability']
+    assert sorted(ranking_calls) == ['AST', 'PTS', 'REB']
+
+
+def test_abbreviations_match_whole_team_names():
+    matrix = TeamAllowedMatrix.from_rankings({'PTS': [('Hornets', 118.0, 1), ('Nets', 112.0, 2),
+                                                      ('Trail Blazers', 111.0, 3), ('Jazz', 104.0, 4)]})
+
+    assert matrix.teams[matrix.team_index('BKN')] == 'Nets'
+    assert matrix.teams[matrix.team_index('CHA')] == 'Hornets'
+    assert matrix.teams[matrix.team_index('Brooklyn Nets')] == 'Nets'
+    assert matrix.teams[matrix.team_index('POR')] == 'Trail Blazers'
+    # Not a team in the table: neutral factor rather than a near-miss
+    assert matrix.team_index('Nuggets') is None
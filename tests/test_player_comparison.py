@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the batched multi-player comparison (no network access required)
+"""
+
+import numpy as np
+import pytest
+
+import batch_evaluator
+from batch_evaluator import SlateEvaluator
+from derived_values import DashboardValues
+from NBBBA import clean_nba_data
+from player_comparison import batch_projections, compare_players, fetch_player_logs, parse_player_lines
+from probability import normal_hit_probability
+from test_batch_evaluator import RAW_LOG
+
+
+def test_batch_matches_the_single_player_values():
+    log = clean_nba_data(RAW_LOG)
+    # The second player only has the last three games
+    short = [log[0]] + log[1:4]
+    lines = [38.5, 30.5, 20.5]
+    rows = compare_players([log, short, None], 'NBA', 'PRA', lines, ['Curry', 'Curry (3)', 'Nobody'], method='WMA')
+
+    assert rows[2]['error'] == "No data found for this player"
+    for row, player_log, line in zip(rows, (log, short), lines):
+        single = DashboardValues(player_log, 'NBA', 'PRA', line, method='WMA')
+        assert row['values'] == list(single['values'])
+        assert row['games'] == len(single['values'])
+        assert row['projection'] == round(single['quantitative'], 2)
+        assert row['hit_rate'] == round(single['hit_rate'], 1)
+        hit_probability, std_dev = normal_hit_probability(single['values'], line, single['quantitative'])
+        assert row['std_dev'] == round(std_dev, 2)
+        assert row['hit_probability'] == round(hit_probability * 100, 1)
+
+    # Rows without spread are priced deterministically; empty rows are NaN
+    batch = batch_projections(np.array([[10.0, 10.0], [np.nan, np.nan]]), [9.5, 9.5])
+    assert batch['hit_probability'][0] == 100.0 and np.isnan(batch['hit_probability'][1])
+    simulated = batch_projections(np.array([[10.0, 12.0, np.nan], [1.0, 2.0, 3.0]]), [9.5, 9.5], engine='Bootstrap')
+    assert list(simulated['hit_probability']) == [100.0, 0.0]
+
+    assert parse_player_lines('Stephen Curry 38.5, Shai Gilgeous-Alexander,', 30.5) == [
+        ('Stephen Curry', 38.5), ('Shai Gilgeous-Alexander', 30.5)]
+    for text in ('Stephen Curry', '25.5', ' , ', ', '.join(['A 1'] * 10)):
+        with pytest.raises(ValueError):
+            parse_player_lines(text)
+
+
+def test_logs_are_fetched_once_through_the_evaluator_cache(monkeypatch):
+    calls = []
+
+    def fake_scrape(url):
+        calls.append(url)
+        return RAW_LOG
+
+    monkeypatch.setattr(batch_evaluator, 'scrape_statmuse', fake_scrape)
+    evaluator = SlateEvaluator(max_workers=4)
+    players = ['Stephen Curry', 'LeBron James']
+    logs = fetch_player_logs(evaluator, 'NBA', players, 'PTS')
+    again = fetch_player_logs(evaluator, 'NBA', players, 'PTS')
+    evaluator.close()
+
+    assert len(calls) == 2
+    assert [log is cached for log, cached in zip(logs, again)] == [True, True]
+    rows = compare_players(logs, 'NBA', 'PTS', [25.5, 25.5], players)
+    assert [row['mean'] for row in rows] == [29.6, 29.6]
+    with pytest.raises(ValueError):
+        fetch_player_logs(evaluator, 'NFL', players)
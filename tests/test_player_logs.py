@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the NHL and MLB player pipelines (no network access required)
+"""
+
+import pytest
+
+import batch_evaluator
+from batch_evaluator import SlateEvaluator
+from player_logs import clean_player_log
+from sports_config import get_player_position
+
+NHL_LOG = [
+    ['', '', 'NAME', 'DATE', 'TM', '', 'OPP', 'G', 'A', 'P', 'S', 'TOI', 'FOW', 'HIT', 'BKS', 'SV', 'MIN'],
+    ['1', '', 'Connor McDavid', '2/27/2025', 'EDM', '@', 'MTL', '1', '2', '3', '4', '21:10', '9', '1', '0', '0', '0'],
+    ['2', '', 'Connor McDavid', '2/25/2025', 'EDM', 'vs', 'WPG', '0', '1', '1', '2', '19:45', '7', '0', '1', '0', '0'],
+    ['3', '', 'Connor McDavid', '2/23/2025', 'EDM', 'vs', 'TOR', '2', '0', '2', '6', '22:03', '11', '2', '0', '0', '0'],
+    ['', '', 'Average', '', '', '', '', '1', '1', '2', '4', '', '', '', '', '', ''],
+]
+
+MLB_LOG = [
+    ['', '', 'NAME', 'DATE', 'TM', '', 'OPP', 'R', 'H', '2B', '3B', 'HR', 'RBI', 'BB', 'SO', 'HBP', 'SB', 'CS', 'TB',
+     'IP', 'ER', 'DEC'],
+    ['1', '', 'Aaron Judge', '6/18/2025', 'NYY', 'vs', 'LAA', '1', '2', '0', '0', '1', '2', '0', '1', '0', '0', '0', '5',
+     '6.1', '2', 'W'],
+    ['2', '', 'Aaron Judge', '6/17/2025', 'NYY', 'vs', 'LAA', '0', '1', '1', '0', '0', '0', '1', '2', '0', '1', '0', '2',
+     '5.0', '3', 'L'],
+]
+
+
+def test_positions_rename_cleaned_columns_to_stat_names():
+    skater = clean_player_log('NHL', NHL_LOG, 'player')
+    goalie = clean_player_log('NHL', NHL_LOG, get_player_position('NHL', 'SAVES'))
+    hitter = clean_player_log('MLB', MLB_LOG, get_player_position('MLB', 'H+R+RBI'))
+    pitcher = clean_player_log('MLB', MLB_LOG, get_player_position('MLB', 'K'))
+
+    assert len(skater) == 4
+    assert {'GOALS', 'ASSISTS', 'POINTS', 'SHOTS', 'HITS', 'BLOCKS'} <= set(skater[0])
+    assert 'SAVES' in goalie[0]
+    assert [row[hitter[0].index('H')] for row in hitter[1:]] == ['2', '1']
+    assert [row[pitcher[0].index('K')] for row in pitcher[1:]] == ['1', '2']
+    assert pitcher[1][pitcher[0].index('OUTS')] == pytest.approx(19)
+
+
+def test_evaluate_nhl_and_mlb_props(monkeypatch):
+    calls = []
+
+    def fake_scrape(url):
+        calls.append(url)
+        return NHL_LOG if '/nhl/' in url else MLB_LOG
+
+    monkeypatch.setattr(batch_evaluator, 'scrape_statmuse', fake_scrape)
+    props = [
+        {'sport': 'NHL', 'player': 'Connor McDavid', 'stat': 'SHOTS', 'line': 3.5},
+        {'sport': 'NHL', 'player': 'Connor McDavid', 'stat': 'PA', 'line': 1.5},
+        {'sport': 'MLB', 'player': 'Aaron Judge', 'stat': 'H+R+RBI', 'line': 2.5},
+        {'sport': 'MLB', 'player': 'Aaron Judge', 'stat': 'K', 'line': 1.5},
+    ]
+    evaluator = SlateEvaluator(max_workers=4, method='Mean')
+    results = {r['stat']: r for r in evaluator.evaluate(props)}
+    evaluator.close()
+
+    assert all(r['error'] is None for r in results.values())
+    assert results['SHOTS']['mean'] == 4.0
+    assert results['PA']['mean'] == 2.0
+    assert results['H+R+RBI']['mean'] == 3.0
+    assert results['K']['mean'] == 1.5
+    # One fetch per player, whichever positions its props are cleaned for
+    assert len(calls) == 2
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the background refresh scheduler (no network access required)
+"""
+
+import random
+from datetime import datetime
+
+import defense_engine
+from defense_engine import DefenseEngine
+from refresh_scheduler import BACKOFF_SECONDS, CronSchedule, RefreshScheduler, schedule_defense
+from scrape_result import RATE_LIMITED, TIMEOUT, ScrapeError, ScrapeResult
+from test_defense_engine import NHL_ALLOWED, fake_fetch_table
+
+
+def test_cron_schedule_and_jittered_runs():
+    every_ten = CronSchedule('*/10 * * * *')
+    assert every_ten.next_after(datetime(2025, 3, 1, 12, 0, 30)) == datetime(2025, 3, 1, 12, 10)
+    assert every_ten.next_after(datetime(2025, 3, 1, 23, 55)) == datetime(2025, 3, 2, 0, 0)
+    # Weekdays 1-5 at 09:30; 2025-03-01 is a Saturday
+    assert CronSchedule('30 9 * * 1-5').next_after(datetime(2025, 3, 1, 8)) == datetime(2025, 3, 3, 9, 30)
+
+    now = [datetime(2025, 3, 1, 12, 0).timestamp()]
+    results = iter([True, False, RuntimeError("upstream down")])
+
+    def refresh():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    scheduler = RefreshScheduler(jitter=30, clock=lambda: now[0], rng=random.Random(1), report=lambda line: None)
+    job = scheduler.add_job('NBA defense', '*/10 * * * *', refresh)
+    first = job.next_run
+    assert now[0] + 600 <= first <= now[0] + 630
+
+    assert scheduler.run_pending() > 0 and scheduler.status()['NBA defense']['runs'] == 0
+    for _ in range(3):
+        now[0] = job.next_run
+        scheduler.run_pending()
+
+    status = scheduler.status()['NBA defense']
+    assert status['runs'] == 2 and status['unchanged'] == 1 and status['failures'] == 1
+    assert status['error'] == "upstream down"
+    assert status['last_changed'] == first and status['last_refresh'] > first
+
+
+def test_defense_refresh_skips_rebuild_when_tables_are_unchanged(monkeypatch):
+    calls = []
+    monkeypatch.setattr(defense_engine, 'fetch_table', fake_fetch_table(calls))
+    monkeypatch.setattr(defense_engine, 'revalidate_table', fake_fetch_table(calls))
+    engine = DefenseEngine()
+    scheduler = RefreshScheduler(report=lambda line: None)
+    schedule_defense(scheduler, engine, ['NHL'])
+
+    matrix = engine.get_matrix('NHL')
+    assert scheduler.run_job('NHL defense') is False
+    assert engine.get_matrix('NHL') is matrix
+
+    monkeypatch.setitem(NHL_ALLOWED, 'goals', dict(NHL_ALLOWED['goals'], Kings=4.5))
+    assert scheduler.run_job('NHL defense') is True
+    assert engine.rankings('NHL', 'GOALS')[0] == ('Kings', 4.5, 1)
+    assert scheduler.status()['NHL defense']['runs'] == 2
+
+
+def test_transient_failures_back_off():
+    now = [datetime(2025, 3, 1, 12, 0).timestamp()]
+    failures = [ScrapeResult(error_kind=TIMEOUT, error="read timed out"),
+                ScrapeResult(error_kind=TIMEOUT, error="read timed out"),
+                ScrapeResult(error_kind=RATE_LIMITED, error="HTTP 429", status=429, retry_after=900)]
+
+    def refresh():
+        raise ScrapeError(failures.pop(0))
+
+    scheduler = RefreshScheduler(jitter=0, clock=lambda: now[0], report=lambda line: None)
+    job = scheduler.add_job('NBA Stephen Curry', '* * * * *', refresh)
+
+    # Every minute on schedule, but each timeout doubles the wait and a 429 waits as long as it asked
+    delays = []
+    for _ in range(3):
+        now[0] = job.next_run
+        scheduler.run_pending()
+        delays.append(job.next_run - now[0])
+    assert delays == [BACKOFF_SECONDS, 2 * BACKOFF_SECONDS, 900]
+    assert scheduler.status()['NBA Stephen Curry']['error_kind'] == RATE_LIMITED
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the global request budget (no network access required)
+"""
+
+import threading
+import time
+
+from request_budget import BACKFILL, INTERACTIVE, PREFETCH, RequestBudget, bind_priority, request_priority
+
+URL = 'https://www.statmuse.com/nba/ask/stephen-curry-vs-any-last-10-regular-season-games'
+
+
+def test_waiting_requests_are_served_by_priority():
+    budget = RequestBudget(rate=20, burst=1, reserve=0)
+    budget.acquire(URL)
+    order = []
+
+    def request(priority):
+        budget.acquire(URL, priority)
+        order.append(priority)
+
+    threads = [threading.Thread(target=request, args=(BACKFILL,))]
+    threads[0].start()
+    while budget.queued('www.statmuse.com') < 1:
+        time.sleep(0.001)
+    for priority in (PREFETCH, INTERACTIVE):
+        threads.append(threading.Thread(target=request, args=(priority,)))
+        threads[-1].start()
+        while budget.queued('www.statmuse.com') < len(threads):
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == [INTERACTIVE, PREFETCH, BACKFILL]
+    # Loopback fixture backends are not limited
+    assert all(budget.acquire('http://127.0.0.1:8765/nba/ask/x', BACKFILL) < 0.01 for _ in range(5))
+
+
+def test_interactive_requests_skip_a_saturating_backfill():
+    budget = RequestBudget(rate=50, burst=2, reserve=1)
+
+    def backfill():
+        with request_priority(BACKFILL):
+            fetch = bind_priority(lambda: budget.acquire(URL))
+        for _ in range(5):
+            fetch()
+
+    workers = [threading.Thread(target=backfill) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    while budget.queued() < 3:
+        time.sleep(0.001)
+    waited = budget.acquire(URL)
+    for worker in workers:
+        worker.join(timeout=5)
+
+    stats = budget.stats()
+    # The reserved token is waiting for the interactive request while the backfill queues
+    assert waited < 0.01
+    assert stats[INTERACTIVE]['requests'] == 1 and stats[BACKFILL]['requests'] == 20
+    assert stats[BACKFILL]['max_wait_seconds'] > waited
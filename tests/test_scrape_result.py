@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the typed scrape results (no network access required)
+"""
+
+import pytest
+import requests
+
+import batch_evaluator
+import datascrapper
+from batch_evaluator import SlateEvaluator
+from scrape_result import NO_DATA, RATE_LIMITED, TIMEOUT, ScrapeError, ScrapeResult
+from test_batch_evaluator import RANKINGS, RAW_LOG
+
+URL = 'https://www.statmuse.com/nba/ask/stephen-curry-vs-any-last-10-regular-season-games'
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}", response=self)
+
+
+def timed_out():
+    raise requests.Timeout("read timed out")
+
+
+def test_no_data_is_told_apart_from_failures(monkeypatch):
+    responses = {
+        'empty': lambda: FakeResponse(200, b'<html><p>No results</p></html>'),
+        'timeout': timed_out,
+        'limited': lambda: FakeResponse(429, headers={'Retry-After': '30'}),
+        'table': lambda: FakeResponse(200, b'<table><tr><th>DATE</th><th>PTS</th></tr>'
+                                           b'<tr><td>2/13/2025</td><td>27</td></tr></table>'),
+    }
+    monkeypatch.setattr(datascrapper.requests, 'get', lambda url, **kwargs: responses[url.rsplit('-', 1)[1]]())
+
+    empty = datascrapper.scrape_statmuse_result(URL + '-empty')
+    timeout = datascrapper.scrape_statmuse_result(URL + '-timeout')
+    limited = datascrapper.scrape_statmuse_result(URL + '-limited')
+    table = datascrapper.scrape_statmuse_result(URL + '-table')
+
+    assert empty.error_kind == NO_DATA and not empty.transient
+    assert timeout.error_kind == TIMEOUT and timeout.transient
+    assert limited.error_kind == RATE_LIMITED and limited.status == 429 and limited.retry_after == 30
+    assert table.ok and table.source == 'network' and table.data == [['DATE', 'PTS'], ['2/13/2025', '27']]
+    assert table.latency >= 0
+
+    # The legacy API still returns [] for a page without data, but no longer for a failed request
+    assert datascrapper.scrape_statmuse(URL + '-empty') == []
+    with pytest.raises(ScrapeError) as error:
+        datascrapper.scrape_statmuse(URL + '-timeout')
+    assert error.value.result.error_kind == TIMEOUT
+
+
+def test_failed_fetches_are_not_cached(monkeypatch):
+    failures = {'log': 1, 'rankings': 1}
+
+    def flaky_scrape(url):
+        if failures['log']:
+            failures['log'] -= 1
+            raise ScrapeError(ScrapeResult(error_kind=TIMEOUT, error="read timed out", url=url))
+        return RAW_LOG
+
+    def flaky_rankings(statistic):
+        if failures['rankings']:
+            failures['rankings'] -= 1
+            return []
+        return RANKINGS
+
+    monkeypatch.setattr(batch_evaluator, 'scrape_statmuse', flaky_scrape)
+    monkeypatch.setattr(batch_evaluator, 'get_team_defense_rankings', flaky_rankings)
+    evaluator = SlateEvaluator(max_workers=2)
+
+    with pytest.raises(ScrapeError):
+        evaluator.fetch_player_log('NBA', 'Stephen Curry', 'Any', 'last-5-regular-season-games')
+    assert len(evaluator.fetch_player_log('NBA', 'Stephen Curry', 'Any', 'last-5-regular-season-games')) == 6
+
+    assert evaluator.get_rankings('NBA', 'PTS') == []
+    assert evaluator.get_rankings('NBA', 'PTS') == RANKINGS
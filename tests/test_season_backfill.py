@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the resumable season backfill (no network access required)
+"""
+
+from datetime import date
+
+from season_backfill import BackfillStore, RateLimiter, SeasonBackfill, clean_player_name, season_start
+from test_batch_evaluator import RAW_LOG
+
+
+def test_interrupted_backfill_resumes_where_it_stopped(tmp_path):
+    store = BackfillStore(str(tmp_path))
+    players = ['Stephen Curry', 'LeBron James', 'Nikola Jokic']
+    urls = []
+
+    def flaky_fetch(url):
+        urls.append(url)
+        if 'Nikola Jokic' in url:
+            raise ConnectionError("connection reset")
+        return iter(RAW_LOG)
+
+    first = SeasonBackfill('NBA', store, max_workers=2, rate=0, fetch_rows=flaky_fetch, report=lambda line: None)
+    summary = first.run(players)
+    assert (summary['fetched'], summary['failed'], summary['rows']) == (2, 1, 10)
+    assert 'Nikola Jokic' in store.checkpoint('NBA')['failed']
+    assert urls[0].endswith('-vs-Any-last-82-regular-season-games')
+
+    urls.clear()
+    second = SeasonBackfill('NBA', store, rate=0, fetch_rows=lambda url: urls.append(url) or iter(RAW_LOG),
+                            report=lambda line: None)
+    summary = second.run(players)
+    assert summary['skipped'] == 2
+    assert len(urls) == 1 and 'Nikola Jokic' in urls[0]
+    assert store.checkpoint('NBA')['failed'] == {}
+
+    league = store.load_league('NBA')
+    assert league.games == 15
+    assert list(league.values('PTS')[:5]) == [27, 20, 30, 15, 56]
+
+
+def test_rate_limiter_spaces_calls_and_names_are_cleaned():
+    now = [0.0]
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+
+    limiter = RateLimiter(4, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.acquire()
+
+    assert waits == [0.25, 0.5]
+    assert clean_player_name('Stephen CurryS. Curry') == 'Stephen Curry'
+    assert clean_player_name('Shai Gilgeous-AlexanderS. Gilgeous-Alexander') == 'Shai Gilgeous-Alexander'
+
+
+def test_backfill_keeps_only_the_current_seasons_games(tmp_path):
+    # Early in the 2025-26 season the last-82 window still holds last season's games
+    dates = ['11/27/2025', '11/25/2025', '11/23/2025', '4/13/2025', '4/11/2025']
+    rows = [RAW_LOG[0]] + [row[:3] + [day] + row[4:] for row, day in zip(RAW_LOG[1:], dates)]
+    store = BackfillStore(str(tmp_path))
+    backfill = SeasonBackfill('NBA', store, rate=0, fetch_rows=lambda url: iter(rows),
+                              report=lambda line: None)
+
+    assert backfill.backfill_player('Stephen Curry') == 3
+    assert [row[1] for row in store.load_log('NBA', 'Stephen Curry')[1:]] == dates[:3]
+    assert season_start('NBA', date(2026, 2, 1)) == date(2025, 7, 1)
+    assert season_start('MLB', date(2026, 2, 1)) == date(2026, 1, 1)
+
+
+def test_off_season_backfill_keeps_the_last_season_and_never_completes_empty_logs(tmp_path):
+    # Run in the summer: the newest games are from the season that ended in April
+    dates = ['4/13/2025', '4/11/2025', '3/30/2025', '11/2/2024', '4/14/2024']
+    rows = [RAW_LOG[0]] + [row[:3] + [day] + row[4:] for row, day in zip(RAW_LOG[1:], dates)]
+    store = BackfillStore(str(tmp_path))
+    logs = {'Stephen Curry': rows, 'LeBron James': RAW_LOG[:1]}
+    backfill = SeasonBackfill('NBA', store, rate=0, report=lambda line: None,
+                              fetch_rows=lambda url: iter(next(log for player, log in logs.items() if player in url)))
+
+    summary = backfill.run(['Stephen Curry', 'LeBron James'])
+
+    assert (summary['fetched'], summary['failed'], summary['rows']) == (1, 1, 4)
+    assert 'LeBron James' in store.checkpoint('NBA')['failed']
+    assert 'LeBron James' not in store.checkpoint('NBA')['completed']
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for request coalescing of concurrent scrapes
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import datascrapper
+from singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def slow_fetch(key):
+        calls.append(key)
+        time.sleep(0.2)
+        return [key]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: flight.do('page', slow_fetch, 'page'), range(8)))
+
+    assert calls == ['page']
+    assert all(result == ['page'] for result in results)
+    assert flight.in_flight() == 0
+
+
+def test_errors_are_shared_and_not_remembered():
+    flight = SingleFlight()
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        raise TimeoutError("upstream timeout")
+
+    for _ in range(2):
+        try:
+            flight.do('page', failing)
+        except TimeoutError:
+            pass
+
+    assert len(attempts) == 2
+
+
+def test_fetch_table_returns_independent_copies(monkeypatch):
+    calls = []
+    started = threading.Event()
+
+    def fake_fetch(url):
+        calls.append(url)
+        started.set()
+        time.sleep(0.2)
+        return ['TEAM', 'OPP PTS/GP'], [['Jazz', '121.23']]
+
+    monkeypatch.setattr(datascrapper, '_fetch_table', fake_fetch)
+    # Team tables go through the revalidating cache; player logs use the single-flight fetch
+    url = 'https://www.statmuse.com/nba/ask/stephen-curry-vs-Any-last-5-regular-season-games'
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        tables = list(executor.map(datascrapper.fetch_table, [url] * 4))
+
+    assert len(calls) == 1
+    tables[0][1][0][0] = 'changed'
+    assert tables[1][1][0][0] == 'Jazz'
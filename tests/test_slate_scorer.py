@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-process slate scorer (no network access required)
+"""
+
+import os
+
+import batch_evaluator
+from batch_evaluator import SlateEvaluator
+from player_logs import clean_player_log
+from opponent_adjustment import TeamAllowedMatrix
+from slate_scorer import SlateScorer
+from test_batch_evaluator import RANKINGS, RAW_LOG
+
+
+def test_worker_processes_match_the_batch_evaluator(monkeypatch):
+    monkeypatch.setattr(batch_evaluator, 'scrape_statmuse', lambda url: RAW_LOG)
+    props = [
+        {'sport': 'NBA', 'player': 'Stephen Curry', 'stat': stat, 'line': line}
+        for stat in ('PTS', 'REB', 'AST', '3PM') for line in (2.5, 5.5, 25.5)
+    ] + [{'sport': 'NFL', 'player': 'Patrick Mahomes', 'stat': 'PASS_YDS', 'line': 280.5}]
+    evaluator = SlateEvaluator(max_workers=4)
+    expected = {(r['stat'], r['line']): r for r in evaluator.evaluate(props)}
+    evaluator.close()
+
+    shm_before = set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+    scorer = SlateScorer(max_workers=3)
+    results = scorer.evaluate(props)
+    scorer.close()
+
+    assert [r['rank'] for r in results] == list(range(1, len(props) + 1))
+    assert results[-1]['error'] is not None
+    for result in results[:-1]:
+        batch = expected[(result['stat'], result['line'])]
+        for field in ('games', 'mean', 'wma', 'projection', 'std_dev', 'hit_probability', 'hit_rate'):
+            assert result[field] == batch[field], field
+        assert result['adjusted_projection'] == result['projection']
+    # Every shared memory block is unlinked once the slate is scored
+    if shm_before:
+        assert set(os.listdir('/dev/shm')) <= shm_before
+
+
+def test_opponent_factors_scale_projections():
+    logs = [clean_player_log('NBA', RAW_LOG)] * 3
+    props = [{'sport': 'NBA', 'player': 'Stephen Curry', 'stat': 'PTS', 'line': 25.5, 'opponent': opponent,
+              'method': 'Mean'} for opponent in ('UTA', 'HOU', None)]
+    allowed = {'NBA': TeamAllowedMatrix.from_rankings({'PTS': RANKINGS})}
+
+    scorer = SlateScorer(max_workers=1, adjust_for_opponent=True)
+    results, errors = scorer.score(props, logs, allowed)
+    scorer.close()
+
+    assert not errors
+    average = sum(value for team, value, rank in RANKINGS) / 3
+    factors = results[:, 7]
+    assert list(factors.round(4)) == [round(121.23 / average, 4), round(110.0 / average, 4), 1.0]
+    assert list(results[:, 8].round(4)) == list((29.6 * factors).round(4))
+    # A tougher opponent lowers the hit probability for the same line
+    assert results[1, 5] < results[2, 5] < results[0, 5]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming StatMuse table parser (no network access required)
+"""
+
+import datascrapper
+from NBBBA import clean_nba_data, iter_clean_nba_data
+
+PAGE = (
+    '<html><body><p>Stephen Curry game log</p><table><thead><tr>'
+    + ''.join(f'<th>{h}</th>' for h in ['', '', 'NAME', 'DATE', 'TM', '', 'OPP', 'MIN', 'PTS', 'REB', 'AST', 'STL',
+                                        'BLK', 'FGM', 'FGA', '3PM', '3PA', 'FTM', 'FTA', 'OREB', 'DREB', 'TOV', 'PF'])
+    + '</tr></thead><tbody>'
+    + ''.join(
+        f'<tr><td>{i}</td><td></td><td><span>Stephen Curry</span> <span>S. Curry</span></td><td>2/{i}/2025</td>'
+        f'<td>GSW</td><td>@</td><td>HOU &amp; Co</td><td>35</td><td>{20 + i}</td><td>5</td><td>3</td><td>0</td>'
+        f'<td>0</td><td>7</td><td>17</td><td>5</td><td>13</td><td>8</td><td>9</td><td>1</td><td>4</td><td>1</td>'
+        f'<td>2</td></tr>' for i in range(1, 21))
+    + '<tr><td></td><td></td><td>Average</td>' + '<td></td>' * 20 + '</tr>'
+    + '</tbody></table><table><tr><th>OTHER</th></tr></table></body></html>'
+).encode('utf-8')
+
+
+class FakeResponse:
+    encoding = 'utf-8'
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_stream_matches_full_parse(monkeypatch):
+    monkeypatch.setattr(datascrapper.requests, 'get', lambda url, **kwargs: FakeResponse(PAGE))
+    headers, rows = datascrapper._fetch_table('http://fixture/log')
+
+    # Tiny chunks split tags, entities and text nodes across feeds
+    streamed = list(datascrapper.stream_table('http://fixture/log', chunk_size=7))
+
+    assert streamed[0] == headers
+    assert streamed[1:] == rows
+    assert streamed[1][2] == 'Stephen CurryS. Curry'
+    assert streamed[1][6] == 'HOU & Co'
+
+
+def test_cleaner_consumes_stream_row_by_row(monkeypatch):
+    monkeypatch.setattr(datascrapper.requests, 'get', lambda url, **kwargs: FakeResponse(PAGE))
+    full = clean_nba_data(datascrapper.scrape_statmuse('http://fixture/log'))
+
+    streamed = iter_clean_nba_data(datascrapper.stream_statmuse('http://fixture/log'))
+    header = next(streamed)
+    assert header == full[0]
+    assert list(streamed) == full[1:]
+    assert len(full) == 21
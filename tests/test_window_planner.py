@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for slicing nested game windows out of one fetch
+"""
+
+import re
+
+from window_planner import WindowPlanner, matches_team, parse_window
+
+HEADER = ['', 'NAME', 'DATE', 'OPP', 'PTS']
+SEASON = [[str(i + 1), 'Curry', f'3/{28 - i}/2025', ['UTA', 'HOU', 'DAL', 'BOS'][i % 4], str(20 + i)]
+          for i in range(25)]
+
+
+class FakeStatMuse:
+    """Serves the most recent N games of SEASON, filtered by team when the URL asks for one"""
+
+    def __init__(self):
+        self.urls = []
+
+    def __call__(self, url):
+        self.urls.append(url)
+        games = int(re.search(r'last-(\d+)', url).group(1))
+        team = re.search(r'-vs-(.+?)-last', url).group(1)
+        rows = [row for row in SEASON if team == 'Any' or row[3] == team]
+        return [HEADER] + [list(row) for row in rows[:games]] + [['', 'Average', '', '', '30']]
+
+
+def test_toggling_windows_fetches_once():
+    fetch = FakeStatMuse()
+    planner = WindowPlanner(fetch=fetch)
+
+    for label in ('Last 5 Regular Games', 'Last 10 Regular Games', 'Last 7 Regular Games',
+                  'last-5-regular-season-games'):
+        games = int(re.search(r'\d+', label).group(0))
+        data = planner.get('nba', 'Stephen Curry', label)
+        assert data[1:] == SEASON[:games]
+
+    assert len(fetch.urls) == 1
+    assert parse_window('Last 7 Regular Games') == ('regular-season', 7)
+
+
+def test_reserve_sizes_the_first_fetch_and_vs_team_is_local():
+    fetch = FakeStatMuse()
+    planner = WindowPlanner(fetch=fetch)
+    planner.reserve('nba', 'Stephen Curry', 'last-20-regular-season-games')
+
+    vs_houston = planner.get('nba', 'Stephen Curry', 'last-5-regular-season-games', 'HOU')
+    full = planner.get('nba', 'Stephen Curry', 'last-20-regular-season-games')
+
+    assert [row[3] for row in vs_houston[1:]] == ['HOU'] * 5
+    assert len(full) == 21
+    assert len(fetch.urls) == 1
+    assert fetch.urls[0].endswith('/nba/ask/Stephen Curry-vs-Any-last-20-regular-season-games')
+
+
+def test_short_vs_team_window_falls_back_to_direct_fetch():
+    fetch = FakeStatMuse()
+    planner = WindowPlanner(fetch=fetch)
+
+    # Only 2-3 games vs each team within the 10 most recent, so the vs-team window is fetched directly
+    vs_utah = planner.get('nba', 'Stephen Curry', 'Last 5 Regular Games', 'UTA')
+    planner.get('nba', 'Stephen Curry', 'Last 5 Regular Games', 'UTA')
+
+    assert [row[3] for row in vs_utah[1:]] == ['UTA'] * 5
+    assert len(fetch.urls) == 2
+    assert '-vs-UTA-' in fetch.urls[1]
+
+
+def test_matches_team_uses_the_leagues_codes_and_whole_names():
+    assert matches_team('BKN', 'Brooklyn Nets') and matches_team('BKN', 'nets')
+    assert not matches_team('BKN', 'Charlotte Hornets') and not matches_team('CHA', 'Brooklyn Nets')
+    assert matches_team('VGK', 'Vegas Golden Knights', 'nhl') and not matches_team('VGK', 'Golden', 'NHL')
+    assert matches_team('NYY', 'Yankees', 'MLB') and not matches_team('NYM', 'New York Yankees', 'MLB')
+
+
+def test_windows_are_the_most_recent_games_whatever_the_page_order():
+    fetch = FakeStatMuse()
+
+    def oldest_first(url):
+        header, *games, average = fetch(url)
+        return [header] + games[::-1] + [average]
+
+    planner = WindowPlanner(fetch=oldest_first)
+
+    data = planner.get('nba', 'Stephen Curry', 'last-5-regular-season-games')
+
+    assert data[1:] == SEASON[:5]
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached WMA kernels and the rolling WMA
+"""
+
+import numpy as np
+import pytest
+
+from WMA import rolling_weighted_moving_average, weighted_moving_average, wma_kernel
+
+
+def test_kernel_is_cached_and_read_only():
+    kernel = wma_kernel(5)
+    assert kernel is wma_kernel(5)
+    assert list(kernel) == [5, 4.5, 4, 3.5, 3]
+    with pytest.raises(ValueError):
+        kernel[0] = 1.0
+    assert list(wma_kernel(3, 'exponential', 1)) == [1, 0.5, 0.25]
+    with pytest.raises(ValueError):
+        wma_kernel(3, 'median')
+
+
+def test_rolling_wma_matches_weighted_moving_average_at_every_game():
+    values = np.array([12.0, 30, 18, 25, 9, 21, 27, 14])
+    rolling = rolling_weighted_moving_average(values, 5)
+
+    for t in range(len(values)):
+        games = values[max(0, t - 4):t + 1]
+        table = [['DATE', 'PTS']] + [[f'1/{day}/2025', value] for day, value in enumerate(games, 1)]
+        assert rolling[t] == pytest.approx(weighted_moving_average(table, 'PTS'))
+
+    # Every row of a players x games matrix at once, NaN past the end of a shorter season
+    matrix = np.array([values, np.r_[values[:6], np.nan, np.nan]])
+    rolled = rolling_weighted_moving_average(matrix, 5)
+    assert np.allclose(rolled[0], rolling)
+    assert np.allclose(rolled[1, :6], rolling[:6])
+    assert np.isnan(rolled[1, 6:]).all()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the WMA weighting scheme sweep
+"""
+
+import numpy as np
+
+from WMA import weighted_moving_average
+from season_backfill import BackfillStore
+from wma_sweep import default_schemes, load_matrices, predict, sweep
+
+
+def test_linear_half_step_matches_weighted_moving_average():
+    values = np.array([[12.0, 30, 18, 25, 9, 21, 27]])
+    predictions = predict(values, 'linear', 0.5, 5)
+
+    table = [['DATE', 'PTS']] + [[f'1/{day}/2025', value] for day, value in zip(range(2, 7), values[0, 1:6])]
+    assert np.isnan(predictions[0, 0])
+    assert predictions[0, 6] == weighted_moving_average(table, 'PTS')
+    assert predictions[0, 1] == 12.0
+
+
+def test_sweep_ranks_schemes_per_stat_in_parallel():
+    rng = np.random.default_rng(5)
+    # A drifting level rewards short, recency-weighted windows; a stable one rewards long means
+    drifting = np.cumsum(rng.normal(0, 3, size=(40, 60)), axis=1) + 50
+    stable = rng.normal(20, 5, size=(40, 60))
+    schemes = default_schemes(windows=(3, 15), steps=(0.5,), half_lives=(1,))
+
+    ranked = sweep({'DRIFT': drifting, 'STABLE': stable}, schemes, max_workers=2)
+
+    assert [row['rank'] for row in ranked['DRIFT']] == list(range(1, len(schemes) + 1))
+    assert ranked['DRIFT'][0]['window'] == 3 or ranked['DRIFT'][0]['scheme'] == 'exponential'
+    assert (ranked['STABLE'][0]['scheme'], ranked['STABLE'][0]['window']) == ('mean', 15)
+    assert ranked['STABLE'][0]['games'] == 40 * 18
+
+
+def test_load_matrices_reads_each_stat_from_its_position(tmp_path):
+    # An NHL store holds skaters and goalies; neither has the other's columns
+    store = BackfillStore(str(tmp_path))
+    store.save_log('NHL', 'Connor McDavid', 'player',
+                   [['DATE', 'OPP', 'GOALS', 'ASSISTS'], ['1/2/2025', 'SEA', '1', '2'], ['1/4/2025', 'VAN', '0', '3']])
+    store.save_log('NHL', 'Stuart Skinner', 'goalie',
+                   [['DATE', 'OPP', 'SAVES'], ['1/3/2025', 'CGY', '28'], ['1/5/2025', 'WPG', '31'],
+                    ['1/7/2025', 'EDM', '25']])
+
+    matrices = load_matrices(store, 'NHL', ['GOALS', 'SAVES'])
+
+    assert matrices['GOALS'].tolist() == [[1.0, 0.0]]
+    assert matrices['SAVES'].tolist() == [[28.0, 31.0, 25.0]]